@@ -4,5 +4,7 @@ from . import habits
 from . import reminders
 from . import learning
 from . import reading_comfort
+from . import export
+from . import push
 
-__all__ = ["chat", "habits", "reminders", "learning", "reading_comfort"]
+__all__ = ["chat", "habits", "reminders", "learning", "reading_comfort", "export", "push"]
@@ -1,11 +1,14 @@
 """Chat and AI interaction endpoints."""
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlmodel import Session
 from typing import Optional, Dict, Any
 from datetime import datetime
+from app.core.http import CLIENT_CLOSED_REQUEST, ClientDisconnected, cancel_on_disconnect
 from app.db.session import get_session
 from app.schemas import ChatMessage as ChatMessageSchema, AIResponse, ChatHistory
 from app.services.ai_service import get_ai_service
+from app.services.push_hub import get_push_hub
+from app.services.user_context_service import UserContextService
 from app.models import ChatMessage
 
 router = APIRouter(prefix="/api/chat", tags=["Chat"])
@@ -13,6 +16,7 @@ router = APIRouter(prefix="/api/chat", tags=["Chat"])
 
 @router.post("/message", response_model=AIResponse)
 async def send_message(
+    request: Request,
     user_id: str,
     message: ChatMessageSchema,
     session: Session = Depends(get_session)
@@ -20,7 +24,8 @@ async def send_message(
     """
     Send a message to the AI assistant.
     
-    Returns AI response with tips and recommendations.
+    Returns AI response with tips and recommendations. If the client
+    disconnects first, the provider call is cancelled and nothing is stored.
     """
     if not user_id or not user_id.strip():
         raise HTTPException(status_code=400, detail="user_id is required")
@@ -33,8 +38,14 @@ async def send_message(
         ai_service = get_ai_service()
         context = message.context or {}
         context["time_of_day"] = datetime.now().strftime("%H:%M")
+        # Context sent by the client takes precedence over the stored snapshot
+        for name, value in UserContextService.get_context(session, user_id).items():
+            context.setdefault(name, value)
         
-        ai_response = await ai_service.chat(message.user_message, context)
+        ai_response = await cancel_on_disconnect(
+            request,
+            ai_service.chat(message.user_message, context, user_id=user_id)
+        )
         
         # Store chat history
         chat_log = ChatMessage(
@@ -45,9 +56,12 @@ async def send_message(
         )
         session.add(chat_log)
         session.commit()
+        get_push_hub().publish(user_id, "chat_completed", {"message_id": chat_log.id})
         
         return ai_response
     
+    except ClientDisconnected:
+        raise HTTPException(status_code=CLIENT_CLOSED_REQUEST, detail="Client closed request")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing message: {str(e)}")
 
@@ -0,0 +1,23 @@
+"""Home-page dashboard endpoint."""
+from fastapi import APIRouter, HTTPException
+from app.schemas import Dashboard
+from app.services.dashboard_service import DashboardService
+
+router = APIRouter(prefix="/api/dashboard", tags=["Dashboard"])
+
+
+@router.get("/", response_model=Dashboard)
+async def get_dashboard(user_id: str) -> Dashboard:
+    """
+    Get the home-page dashboard in one request.
+    
+    Weekly summary, reminders, learning progress and preferences are looked
+    up concurrently; `timings_ms` reports the time spent on each section.
+    """
+    if not user_id or not user_id.strip():
+        raise HTTPException(status_code=400, detail="user_id is required")
+    
+    try:
+        return await DashboardService.get_dashboard(user_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error building dashboard: {str(e)}")
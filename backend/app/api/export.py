@@ -0,0 +1,81 @@
+"""Account data export endpoints."""
+import re
+from urllib.parse import quote
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from app.services.export_service import ExportService, EXPORT_FORMATS
+
+router = APIRouter(prefix="/api/export", tags=["Export"])
+
+
+def _content_disposition(filename: str) -> str:
+    """
+    Attachment header for a filename built from user input.
+
+    The plain filename is restricted to [A-Za-z0-9._-] so quotes, CR/LF and
+    non-latin-1 characters cannot break the header; the original name is
+    kept in the RFC 5987 filename* parameter.
+    """
+    safe = re.sub(r"[^A-Za-z0-9._-]", "_", filename)
+    return f"attachment; filename=\"{safe}\"; filename*=UTF-8''{quote(filename, safe='')}"
+
+
+@router.get("/")
+async def export_account(
+    user_id: str,
+    format: str = "ndjson"
+) -> StreamingResponse:
+    """
+    Export all of a user's data.
+    
+    Streams every table as NDJSON lines of the form {"table": ..., "row": ...}.
+    Use the per-table endpoint for CSV or Parquet.
+    """
+    if not user_id or not user_id.strip():
+        raise HTTPException(status_code=400, detail="user_id is required")
+    
+    if format != "ndjson":
+        raise HTTPException(
+            status_code=400,
+            detail="Full-account export supports ndjson only; use /api/export/{table} for csv or parquet"
+        )
+    
+    tables = list(ExportService.TABLES)
+    return StreamingResponse(
+        ExportService.stream_ndjson(user_id, tables),
+        media_type=EXPORT_FORMATS["ndjson"],
+        headers={"Content-Disposition": _content_disposition(f"{user_id}-export.ndjson")}
+    )
+
+
+@router.get("/{table}")
+async def export_table(
+    user_id: str,
+    table: str,
+    format: str = "csv"
+) -> StreamingResponse:
+    """
+    Export one table of a user's data.
+    
+    Supports csv, ndjson and parquet.
+    """
+    if not user_id or not user_id.strip():
+        raise HTTPException(status_code=400, detail="user_id is required")
+    
+    try:
+        ExportService.validate([table], format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if format == "csv":
+        content = ExportService.stream_csv(user_id, table)
+    elif format == "parquet":
+        content = ExportService.stream_parquet(user_id, table)
+    else:
+        content = ExportService.stream_ndjson(user_id, [table])
+    
+    return StreamingResponse(
+        content,
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": _content_disposition(f"{user_id}-{table}.{format}")}
+    )
@@ -1,13 +1,21 @@
 """Eye habits tracking endpoints."""
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.concurrency import run_in_threadpool
 from sqlmodel import Session
+from app.core.fields import parse_fields, sparse_json_response
 from app.db.session import get_session
-from app.schemas import HabitLogCreate, HabitLogResponse, HabitWeeklySummary
+from app.schemas import HabitLogCreate, HabitLogResponse, HabitWeeklySummary, HabitTrends
 from app.services.habit_service import HabitService
-from typing import List
+from app.services.insight_service import InsightService
+from app.services.push_hub import get_push_hub
+from typing import List, Optional
 
 router = APIRouter(prefix="/api/habits", tags=["Habits"])
 
+# Trend ranges longer than this are computed in the threadpool
+TRENDS_OFFLOAD_DAYS = 90
+MAX_TRENDS_DAYS = 730
+
 
 @router.post("/log", response_model=HabitLogResponse)
 async def create_habit_log(
@@ -25,6 +33,7 @@ async def create_habit_log(
     
     try:
         log = HabitService.create_habit_log(session, user_id, habit_log)
+        get_push_hub().publish(user_id, "summary_updated", coalesce=True)
         return HabitLogResponse(
             id=log.id,
             user_id=log.user_id,
@@ -46,17 +55,30 @@ async def create_habit_log(
 async def get_habit_logs(
     user_id: str,
     days: int = 30,
+    fields: Optional[str] = None,
     session: Session = Depends(get_session)
 ) -> List[HabitLogResponse]:
     """
     Get user's habit logs.
     
-    Returns logs from the past N days (default 30).
+    Returns logs from the past N days (default 30). Pass a comma-separated
+    `fields` list (e.g. `fields=id,date,eye_strain_level`) to select only
+    those columns.
     """
     if not user_id or not user_id.strip():
         raise HTTPException(status_code=400, detail="user_id is required")
     
     try:
+        names = parse_fields(fields, list(HabitLogResponse.model_fields))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    try:
+        if names is not None:
+            return sparse_json_response(
+                HabitService.get_user_habit_log_fields(session, user_id, days, names)
+            )
+        
         logs = HabitService.get_user_habit_logs(session, user_id, days)
         return [
             HabitLogResponse(
@@ -93,6 +115,44 @@ async def get_weekly_summary(
     
     try:
         summary = HabitService.get_weekly_summary(session, user_id)
-        return summary
+        # The cached summary is shared, so attach the stored insight to a copy
+        insight = InsightService.get_current_insight(session, user_id)
+        return summary.model_copy(update={"insight": insight}) if insight else summary
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating summary: {str(e)}")
+
+
+@router.get("/trends", response_model=HabitTrends)
+async def get_habit_trends(
+    user_id: str,
+    days: int = 90,
+    window: int = 7,
+    z_threshold: float = 2.5,
+    session: Session = Depends(get_session)
+) -> HabitTrends:
+    """
+    Get daily habit trends.
+    
+    Returns moving averages, week-over-week deltas and anomalous days
+    for screen time and eye strain over the past N days (default 90).
+    """
+    if not user_id or not user_id.strip():
+        raise HTTPException(status_code=400, detail="user_id is required")
+    
+    if days < 7 or days > MAX_TRENDS_DAYS:
+        raise HTTPException(status_code=400, detail=f"days must be between 7 and {MAX_TRENDS_DAYS}")
+    
+    if window < 2 or window > 60:
+        raise HTTPException(status_code=400, detail="window must be between 2 and 60")
+    
+    if z_threshold <= 0:
+        raise HTTPException(status_code=400, detail="z_threshold must be positive")
+    
+    try:
+        if days > TRENDS_OFFLOAD_DAYS:
+            return await run_in_threadpool(
+                HabitService.get_trends, session, user_id, days, window, z_threshold
+            )
+        return HabitService.get_trends(session, user_id, days, window, z_threshold)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error generating trends: {str(e)}")
@@ -1,37 +1,133 @@
 """Learning module endpoints."""
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlmodel import Session, select
-from typing import List
+from typing import List, Optional
+from app.core.fields import fetch_fields, parse_fields, sparse_json_response
+from app.core.http import cached_json_response, cached_json_stream
 from app.db.session import get_session
 from app.schemas import (
     LearningModule,
     QuizSubmission,
     QuizResult,
-    LearningProgressResponse
+    LearningProgressResponse,
+    QuizAttemptResponse,
+    ModuleLeaderboard,
+    ModuleCompletionStats,
+    QuizAnalytics
 )
 from app.services.learning_service import LearningService
+from app.services.preference_service import PreferenceService
+from app.services.progress_service import ProgressService
+from app.services.quiz_analytics_service import QuizAnalyticsService, get_quiz_analytics, quiz_version
+from app.services.translation_service import SOURCE_LANGUAGE, get_translations
 from app.models import LearningProgress
-from datetime import datetime
 
 router = APIRouter(prefix="/api/learning", tags=["Learning"])
 
 
+def _progress_response(progress: LearningProgress) -> LearningProgressResponse:
+    """Build a response schema from a progress row."""
+    return LearningProgressResponse(
+        module_id=progress.module_id,
+        module_title=progress.module_title,
+        completed=progress.completed,
+        quiz_score=progress.quiz_score,
+        attempts=progress.attempts,
+        created_at=progress.created_at,
+        completed_at=progress.completed_at,
+        last_attempt_at=progress.last_attempt_at
+    )
+
+
+def _content_language(session: Session, user_id: Optional[str]) -> str:
+    """The requesting user's preferred language; English for anonymous or unknown users."""
+    if not user_id or not user_id.strip():
+        return SOURCE_LANGUAGE
+    preferences = PreferenceService.find_preferences(session, user_id)
+    return (preferences.language if preferences is not None else None) or SOURCE_LANGUAGE
+
+
+def _localized_response(request: Request, language: str, localized, english) -> Response:
+    """
+    Serve the translation if it is ready, else English.
+    
+    An English fallback for a supported language is not cached by clients,
+    so the translation is picked up as soon as the background task has
+    produced it.
+    """
+    translated = localized() if language != SOURCE_LANGUAGE else None
+    if translated is not None:
+        body, etag = translated
+        return cached_json_response(request, body, etag, language=language)
+    body, etag = english()
+    pending = language != SOURCE_LANGUAGE and get_translations().supports(language)
+    max_age = 0 if pending else 300
+    return cached_json_response(request, body, etag, max_age=max_age, language=SOURCE_LANGUAGE)
+
+
+def _full_catalog_response(request: Request, language: str) -> Response:
+    """Stream the full listing, translated if every module is, else English."""
+    translated = language != SOURCE_LANGUAGE and LearningService.is_catalog_translated(language)
+    served = language if translated else SOURCE_LANGUAGE
+    pending = not translated and language != SOURCE_LANGUAGE and get_translations().supports(language)
+    return cached_json_stream(
+        request,
+        LearningService.iter_catalog_json(served),
+        LearningService.get_catalog_etag(served),
+        max_age=0 if pending else 300,
+        language=served
+    )
+
+
 @router.get("/modules", response_model=List[LearningModule])
-async def get_all_modules():
-    """Get all available learning modules."""
+async def get_all_modules(
+    request: Request,
+    view: str = "full",
+    user_id: Optional[str] = None,
+    session: Session = Depends(get_session)
+) -> Response:
+    """
+    Get all available learning modules.
+    
+    Modules are streamed one body at a time. With `view=summary` only id,
+    title and description are returned, read from the content index
+    without loading module bodies. Both honor If-None-Match with 304, and
+    content is translated into the user's language preference once a
+    translation is available.
+    """
+    if view not in ("full", "summary"):
+        raise HTTPException(status_code=400, detail="view must be 'full' or 'summary'")
+    
     try:
-        modules = LearningService.get_all_modules()
-        return modules
+        language = _content_language(session, user_id)
+        if view == "summary":
+            return _localized_response(
+                request,
+                language,
+                lambda: LearningService.get_localized_summary_json(language),
+                LearningService.get_summary_json
+            )
+        return _full_catalog_response(request, language)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching modules: {str(e)}")
 
 
 @router.get("/modules/{module_id}", response_model=LearningModule)
-async def get_module(module_id: str):
-    """Get a specific learning module by ID."""
+async def get_module(
+    module_id: str,
+    request: Request,
+    user_id: Optional[str] = None,
+    session: Session = Depends(get_session)
+) -> Response:
+    """Get a specific learning module by ID, translated when available."""
     try:
-        module = LearningService.get_module(module_id)
-        return module
+        language = _content_language(session, user_id)
+        return _localized_response(
+            request,
+            language,
+            lambda: LearningService.get_localized_module_json(module_id, language),
+            lambda: LearningService.get_module_json(module_id)
+        )
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -57,18 +153,12 @@ async def submit_quiz(
         # Check quiz
         result = LearningService.check_quiz(module_id, submission.answers)
         
-        # Save progress
+        # Save the attempt and fold it into the user's progress
         module = LearningService.get_module(module_id)
-        progress = LearningProgress(
-            user_id=user_id,
-            module_id=module_id,
-            module_title=module.title,
-            completed=result.passed,
-            quiz_score=result.score,
-            completed_at=datetime.utcnow() if result.passed else None
+        ProgressService.record_attempt(session, user_id, module_id, module.title, result)
+        get_quiz_analytics().record(
+            module_id, quiz_version(module.quiz_questions), submission.answers, result.question_results
         )
-        session.add(progress)
-        session.commit()
         
         return result
     except ValueError as e:
@@ -80,30 +170,34 @@ async def submit_quiz(
 @router.get("/progress", response_model=List[LearningProgressResponse])
 async def get_learning_progress(
     user_id: str,
+    fields: Optional[str] = None,
     session: Session = Depends(get_session)
 ) -> List[LearningProgressResponse]:
-    """Get user's learning progress."""
+    """
+    Get user's learning progress.
+    
+    Pass a comma-separated `fields` list to select only those columns.
+    """
     if not user_id or not user_id.strip():
         raise HTTPException(status_code=400, detail="user_id is required")
     
+    try:
+        names = parse_fields(fields, list(LearningProgressResponse.model_fields))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
     try:
         statement = select(LearningProgress).where(
             LearningProgress.user_id == user_id
         ).order_by(LearningProgress.created_at.desc())
+        if names is not None:
+            return sparse_json_response(
+                fetch_fields(session, statement, LearningProgress, names)
+            )
         
         progress_records = session.exec(statement).all()
         
-        return [
-            LearningProgressResponse(
-                module_id=p.module_id,
-                module_title=p.module_title,
-                completed=p.completed,
-                quiz_score=p.quiz_score,
-                created_at=p.created_at,
-                completed_at=p.completed_at
-            )
-            for p in progress_records
-        ]
+        return [_progress_response(p) for p in progress_records]
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching progress: {str(e)}")
 
@@ -119,25 +213,88 @@ async def get_module_progress(
         raise HTTPException(status_code=400, detail="user_id is required")
     
     try:
-        statement = select(LearningProgress).where(
-            LearningProgress.user_id == user_id,
-            LearningProgress.module_id == module_id
-        )
-        
-        progress = session.exec(statement).first()
+        progress = ProgressService.get_progress(session, user_id, module_id)
         
         if not progress:
             raise HTTPException(status_code=404, detail="Progress not found")
         
-        return LearningProgressResponse(
-            module_id=progress.module_id,
-            module_title=progress.module_title,
-            completed=progress.completed,
-            quiz_score=progress.quiz_score,
-            created_at=progress.created_at,
-            completed_at=progress.completed_at
-        )
+        return _progress_response(progress)
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching progress: {str(e)}")
+
+
+@router.get("/progress/{module_id}/attempts", response_model=List[QuizAttemptResponse])
+async def get_module_attempts(
+    user_id: str,
+    module_id: str,
+    limit: int = Query(default=50, ge=1, le=500),
+    session: Session = Depends(get_session)
+) -> List[QuizAttemptResponse]:
+    """Get a user's quiz attempts for a module, newest first."""
+    if not user_id or not user_id.strip():
+        raise HTTPException(status_code=400, detail="user_id is required")
+    
+    try:
+        attempts = ProgressService.get_attempts(session, user_id, module_id, limit)
+        return [
+            QuizAttemptResponse(
+                module_id=a.module_id,
+                score=a.score,
+                passed=a.passed,
+                created_at=a.created_at
+            )
+            for a in attempts
+        ]
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching attempts: {str(e)}")
+
+
+@router.get("/modules/{module_id}/leaderboard", response_model=ModuleLeaderboard)
+async def get_module_leaderboard(
+    module_id: str,
+    limit: int = Query(default=10, ge=1, le=100),
+    session: Session = Depends(get_session)
+) -> ModuleLeaderboard:
+    """Top best scores for a module; ties go to whoever passed first."""
+    try:
+        LearningService.get_module(module_id)
+        return ProgressService.get_leaderboard(session, module_id, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching leaderboard: {str(e)}")
+
+
+@router.get("/modules/{module_id}/analytics", response_model=QuizAnalytics)
+async def get_quiz_analytics_report(
+    module_id: str,
+    session: Session = Depends(get_session)
+) -> QuizAnalytics:
+    """
+    Per-question quiz analytics for a module.
+    
+    Difficulty is the share of correct responses; discrimination is the
+    item-rest correlation, reported once a question has enough responses.
+    """
+    try:
+        module = LearningService.get_module(module_id)
+        return QuizAnalyticsService.get_analytics(session, module)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching quiz analytics: {str(e)}")
+
+
+@router.get("/stats", response_model=List[ModuleCompletionStats])
+async def get_completion_stats(
+    module_id: Optional[str] = None,
+    session: Session = Depends(get_session)
+) -> List[ModuleCompletionStats]:
+    """Learner counts, completion rate and average best score per module."""
+    try:
+        return ProgressService.get_completion_stats(session, module_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching completion stats: {str(e)}")
+
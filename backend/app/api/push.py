@@ -0,0 +1,94 @@
+"""Server push endpoints for reminders and notifications."""
+import asyncio
+import json
+from fastapi import APIRouter, HTTPException, Request, WebSocket
+from fastapi.responses import StreamingResponse
+from app.core.config import settings
+from app.services.push_hub import PushConnection, get_push_hub
+
+router = APIRouter(prefix="/api/push", tags=["Push"])
+
+
+@router.websocket("/ws")
+async def push_websocket(websocket: WebSocket, user_id: str = ""):
+    """
+    WebSocket channel for reminder and notification events.
+    
+    Sends a heartbeat message when no event arrives within the heartbeat interval.
+    """
+    if not user_id or not user_id.strip():
+        await websocket.close(code=1008)
+        return
+    
+    await websocket.accept()
+    hub = get_push_hub()
+    connection = hub.connect(user_id)
+    receiver = asyncio.create_task(_watch_for_disconnect(websocket, connection))
+    
+    try:
+        while not connection.closed:
+            message = await connection.get(timeout=settings.push_heartbeat_seconds)
+            if connection.closed:
+                break
+            await websocket.send_json(message or {"type": "heartbeat"})
+    except Exception:
+        # Client went away mid-send; the socket implementation decides the error type
+        pass
+    finally:
+        receiver.cancel()
+        hub.disconnect(connection)
+
+
+@router.get("/events")
+async def push_events(request: Request, user_id: str) -> StreamingResponse:
+    """
+    Server-sent events channel for reminder and notification events.
+    
+    Fallback for clients that cannot use WebSockets.
+    """
+    if not user_id or not user_id.strip():
+        raise HTTPException(status_code=400, detail="user_id is required")
+    
+    hub = get_push_hub()
+    connection = hub.connect(user_id)
+    
+    async def stream():
+        try:
+            while not connection.closed and not await request.is_disconnected():
+                message = await connection.get(timeout=settings.push_heartbeat_seconds)
+                if message is None:
+                    yield ": heartbeat\n\n"
+                else:
+                    yield f"event: {message['type']}\ndata: {json.dumps(message)}\n\n"
+        finally:
+            hub.disconnect(connection)
+    
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/stats")
+async def get_push_stats():
+    """
+    Connection and delivery counters for this worker.
+    
+    `delivers_reminders` is false on workers without the reminder
+    scheduler; their clients receive no reminder events.
+    """
+    return get_push_hub().stats()
+
+
+async def _watch_for_disconnect(websocket: WebSocket, connection: PushConnection) -> None:
+    """Read and discard client frames until the socket closes."""
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+    except Exception:
+        pass
+    finally:
+        connection.close()
@@ -1,15 +1,58 @@
 """Reminders and notifications endpoints."""
 from fastapi import APIRouter, Depends, HTTPException
 from sqlmodel import Session, select
+from app.core.config import settings
+from app.core.fields import fetch_fields, parse_fields, sparse_json_response
 from app.db.session import get_session
 from app.models import EyeHealthReminder
-from app.schemas import ReminderCreate, ReminderUpdate, ReminderResponse
-from typing import List
+from app.schemas import (
+    ReminderCreate,
+    ReminderUpdate,
+    ReminderResponse,
+    ReminderOccurrence,
+    ReminderEventBatch,
+    ReminderEventIngestResult,
+    ReminderAdherenceReport,
+    ReminderTemplate,
+    ReminderTemplateApply,
+    ReminderBulkUpdate,
+    ReminderFilter,
+    ReminderBulkDeleteResult
+)
+from app.services.adherence_service import AdherenceService
+from app.services.preference_service import PreferenceService
+from app.services.reminder_scheduler import get_reminder_scheduler
+from app.services.reminder_service import ReminderService, REMINDER_TEMPLATES
+from app.services.sync_service import SyncService, DELETE
+from typing import List, Optional
 from datetime import datetime
 
 router = APIRouter(prefix="/api/reminders", tags=["Reminders"])
 
 
+def _sync_schedule(reminder: EyeHealthReminder) -> None:
+    """Mirror a reminder change into the server-side scheduler."""
+    if settings.reminder_scheduler_enabled:
+        get_reminder_scheduler().sync(reminder)
+
+
+def _to_response(reminder: EyeHealthReminder) -> ReminderResponse:
+    """Build a response schema from a reminder row."""
+    return ReminderResponse(
+        id=reminder.id,
+        user_id=reminder.user_id,
+        reminder_type=reminder.reminder_type,
+        interval_minutes=reminder.interval_minutes,
+        use_browser_notification=reminder.use_browser_notification,
+        notification_sound=reminder.notification_sound,
+        is_enabled=reminder.is_enabled,
+        next_fire_at=reminder.next_fire_at,
+        last_fired_at=reminder.last_fired_at,
+        created_at=reminder.created_at,
+        updated_at=reminder.updated_at
+    )
+
+
 @router.post("/", response_model=ReminderResponse)
 async def create_reminder(
     user_id: str,
@@ -35,21 +78,15 @@ async def create_reminder(
             use_browser_notification=reminder.use_browser_notification,
             notification_sound=reminder.notification_sound
         )
+        ReminderService.reset_schedule(db_reminder)
         session.add(db_reminder)
+        session.flush()
+        SyncService.record(session, user_id, EyeHealthReminder.__tablename__, [db_reminder.id])
         session.commit()
         session.refresh(db_reminder)
+        _sync_schedule(db_reminder)
         
-        return ReminderResponse(
-            id=db_reminder.id,
-            user_id=db_reminder.user_id,
-            reminder_type=db_reminder.reminder_type,
-            interval_minutes=db_reminder.interval_minutes,
-            use_browser_notification=db_reminder.use_browser_notification,
-            notification_sound=db_reminder.notification_sound,
-            is_enabled=db_reminder.is_enabled,
-            created_at=db_reminder.created_at,
-            updated_at=db_reminder.updated_at
-        )
+        return _to_response(db_reminder)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error creating reminder: {str(e)}")
 
@@ -57,36 +94,188 @@ async def create_reminder(
 @router.get("/", response_model=List[ReminderResponse])
 async def list_reminders(
     user_id: str,
+    fields: Optional[str] = None,
     session: Session = Depends(get_session)
 ) -> List[ReminderResponse]:
-    """Get all reminders for a user."""
+    """
+    Get all reminders for a user.
+    
+    Pass a comma-separated `fields` list to select only those columns.
+    """
     if not user_id or not user_id.strip():
         raise HTTPException(status_code=400, detail="user_id is required")
     
+    try:
+        names = parse_fields(fields, list(ReminderResponse.model_fields))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
     try:
         statement = select(EyeHealthReminder).where(
             EyeHealthReminder.user_id == user_id
         )
+        if names is not None:
+            return sparse_json_response(
+                fetch_fields(session, statement, EyeHealthReminder, names)
+            )
+        
         reminders = session.exec(statement).all()
         
-        return [
-            ReminderResponse(
-                id=r.id,
-                user_id=r.user_id,
-                reminder_type=r.reminder_type,
-                interval_minutes=r.interval_minutes,
-                use_browser_notification=r.use_browser_notification,
-                notification_sound=r.notification_sound,
-                is_enabled=r.is_enabled,
-                created_at=r.created_at,
-                updated_at=r.updated_at
-            )
-            for r in reminders
-        ]
+        return [_to_response(r) for r in reminders]
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching reminders: {str(e)}")
 
 
+@router.get("/calendar", response_model=List[ReminderOccurrence])
+async def get_reminder_calendar(
+    user_id: str,
+    limit: int = 50,
+    horizon_days: int = 7,
+    session: Session = Depends(get_session)
+) -> List[ReminderOccurrence]:
+    """
+    Get the next fire times across all of a user's reminders.
+    
+    Times fall inside the user's working hours and outside quiet hours,
+    in their time zone, merged into one list sorted by fire time.
+    """
+    if not user_id or not user_id.strip():
+        raise HTTPException(status_code=400, detail="user_id is required")
+    
+    if limit < 1 or limit > 500:
+        raise HTTPException(status_code=400, detail="limit must be between 1 and 500")
+    
+    if horizon_days < 1 or horizon_days > 31:
+        raise HTTPException(status_code=400, detail="horizon_days must be between 1 and 31")
+    
+    try:
+        preferences = PreferenceService.get_or_create_preferences(session, user_id)
+        return ReminderService.get_calendar(session, user_id, preferences, limit, horizon_days)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error building reminder calendar: {str(e)}")
+
+
+@router.post("/events", response_model=ReminderEventIngestResult)
+async def ingest_reminder_events(
+    user_id: str,
+    batch: ReminderEventBatch,
+    session: Session = Depends(get_session)
+) -> ReminderEventIngestResult:
+    """
+    Record a batch of reminder events.
+    
+    Clients report when a reminder was shown (fired) and how the user
+    responded (acknowledged, snoozed, dismissed).
+    """
+    if not user_id or not user_id.strip():
+        raise HTTPException(status_code=400, detail="user_id is required")
+    
+    try:
+        accepted = AdherenceService.ingest_events(session, user_id, batch.events)
+        return ReminderEventIngestResult(accepted=accepted)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error recording reminder events: {str(e)}")
+
+
+@router.get("/adherence", response_model=ReminderAdherenceReport)
+async def get_reminder_adherence(
+    user_id: str,
+    days: int = 30,
+    session: Session = Depends(get_session)
+) -> ReminderAdherenceReport:
+    """Get break adherence per reminder type over the past N days (default 30)."""
+    if not user_id or not user_id.strip():
+        raise HTTPException(status_code=400, detail="user_id is required")
+    
+    if days < 1 or days > 365:
+        raise HTTPException(status_code=400, detail="days must be between 1 and 365")
+    
+    try:
+        return AdherenceService.get_adherence(session, user_id, days)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching adherence: {str(e)}")
+
+
+@router.get("/templates", response_model=List[ReminderTemplate])
+async def list_reminder_templates() -> List[ReminderTemplate]:
+    """Get the preset reminder templates."""
+    return list(REMINDER_TEMPLATES.values())
+
+
+@router.post("/bulk/templates", response_model=List[ReminderResponse])
+async def create_reminders_from_templates(
+    user_id: str,
+    request: ReminderTemplateApply,
+    session: Session = Depends(get_session)
+) -> List[ReminderResponse]:
+    """
+    Create reminders from preset templates in one transaction.
+    
+    Creates the full standard bundle when no templates are named.
+    """
+    if not user_id or not user_id.strip():
+        raise HTTPException(status_code=400, detail="user_id is required")
+    
+    try:
+        reminders = ReminderService.apply_templates(
+            session, user_id, request.templates, request.skip_existing
+        )
+        for reminder in reminders:
+            _sync_schedule(reminder)
+        return [_to_response(r) for r in reminders]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error creating reminders: {str(e)}")
+
+
+@router.patch("/bulk", response_model=List[ReminderResponse])
+async def bulk_update_reminders(
+    user_id: str,
+    request: ReminderBulkUpdate,
+    session: Session = Depends(get_session)
+) -> List[ReminderResponse]:
+    """
+    Update every reminder matching a filter in one transaction.
+    
+    For example, pause all reminders during a meeting.
+    """
+    if not user_id or not user_id.strip():
+        raise HTTPException(status_code=400, detail="user_id is required")
+    
+    try:
+        reminders = ReminderService.bulk_update(session, user_id, request.filter, request.update)
+        for reminder in reminders:
+            _sync_schedule(reminder)
+        return [_to_response(r) for r in reminders]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error updating reminders: {str(e)}")
+
+
+@router.post("/bulk/delete", response_model=ReminderBulkDeleteResult)
+async def bulk_delete_reminders(
+    user_id: str,
+    reminder_filter: ReminderFilter,
+    session: Session = Depends(get_session)
+) -> ReminderBulkDeleteResult:
+    """Delete every reminder matching a filter with a single statement."""
+    if not user_id or not user_id.strip():
+        raise HTTPException(status_code=400, detail="user_id is required")
+    
+    try:
+        ids = ReminderService.bulk_delete(session, user_id, reminder_filter)
+        if settings.reminder_scheduler_enabled:
+            for reminder_id in ids:
+                get_reminder_scheduler().unschedule(reminder_id)
+        return ReminderBulkDeleteResult(deleted=len(ids), ids=ids)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error deleting reminders: {str(e)}")
+
+
 @router.patch("/{reminder_id}", response_model=ReminderResponse)
 async def update_reminder(
     user_id: str,
@@ -113,21 +302,15 @@ async def update_reminder(
             setattr(reminder, key, value)
         
         reminder.updated_at = datetime.utcnow()
+        if "interval_minutes" in update_data or "is_enabled" in update_data:
+            ReminderService.reset_schedule(reminder, reminder.updated_at)
         session.add(reminder)
+        SyncService.record(session, user_id, EyeHealthReminder.__tablename__, [reminder_id])
         session.commit()
         session.refresh(reminder)
+        _sync_schedule(reminder)
         
-        return ReminderResponse(
-            id=reminder.id,
-            user_id=reminder.user_id,
-            reminder_type=reminder.reminder_type,
-            interval_minutes=reminder.interval_minutes,
-            use_browser_notification=reminder.use_browser_notification,
-            notification_sound=reminder.notification_sound,
-            is_enabled=reminder.is_enabled,
-            created_at=reminder.created_at,
-            updated_at=reminder.updated_at
-        )
+        return _to_response(reminder)
     except HTTPException:
         raise
     except Exception as e:
@@ -155,7 +338,10 @@ async def delete_reminder(
             raise HTTPException(status_code=404, detail="Reminder not found")
         
         session.delete(reminder)
+        SyncService.record(session, user_id, EyeHealthReminder.__tablename__, [reminder_id], DELETE)
         session.commit()
+        if settings.reminder_scheduler_enabled:
+            get_reminder_scheduler().unschedule(reminder_id)
         
         return {"status": "deleted"}
     except HTTPException:
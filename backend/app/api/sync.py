@@ -0,0 +1,38 @@
+"""Delta sync endpoints."""
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlmodel import Session
+from typing import Optional
+from app.db.session import get_session
+from app.schemas import SyncChanges
+from app.services.sync_service import SyncService
+
+router = APIRouter(prefix="/api/sync", tags=["Sync"])
+
+
+@router.get("/changes", response_model=SyncChanges)
+async def get_changes(
+    user_id: str,
+    since: Optional[int] = Query(default=None, ge=0),
+    limit: int = Query(default=500, ge=1, le=5000),
+    session: Session = Depends(get_session)
+) -> SyncChanges:
+    """
+    Get changes to habit logs, reminders, preferences and learning progress.
+    
+    Without `since`, returns only the current version: take it before the
+    initial full fetch, then poll with `since` set to the last `version`
+    received. Keep paging while `has_more` is true.
+    """
+    if not user_id or not user_id.strip():
+        raise HTTPException(status_code=400, detail="user_id is required")
+    
+    try:
+        if since is None:
+            return SyncChanges(
+                version=SyncService.get_version(session, user_id),
+                has_more=False,
+                changes=[]
+            )
+        return SyncService.get_changes(session, user_id, since, limit)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching changes: {str(e)}")
@@ -0,0 +1,140 @@
+"""In-process caching utilities."""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+_MISSING = object()
+
+# All caches created in this process, by name, for metrics reporting
+_registry: Dict[str, "LRUCache"] = {}
+
+
+class LRUCache:
+    """Thread-safe LRU cache with optional TTL and hit-ratio metrics.
+
+    Caches are per process: with several workers each one holds its own
+    copy, so invalidation only affects the worker that performed the write.
+    """
+
+    def __init__(self, name: str, maxsize: int = 1024, ttl_seconds: Optional[float] = None):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Keys whose factory is running: (computations in flight, version);
+        # invalidation bumps the version so a stale result is not stored
+        self._computing: Dict[Hashable, list] = {}
+        _registry[name] = self
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default on a miss."""
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entry if full."""
+        with self._lock:
+            self._store(key, value)
+
+    def get_or_set(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """
+        Read-through lookup: compute and store the value on a miss.
+
+        The factory runs outside the lock; if the key is invalidated while
+        it runs, the result is returned but not stored, since it may have
+        been computed from data the invalidating write replaced.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        with self._lock:
+            computing = self._computing.setdefault(key, [0, 0])
+            computing[0] += 1
+            version = computing[1]
+        try:
+            value = factory()
+        except BaseException:
+            with self._lock:
+                self._finish_computing(key)
+            raise
+        with self._lock:
+            if self._finish_computing(key) == version:
+                self._store(key, value)
+        return value
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a single entry."""
+        with self._lock:
+            self._data.pop(key, None)
+            self._bump(key)
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]) -> None:
+        """Drop every entry whose key matches predicate."""
+        with self._lock:
+            for key in [k for k in self._data if predicate(k)]:
+                del self._data[key]
+            for key in [k for k in self._computing if predicate(k)]:
+                self._bump(key)
+
+    def clear(self) -> None:
+        """Drop all entries and reset counters."""
+        with self._lock:
+            self._data.clear()
+            for key in self._computing:
+                self._bump(key)
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return size and hit-ratio metrics."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        """Insert under the lock, evicting least recently used entries."""
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def _bump(self, key: Hashable) -> None:
+        """Mark in-flight computations of key as stale (lock held)."""
+        computing = self._computing.get(key)
+        if computing is not None:
+            computing[1] += 1
+
+    def _finish_computing(self, key: Hashable) -> int:
+        """Unregister one computation of key and return the key's version (lock held)."""
+        computing = self._computing[key]
+        computing[0] -= 1
+        if computing[0] == 0:
+            del self._computing[key]
+        return computing[1]
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Return metrics for every registered cache."""
+    return {name: cache.stats() for name, cache in _registry.items()}
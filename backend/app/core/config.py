@@ -36,6 +36,58 @@ class Settings(BaseSettings):
     openrouter_model: str = "openai/gpt-4o-mini"
     openrouter_temperature: float = 0.7
     openrouter_site_url: str = "http://localhost:5173"
+    
+    # Background jobs
+    reminder_scheduler_enabled: bool = True
+    insight_job_enabled: bool = True
+    insight_job_hour_utc: int = 2
+    insight_chunk_size: int = 100
+    insight_concurrency: int = 4
+    insight_requests_per_minute: float = 60.0
+    
+    # Upstream LLM call scheduling (background calls use at most
+    # llm_background_concurrency of the llm_concurrency slots)
+    llm_concurrency: int = 8
+    llm_background_concurrency: int = 6
+    llm_fair_quantum: int = 500
+    
+    # Provider call deadlines: percentile of recent latencies times the
+    # multiplier, clamped to [min, max]; initial until min_samples calls
+    ai_deadline_initial_seconds: float = 30.0
+    ai_deadline_min_seconds: float = 5.0
+    ai_deadline_max_seconds: float = 60.0
+    ai_deadline_percentile: float = 0.99
+    ai_deadline_multiplier: float = 1.5
+    ai_deadline_min_samples: int = 20
+    
+    # Push delivery
+    push_heartbeat_seconds: float = 25.0
+    push_queue_size: int = 100
+    
+    # Caching
+    summary_cache_size: int = 10000
+    summary_cache_ttl_seconds: int = 300
+    preferences_cache_size: int = 10000
+    preferences_cache_ttl_seconds: int = 60
+    idempotency_cache_size: int = 10000
+    idempotency_ttl_seconds: int = 86400
+    chat_cache_enabled: bool = True
+    chat_cache_size: int = 2000
+    chat_cache_ttl_seconds: int = 86400
+    chat_cache_similarity: float = 0.6
+    
+    # Learning content (empty directory means the bundled app/content/learning)
+    learning_content_dir: str = ""
+    learning_cache_size: int = 128
+    learning_reload_seconds: float = 2.0
+    quiz_analytics_flush_seconds: float = 10.0
+    
+    # Translation of learning content and tips (languages other than "en")
+    translation_languages: str = "es,fr,de,pt,it,hi,zh,ja"
+    translation_cache_dir: str = "./translations"
+    translation_batch_size: int = 20
+    translation_interval_seconds: float = 2.0
+    translation_retry_seconds: float = 300.0
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,32 @@
+"""Sparse fieldsets for list endpoints (`?fields=id,date,notes`)."""
+from typing import Any, Dict, List, Optional, Sequence
+from fastapi import Response
+from pydantic import TypeAdapter
+from sqlmodel import Session
+
+_rows_adapter = TypeAdapter(List[Dict[str, Any]])
+
+
+def parse_fields(fields: Optional[str], allowed: Sequence[str]) -> Optional[List[str]]:
+    """Parse a comma-separated field list; None means every field."""
+    if fields is None:
+        return None
+    names = list(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    if not names:
+        raise ValueError("fields must name at least one field")
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}. Supported: {', '.join(allowed)}")
+    return names
+
+
+def fetch_fields(session: Session, statement, model, names: List[str]) -> List[Dict[str, Any]]:
+    """Run a SELECT of `model` projected to only the named columns."""
+    columns = [getattr(model, name) for name in names]
+    rows = session.execute(statement.with_only_columns(*columns)).all()
+    return [dict(zip(names, row)) for row in rows]
+
+
+def sparse_json_response(rows: List[Dict[str, Any]]) -> Response:
+    """Encode projected rows directly, skipping response-model validation."""
+    return Response(content=_rows_adapter.dump_json(rows), media_type="application/json")
@@ -0,0 +1,95 @@
+"""HTTP caching and request lifecycle helpers."""
+import asyncio
+import hashlib
+from typing import Awaitable, Dict, Iterator, Optional, TypeVar
+from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
+
+T = TypeVar("T")
+
+# Non-standard status (from nginx) for requests the client abandoned
+CLIENT_CLOSED_REQUEST = 499
+
+
+class ClientDisconnected(Exception):
+    """The client went away before the response was ready."""
+
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag derived from a content hash."""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match header matches an ETag."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [tag.strip() for tag in header.split(",")]
+    # Weak comparison, as RFC 9110 requires for If-None-Match
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def cached_json_response(
+    request: Request,
+    body: bytes,
+    etag: str,
+    max_age: int = 300,
+    language: Optional[str] = None
+) -> Response:
+    """Serve pre-encoded JSON, or 304 Not Modified when the client's copy is current."""
+    headers = _cache_headers(etag, max_age, language)
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def cached_json_stream(
+    request: Request,
+    chunks: Iterator[bytes],
+    etag: str,
+    max_age: int = 300,
+    language: Optional[str] = None
+) -> Response:
+    """Stream JSON produced chunk by chunk, or 304 Not Modified when the client's copy is current."""
+    headers = _cache_headers(etag, max_age, language)
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return StreamingResponse(chunks, media_type="application/json", headers=headers)
+
+
+def _cache_headers(etag: str, max_age: int, language: Optional[str]) -> Dict[str, str]:
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={max_age}",
+    }
+    if language:
+        headers["Content-Language"] = language
+    return headers
+
+
+async def cancel_on_disconnect(request: Request, awaitable: Awaitable[T]) -> T:
+    """
+    Await work on behalf of a request, cancelling it if the client disconnects.
+
+    Must be called after the request body has been read: the only message
+    left to receive is the disconnect.
+    """
+    work = asyncio.ensure_future(awaitable)
+    watcher = asyncio.ensure_future(_wait_for_disconnect(request))
+    try:
+        await asyncio.wait({work, watcher}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        watcher.cancel()
+        if not work.done():
+            work.cancel()
+            # Let the work unwind and release what it holds before returning
+            await asyncio.wait({work})
+    if work.cancelled():
+        raise ClientDisconnected()
+    return work.result()
+
+
+async def _wait_for_disconnect(request: Request) -> None:
+    while (await request.receive())["type"] != "http.disconnect":
+        pass
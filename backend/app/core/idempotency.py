@@ -0,0 +1,209 @@
+"""Idempotency-Key support for POST requests."""
+import asyncio
+import hashlib
+import json
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.http import CLIENT_CLOSED_REQUEST
+
+HEADER = b"idempotency-key"
+REPLAYED_HEADER = b"idempotent-replayed"
+MAX_KEY_LENGTH = 255
+
+StoreKey = Tuple[str, str, str]
+
+
+class StoredResponse(NamedTuple):
+    """A completed response, replayed verbatim on retries."""
+
+    fingerprint: str
+    status: int
+    headers: List[Tuple[bytes, bytes]]
+    body: bytes
+
+
+class IdempotencyConflict(Exception):
+    """The key was already used with a different request body."""
+
+
+class IdempotencyStore:
+    """Bounded, TTL'd record of idempotency keys and their responses.
+
+    Completed responses live in an LRU cache; requests still executing are
+    tracked as futures so a concurrent retry waits for the original instead
+    of running the handler again. Like the other caches this is per
+    process: a retry that reaches a different worker is not deduplicated.
+    """
+
+    def __init__(self, maxsize: int, ttl_seconds: float):
+        self._responses = LRUCache("idempotency", maxsize=maxsize, ttl_seconds=ttl_seconds)
+        self._in_flight: Dict[StoreKey, Tuple[str, asyncio.Future]] = {}
+
+    async def acquire(self, key: StoreKey, fingerprint: str) -> Optional[StoredResponse]:
+        """
+        Return the stored response for key, or None if the caller should execute.
+
+        A None return registers the caller as the owner of the key; it must
+        then call complete() or release().
+        """
+        while True:
+            stored = self._responses.get(key)
+            if stored is not None:
+                _check_fingerprint(stored.fingerprint, fingerprint)
+                return stored
+
+            pending = self._in_flight.get(key)
+            if pending is None:
+                self._in_flight[key] = (fingerprint, asyncio.get_running_loop().create_future())
+                return None
+
+            _check_fingerprint(pending[0], fingerprint)
+            result = await asyncio.shield(pending[1])
+            # None means the original failed without a response: take over
+            if result is not None:
+                return result
+
+    def complete(self, key: StoreKey, response: StoredResponse) -> None:
+        """Hand the response to waiting retries; keep it unless it was a server error."""
+        _, future = self._in_flight.pop(key)
+        if response.status < 500:
+            self._responses.set(key, response)
+        future.set_result(response)
+
+    def release(self, key: StoreKey) -> None:
+        """Give up ownership after a failure so the next retry executes."""
+        _, future = self._in_flight.pop(key)
+        future.set_result(None)
+
+    def clear(self) -> None:
+        """Drop completed responses (in-flight requests are unaffected)."""
+        self._responses.clear()
+
+
+def _check_fingerprint(stored: str, received: str) -> None:
+    """A key may only be reused for the same request body."""
+    if stored != received:
+        raise IdempotencyConflict()
+
+
+class IdempotencyMiddleware:
+    """ASGI middleware honoring the Idempotency-Key header on POST requests.
+
+    Keys are scoped to the path and query string (which carries user_id),
+    so two users cannot collide on the same key.
+    """
+
+    def __init__(self, app, store: "IdempotencyStore"):
+        self.app = app
+        self.store = store
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST":
+            await self.app(scope, receive, send)
+            return
+
+        raw_key = dict(scope["headers"]).get(HEADER)
+        if raw_key is None:
+            await self.app(scope, receive, send)
+            return
+
+        idempotency_key = raw_key.decode("latin-1").strip()
+        if not idempotency_key or len(idempotency_key) > MAX_KEY_LENGTH:
+            await _send_error(send, 400, f"Idempotency-Key must be 1-{MAX_KEY_LENGTH} characters")
+            return
+
+        body = await _read_body(receive)
+        key = (scope["path"], scope.get("query_string", b"").decode("latin-1"), idempotency_key)
+        fingerprint = hashlib.sha256(body).hexdigest()
+
+        try:
+            stored = await self.store.acquire(key, fingerprint)
+        except IdempotencyConflict:
+            await _send_error(send, 422, "Idempotency-Key was already used with a different request body")
+            return
+
+        if stored is not None:
+            await _replay(send, stored)
+            return
+
+        status = 500
+        headers: List[Tuple[bytes, bytes]] = []
+        chunks: List[bytes] = []
+        body_sent = False
+
+        async def replay_receive():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        async def capture_send(message):
+            nonlocal status, headers
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, replay_receive, capture_send)
+        except BaseException:
+            self.store.release(key)
+            raise
+        if status == CLIENT_CLOSED_REQUEST:
+            # Nobody received it; a retry should execute, not replay
+            self.store.release(key)
+            return
+        self.store.complete(key, StoredResponse(fingerprint, status, headers, b"".join(chunks)))
+
+
+async def _read_body(receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks)
+
+
+async def _replay(send, stored: StoredResponse) -> None:
+    await send({
+        "type": "http.response.start",
+        "status": stored.status,
+        "headers": stored.headers + [(REPLAYED_HEADER, b"true")],
+    })
+    await send({"type": "http.response.body", "body": stored.body})
+
+
+async def _send_error(send, status: int, detail: str) -> None:
+    body = json.dumps({"detail": detail}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+# Singleton instance
+_store: Optional[IdempotencyStore] = None
+
+
+def get_idempotency_store() -> IdempotencyStore:
+    """Get or create the idempotency store."""
+    global _store
+    if _store is None:
+        _store = IdempotencyStore(
+            maxsize=settings.idempotency_cache_size,
+            ttl_seconds=settings.idempotency_ttl_seconds
+        )
+    return _store
@@ -1,5 +1,6 @@
 """Database connection and session management."""
 from sqlmodel import SQLModel, create_engine, Session
+from sqlalchemy import inspect, literal, text
 from sqlalchemy.pool import StaticPool
 from app.core.config import settings
 import logging
@@ -20,10 +21,146 @@ else:
 
 def create_db_and_tables():
     """Create all database tables."""
+    check_dialect()
     SQLModel.metadata.create_all(engine)
+    _add_missing_columns()
     logger.info("Database tables created successfully")
 
 
+def _add_missing_columns():
+    """Add columns and indexes introduced after a table was created.
+
+    create_all() only creates missing tables, so existing databases would
+    otherwise lack newer columns. Only nullable columns and columns with a
+    scalar default can be added this way.
+    """
+    with engine.begin() as connection:
+        # Inspect through the same connection: with StaticPool a separate
+        # checkout would roll back this transaction when it is returned
+        inspector = inspect(connection)
+        for table in SQLModel.metadata.sorted_tables:
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            existing_indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(dialect=engine.dialect)}"
+                if not column.nullable:
+                    if column.default is None or not column.default.is_scalar:
+                        logger.warning(f"Cannot add NOT NULL column {table.name}.{column.name} without a default")
+                        continue
+                    default = literal(column.default.arg, column.type).compile(
+                        dialect=engine.dialect,
+                        compile_kwargs={"literal_binds": True}
+                    )
+                    ddl += f" NOT NULL DEFAULT {default}"
+                connection.execute(text(ddl))
+                logger.info(f"Added column {table.name}.{column.name}")
+            for index in table.indexes:
+                if index.name in existing_indexes:
+                    continue
+                if index.unique and table.name in _DEDUPLICATE:
+                    _DEDUPLICATE[table.name](connection)
+                index.create(connection, checkfirst=True)
+                logger.info(f"Created index {index.name}")
+            retired = _RETIRED_CONSTRAINTS.get(table.name)
+            if retired and retired in {c["name"] for c in inspector.get_unique_constraints(table.name)}:
+                _rebuild_table(connection, table)
+                logger.info(f"Rebuilt {table.name} without constraint {retired}")
+
+
+def _rebuild_table(connection, table):
+    """Recreate a table from the current model, keeping its rows.
+
+    SQLite cannot drop a constraint in place, so the rows are copied out,
+    the table is dropped and created again, and the rows copied back.
+    """
+    columns = ", ".join(column.name for column in table.columns)
+    connection.execute(text(f"CREATE TEMPORARY TABLE rebuild_{table.name} AS SELECT {columns} FROM {table.name}"))
+    table.drop(connection)
+    table.create(connection)
+    connection.execute(text(f"INSERT INTO {table.name} ({columns}) SELECT {columns} FROM rebuild_{table.name}"))
+    connection.execute(text(f"DROP TABLE rebuild_{table.name}"))
+
+
+def _merge_learning_progress(connection):
+    """Collapse per-attempt progress rows into one row per (user, module).
+
+    Older versions inserted a progress row per quiz attempt. Each such row
+    is copied into the attempt history, then the earliest row of every
+    group keeps the best score, attempt count and first pass time.
+    """
+    has_attempts = connection.execute(text("SELECT 1 FROM learning_quiz_attempts LIMIT 1")).first()
+    if has_attempts is None:
+        connection.execute(text(
+            "INSERT INTO learning_quiz_attempts (user_id, module_id, score, passed, created_at) "
+            "SELECT user_id, module_id, COALESCE(quiz_score, 0), completed, created_at "
+            "FROM learning_progress"
+        ))
+    group = "p.user_id = learning_progress.user_id AND p.module_id = learning_progress.module_id"
+    connection.execute(text(
+        "UPDATE learning_progress SET "
+        f"quiz_score = (SELECT MAX(p.quiz_score) FROM learning_progress p WHERE {group}), "
+        f"completed = EXISTS (SELECT 1 FROM learning_progress p WHERE {group} AND p.completed), "
+        f"completed_at = (SELECT MIN(p.completed_at) FROM learning_progress p WHERE {group}), "
+        f"attempts = (SELECT COUNT(*) FROM learning_progress p WHERE {group}), "
+        f"last_attempt_at = (SELECT MAX(p.created_at) FROM learning_progress p WHERE {group})"
+    ))
+    connection.execute(text(
+        "DELETE FROM learning_progress WHERE id NOT IN "
+        "(SELECT MIN(id) FROM learning_progress GROUP BY user_id, module_id)"
+    ))
+    logger.info("Merged duplicate learning progress rows")
+
+
+def _number_change_log(connection):
+    """Give change log rows written before per-user versions one.
+
+    Each row keeps its id as its version, so version tokens clients
+    already hold stay valid, and every user's counter starts at their
+    latest row.
+    """
+    connection.execute(text("UPDATE change_log SET version = id"))
+    connection.execute(text(
+        "INSERT INTO sync_versions (user_id, version) "
+        "SELECT user_id, MAX(version) FROM change_log GROUP BY user_id"
+    ))
+    logger.info("Numbered change log rows with per-user versions")
+
+
+# Data fixes to run before a unique index is first created on a table
+_DEDUPLICATE = {
+    "learning_progress": _merge_learning_progress,
+    "change_log": _number_change_log,
+}
+
+# Unique constraints since widened; tables still carrying one are rebuilt
+_RETIRED_CONSTRAINTS = {
+    "quiz_item_stats": "uq_quiz_item_stats",
+    "quiz_option_counts": "uq_quiz_option_counts",
+}
+
+
+# Databases whose INSERT supports ON CONFLICT upserts
+UPSERT_DIALECTS = ("postgresql", "sqlite")
+
+
+def check_dialect() -> None:
+    """Fail at startup on a database the upsert paths cannot run on."""
+    if engine.dialect.name not in UPSERT_DIALECTS:
+        raise RuntimeError(f"Upserts are not supported on {engine.dialect.name}")
+
+
+def dialect_insert(model):
+    """INSERT construct with ON CONFLICT support for the configured database."""
+    check_dialect()
+    if engine.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(model)
+
+
 def get_session():
     """Dependency to get database session."""
     with Session(engine) as session:
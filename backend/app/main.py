@@ -3,11 +3,24 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
+from app.core.cache import cache_stats
 from app.core.config import settings
+from app.core.idempotency import IdempotencyMiddleware, get_idempotency_store
 from app.core.logging import setup_logging
-from app.db.session import create_db_and_tables
-from app.api import chat, habits, reminders, learning, reading_comfort
+from app.db.session import create_db_and_tables, engine
+from app.api import chat, habits, reminders, learning, reading_comfort, export, push, dashboard, sync
 from app.schemas import HealthCheck
+from app.services.ai_service import get_ai_service
+from app.services.comfort_service import ComfortService
+from app.services.insight_service import InsightService, get_insight_job
+from app.services.learning_service import LearningService
+from app.services.llm_scheduler import get_llm_scheduler
+from app.services.preference_service import PreferenceService
+from app.services.push_hub import get_push_hub
+from app.services.quiz_analytics_service import get_quiz_analytics
+from app.services.reminder_scheduler import get_reminder_scheduler
+from app.services.translation_service import get_translations
+from sqlmodel import Session
 import logging
 
 logger = logging.getLogger(__name__)
@@ -21,9 +34,33 @@ async def lifespan(app: FastAPI):
     setup_logging()
     create_db_and_tables()
     logger.info("Database initialized")
+    LearningService.get_summary()
+    ComfortService.get_table()
+    get_quiz_analytics().start(settings.quiz_analytics_flush_seconds)
+    translations = get_translations()
+    with Session(engine) as session:
+        languages = [lang for lang in PreferenceService.get_languages(session) if translations.supports(lang)]
+    for language in languages:
+        LearningService.request_translations(language)
+        ComfortService.request_translations(language)
+    translations.start(settings.translation_interval_seconds)
+    scheduler = get_reminder_scheduler()
+    scheduler.add_listener(get_push_hub().publish_reminder)
+    # Reminder events are only produced, and pushed, on the scheduler's worker
+    get_push_hub().delivers_reminders = settings.reminder_scheduler_enabled
+    if settings.reminder_scheduler_enabled:
+        with Session(engine) as session:
+            scheduler.load(session)
+        scheduler.start()
+    if settings.insight_job_enabled:
+        get_insight_job().start(settings.insight_job_hour_utc)
     yield
     # Shutdown
     logger.info("EyeCare AI application shutting down...")
+    await scheduler.stop()
+    await get_insight_job().stop()
+    await get_quiz_analytics().stop()
+    await get_translations().stop()
 
 
 # Create FastAPI application
@@ -34,6 +71,9 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Replay responses to retried POSTs; added before CORS so replays get CORS headers too
+app.add_middleware(IdempotencyMiddleware, store=get_idempotency_store())
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -49,6 +89,10 @@ app.include_router(habits.router)
 app.include_router(reminders.router)
 app.include_router(learning.router)
 app.include_router(reading_comfort.router)
+app.include_router(export.router)
+app.include_router(push.router)
+app.include_router(dashboard.router)
+app.include_router(sync.router)
 
 
 # Health check endpoint
@@ -62,6 +106,45 @@ async def health_check() -> HealthCheck:
     )
 
 
+@app.get("/metrics/caches", tags=["Health"])
+async def get_cache_metrics():
+    """Size and hit-ratio metrics for in-process caches."""
+    return cache_stats()
+
+
+@app.get("/metrics/chat-cache", tags=["Health"])
+async def get_chat_cache_metrics():
+    """Exact and near-duplicate hit ratios and lookup cost of the chat response cache."""
+    cache = get_ai_service().cache
+    return cache.stats() if cache is not None else {"enabled": False}
+
+
+@app.get("/metrics/ai-latency", tags=["Health"])
+async def get_ai_latency_metrics():
+    """Provider latency percentiles, the adaptive deadline, and timed-out and cancelled calls."""
+    return get_ai_service().latency.stats()
+
+
+@app.get("/metrics/llm-scheduler", tags=["Health"])
+async def get_llm_scheduler_metrics():
+    """Queued and running provider calls and queue-wait percentiles per priority class."""
+    return get_llm_scheduler().stats()
+
+
+@app.get("/metrics/insight-job", tags=["Health"])
+async def get_insight_job_metrics():
+    """Progress, throughput and failures of the latest weekly insight batch."""
+    with Session(engine) as session:
+        report = InsightService.get_latest_run(session)
+    return report if report is not None else {"status": "never run"}
+
+
+@app.get("/metrics/translations", tags=["Health"])
+async def get_translation_metrics():
+    """Size, queue length and failures of the translation cache."""
+    return get_translations().stats()
+
+
 @app.get("/", tags=["Root"])
 async def root():
     """Root endpoint with API information."""
@@ -1,7 +1,8 @@
 """Database models for EyeCare application."""
 from sqlmodel import SQLModel, Field, Column, String, DateTime, JSON
+from sqlalchemy import Index, UniqueConstraint, text
 from typing import Optional, List, Dict, Any
-from datetime import datetime
+from datetime import date, datetime
 import json
 
 
@@ -30,6 +31,15 @@ class EyeHealthReminder(SQLModel, table=True):
     """Reminders for eye health activities."""
     
     __tablename__ = "eye_health_reminders"
+    __table_args__ = (
+        # Partial index: due-reminder discovery is a range scan over enabled rows only
+        Index(
+            "ix_eye_health_reminders_due",
+            "next_fire_at",
+            sqlite_where=text("is_enabled = 1"),
+            postgresql_where=text("is_enabled"),
+        ),
+    )
     
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: str = Field(index=True)
@@ -43,10 +53,46 @@ class EyeHealthReminder(SQLModel, table=True):
     use_browser_notification: bool = Field(default=True)
     notification_sound: bool = Field(default=True)
     
+    # Scheduling state (UTC); next_fire_at is NULL while disabled
+    next_fire_at: Optional[datetime] = Field(default=None)
+    last_fired_at: Optional[datetime] = Field(default=None)
+    
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
 
+class ReminderEventLog(SQLModel, table=True):
+    """Append-only log of reminder deliveries and user responses."""
+    
+    __tablename__ = "reminder_events"
+    
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: str = Field(index=True)
+    reminder_id: Optional[int] = Field(default=None)
+    reminder_type: str
+    event_type: str = Field(description="fired, acknowledged, snoozed, dismissed")
+    occurred_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class ReminderAdherenceDaily(SQLModel, table=True):
+    """Daily per-user, per-reminder-type event counts, updated on ingest."""
+    
+    __tablename__ = "reminder_adherence_daily"
+    __table_args__ = (
+        UniqueConstraint("user_id", "reminder_type", "day", name="uq_reminder_adherence_daily"),
+    )
+    
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: str = Field(index=True)
+    reminder_type: str
+    day: date = Field(description="UTC day")
+    fired: int = Field(default=0)
+    acknowledged: int = Field(default=0)
+    snoozed: int = Field(default=0)
+    dismissed: int = Field(default=0)
+
+
 class UserPreferences(SQLModel, table=True):
     """User preferences and settings."""
     
@@ -68,6 +114,9 @@ class UserPreferences(SQLModel, table=True):
     age_range: str = Field(default="adult", description="teen, adult, senior")
     working_hours_start: str = Field(default="09:00", description="HH:MM format")
     working_hours_end: str = Field(default="17:00", description="HH:MM format")
+    timezone: str = Field(default="UTC", description="IANA time zone name")
+    quiet_hours_start: Optional[str] = Field(default=None, description="HH:MM format")
+    quiet_hours_end: Optional[str] = Field(default=None, description="HH:MM format")
     
     # Notification consent
     accepts_notifications: bool = Field(default=True)
@@ -99,6 +148,12 @@ class LearningProgress(SQLModel, table=True):
     """Track user's progress in learning modules."""
     
     __tablename__ = "learning_progress"
+    __table_args__ = (
+        # One row per (user, module), maintained by upsert on each attempt
+        Index("uq_learning_progress_user_module", "user_id", "module_id", unique=True),
+        # Leaderboards and completion stats read only this index
+        Index("ix_learning_progress_module_score", "module_id", "quiz_score", "completed"),
+    )
     
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: str = Field(index=True)
@@ -107,7 +162,136 @@ class LearningProgress(SQLModel, table=True):
     module_id: str = Field(description="Identifier for learning module")
     module_title: str
     completed: bool = Field(default=False)
-    quiz_score: Optional[int] = Field(default=None, description="Quiz score as percentage")
+    quiz_score: Optional[int] = Field(default=None, description="Best quiz score as percentage")
+    attempts: int = Field(default=1, description="Number of quiz attempts")
     
     created_at: datetime = Field(default_factory=datetime.utcnow)
-    completed_at: Optional[datetime] = Field(default=None)
+    completed_at: Optional[datetime] = Field(default=None, description="First time the quiz was passed")
+    last_attempt_at: Optional[datetime] = Field(default=None)
+
+
+class LearningQuizAttempt(SQLModel, table=True):
+    """Append-only history of quiz attempts."""
+    
+    __tablename__ = "learning_quiz_attempts"
+    __table_args__ = (
+        Index("ix_learning_quiz_attempts_user_module", "user_id", "module_id", "created_at"),
+    )
+    
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: str
+    module_id: str
+    score: int = Field(description="Quiz score as percentage")
+    passed: bool
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class QuizItemStats(SQLModel, table=True):
+    """Running per-question sums for difficulty and discrimination.
+
+    `total` is the number of questions answered correctly in the attempt,
+    so item-rest correlation can be derived without rescanning attempts.
+    Each `quiz_version` keeps its own row, so counts for an edited quiz
+    are never added to answers to different questions.
+    """
+    
+    __tablename__ = "quiz_item_stats"
+    __table_args__ = (
+        UniqueConstraint("module_id", "question_index", "quiz_version", name="uq_quiz_item_stats_version"),
+    )
+    
+    id: Optional[int] = Field(default=None, primary_key=True)
+    module_id: str = Field(index=True)
+    question_index: int
+    quiz_version: str = Field(default="")
+    responses: int = Field(default=0)
+    correct: int = Field(default=0)
+    sum_total: int = Field(default=0)
+    sum_total_sq: int = Field(default=0)
+    sum_correct_total: int = Field(default=0)
+
+
+class QuizOptionCount(SQLModel, table=True):
+    """How often each option of a question was chosen, for one `quiz_version`."""
+    
+    __tablename__ = "quiz_option_counts"
+    __table_args__ = (
+        UniqueConstraint(
+            "module_id", "question_index", "option_index", "quiz_version",
+            name="uq_quiz_option_counts_version"
+        ),
+    )
+    
+    id: Optional[int] = Field(default=None, primary_key=True)
+    module_id: str = Field(index=True)
+    question_index: int
+    option_index: int
+    quiz_version: str = Field(default="")
+    count: int = Field(default=0)
+
+
+class ChangeLogEntry(SQLModel, table=True):
+    """Per-user change feed for delta sync.
+
+    `version` comes from the user's SyncVersion counter rather than the
+    id: ids are handed out at insert time, so a transaction can commit
+    after one holding a higher id, while the counter row serializes a
+    user's writers so versions become visible in order.
+    """
+    
+    __tablename__ = "change_log"
+    __table_args__ = (
+        Index("uq_change_log_user_version", "user_id", "version", unique=True),
+    )
+    
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: str
+    version: int = Field(default=0)
+    entity: str = Field(description="Table name of the changed row")
+    entity_key: str = Field(description="Row id, or natural key for per-user singletons")
+    operation: str = Field(description="upsert or delete")
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class SyncVersion(SQLModel, table=True):
+    """Latest change-feed version per user."""
+    
+    __tablename__ = "sync_versions"
+    
+    user_id: str = Field(primary_key=True)
+    version: int = Field(default=0)
+
+
+class WeeklyInsight(SQLModel, table=True):
+    """Pre-generated weekly AI reflection for a user."""
+    
+    __tablename__ = "weekly_insights"
+    __table_args__ = (
+        UniqueConstraint("user_id", "week_start", name="uq_weekly_insights_user_week"),
+    )
+    
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: str
+    week_start: date = Field(description="Monday of the week the insight belongs to")
+    summary: str
+    tips: str = Field(default="[]", description="JSON array of tips")
+    reminder: Optional[str] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class InsightJobRun(SQLModel, table=True):
+    """Progress of one nightly insight batch; the cursor makes it resumable."""
+    
+    __tablename__ = "insight_job_runs"
+    
+    id: Optional[int] = Field(default=None, primary_key=True)
+    run_date: date = Field(unique=True)
+    week_start: date
+    status: str = Field(default="running", description="running or completed")
+    cursor: str = Field(default="", description="Last user_id whose chunk was committed")
+    processed: int = Field(default=0)
+    generated: int = Field(default=0)
+    skipped: int = Field(default=0)
+    failed: int = Field(default=0)
+    started_at: datetime = Field(default_factory=datetime.utcnow)
+    finished_at: Optional[datetime] = None
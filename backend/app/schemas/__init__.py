@@ -1,7 +1,7 @@
 """Pydantic schemas for request/response validation."""
 from pydantic import BaseModel, Field
-from typing import Optional, List
-from datetime import datetime
+from typing import Dict, Optional, List
+from datetime import date, datetime
 
 
 # ============== Habit Tracking ==============
@@ -24,6 +24,15 @@ class HabitLogResponse(HabitLogCreate):
     updated_at: datetime
 
 
+class WeeklyInsightResponse(BaseModel):
+    """Schema for a pre-generated weekly AI insight."""
+    week_start: date
+    summary: str
+    tips: List[str]
+    reminder: Optional[str] = None
+    created_at: datetime
+
+
 class HabitWeeklySummary(BaseModel):
     """Weekly summary of eye habits."""
     week_start: datetime
@@ -34,6 +43,50 @@ class HabitWeeklySummary(BaseModel):
     habit_score: int = Field(description="Score 0-100")
     summary: str = Field(description="AI-generated summary")
     recommendations: List[str]
+    insight: Optional[WeeklyInsightResponse] = Field(
+        default=None,
+        description="This week's AI insight, once the nightly batch has produced it"
+    )
+
+
+class InsightJobReport(BaseModel):
+    """Progress and throughput of a nightly insight batch."""
+    run_date: date
+    week_start: date
+    status: str
+    processed: int
+    generated: int
+    skipped: int
+    failed: int
+    started_at: datetime
+    finished_at: Optional[datetime] = None
+    users_per_second: Optional[float] = None
+
+
+class HabitTrendPoint(BaseModel):
+    """Daily point in a habit trend series."""
+    date: datetime
+    log_count: int
+    screen_time: Optional[float] = None
+    strain_level: Optional[float] = None
+    screen_time_avg: Optional[float] = Field(default=None, description="Trailing moving average")
+    strain_level_avg: Optional[float] = Field(default=None, description="Trailing moving average")
+    screen_time_wow_delta: Optional[float] = Field(default=None, description="Change vs. same day last week")
+    strain_level_wow_delta: Optional[float] = Field(default=None, description="Change vs. same day last week")
+    screen_time_zscore: Optional[float] = None
+    strain_level_zscore: Optional[float] = None
+    is_anomaly: bool = False
+
+
+class HabitTrends(BaseModel):
+    """Multi-week habit trends with anomaly flags."""
+    start: datetime
+    end: datetime
+    days: int
+    window: int
+    z_threshold: float
+    points: List[HabitTrendPoint]
+    anomalies: List[datetime] = Field(description="Days flagged as anomalous")
 
 
 # ============== Reminders ==============
@@ -58,10 +111,100 @@ class ReminderResponse(ReminderCreate):
     id: int
     user_id: str
     is_enabled: bool
+    next_fire_at: Optional[datetime] = None
+    last_fired_at: Optional[datetime] = None
     created_at: datetime
     updated_at: datetime
 
 
+class ReminderTemplate(BaseModel):
+    """A preset reminder configuration."""
+    name: str
+    reminder_type: str
+    interval_minutes: int
+    use_browser_notification: bool = True
+    notification_sound: bool = True
+
+
+class ReminderTemplateApply(BaseModel):
+    """Schema for creating reminders from templates."""
+    templates: Optional[List[str]] = Field(default=None, description="Template names; all when omitted")
+    skip_existing: bool = Field(default=True, description="Skip types the user already has")
+
+
+class ReminderFilter(BaseModel):
+    """Selects a user's reminders for bulk operations; empty matches all."""
+    ids: Optional[List[int]] = None
+    reminder_types: Optional[List[str]] = None
+    is_enabled: Optional[bool] = None
+
+
+class ReminderBulkUpdate(BaseModel):
+    """Schema for updating many reminders at once."""
+    filter: ReminderFilter = Field(default_factory=ReminderFilter)
+    update: ReminderUpdate
+
+
+class ReminderBulkDeleteResult(BaseModel):
+    """Result of a bulk reminder delete."""
+    deleted: int
+    ids: List[int]
+
+
+class ReminderEvent(BaseModel):
+    """A reminder that has come due."""
+    reminder_id: int
+    user_id: str
+    reminder_type: str
+    fire_at: datetime
+
+
+class ReminderOccurrence(BaseModel):
+    """A single upcoming reminder fire time."""
+    reminder_id: int
+    reminder_type: str
+    fire_at: datetime = Field(description="Fire time in UTC")
+    local_time: datetime = Field(description="Fire time in the user's time zone")
+    use_browser_notification: bool
+    notification_sound: bool
+
+
+class ReminderEventCreate(BaseModel):
+    """Schema for a reported reminder event."""
+    reminder_id: Optional[int] = None
+    reminder_type: str
+    event_type: str = Field(description="fired, acknowledged, snoozed, dismissed")
+    occurred_at: Optional[datetime] = None
+
+
+class ReminderEventBatch(BaseModel):
+    """Batch of reminder events for ingestion."""
+    events: List[ReminderEventCreate] = Field(..., max_length=5000)
+
+
+class ReminderEventIngestResult(BaseModel):
+    """Result of a reminder event ingest."""
+    accepted: int
+
+
+class ReminderAdherence(BaseModel):
+    """Adherence counts and rate for one reminder type."""
+    reminder_type: str
+    fired: int
+    acknowledged: int
+    snoozed: int
+    dismissed: int
+    adherence_rate: float = Field(description="Acknowledged / fired, 0-1")
+
+
+class ReminderAdherenceReport(BaseModel):
+    """Adherence over a range of days."""
+    start: datetime
+    end: datetime
+    adherence_rate: float
+    by_type: List[ReminderAdherence]
+
+
 # ============== User Preferences ==============
 class UserPreferencesUpdate(BaseModel):
     """Schema for updating user preferences."""
@@ -73,6 +216,9 @@ class UserPreferencesUpdate(BaseModel):
     age_range: Optional[str] = None
     working_hours_start: Optional[str] = None
     working_hours_end: Optional[str] = None
+    timezone: Optional[str] = None
+    quiet_hours_start: Optional[str] = None
+    quiet_hours_end: Optional[str] = None
     accepts_notifications: Optional[bool] = None
     language: Optional[str] = None
 
@@ -115,11 +261,15 @@ class ChatHistory(BaseModel):
 
 
 # ============== Learning ==============
-class LearningModule(BaseModel):
-    """Schema for learning modules."""
+class LearningModuleSummary(BaseModel):
+    """Schema for learning module listings."""
     id: str
     title: str
     description: str
+
+
+class LearningModule(LearningModuleSummary):
+    """Schema for learning modules."""
     content: str
     quiz_questions: Optional[List[dict]] = None
 
@@ -136,6 +286,7 @@ class QuizResult(BaseModel):
     score: int = Field(description="Score as percentage 0-100")
     passed: bool
     feedback: str
+    question_results: List[bool] = Field(default_factory=list, description="Whether each answer was correct")
 
 
 class LearningProgressResponse(BaseModel):
@@ -143,9 +294,63 @@ class LearningProgressResponse(BaseModel):
     module_id: str
     module_title: str
     completed: bool
-    quiz_score: Optional[int]
+    quiz_score: Optional[int] = Field(description="Best score as percentage")
+    attempts: int = 1
     created_at: datetime
-    completed_at: Optional[datetime]
+    completed_at: Optional[datetime] = Field(description="First time the quiz was passed")
+    last_attempt_at: Optional[datetime] = None
+
+
+class QuizAttemptResponse(BaseModel):
+    """Schema for one quiz attempt."""
+    module_id: str
+    score: int
+    passed: bool
+    created_at: datetime
+
+
+class LeaderboardEntry(BaseModel):
+    """One learner's standing on a module leaderboard."""
+    rank: int
+    user_id: str
+    best_score: int
+    attempts: int
+    completed_at: Optional[datetime] = None
+
+
+class ModuleLeaderboard(BaseModel):
+    """Top learners for a module, best score first."""
+    module_id: str
+    entries: List[LeaderboardEntry]
+
+
+class QuizItemAnalytics(BaseModel):
+    """Difficulty and discrimination of one quiz question."""
+    question_index: int
+    question: str
+    responses: int
+    difficulty: float = Field(description="Share of responses answered correctly, 0-1")
+    discrimination: Optional[float] = Field(
+        default=None,
+        description="Correlation of this item with the rest of the quiz, -1 to 1"
+    )
+    option_counts: List[int]
+
+
+class QuizAnalytics(BaseModel):
+    """Per-question analytics for a module's quiz."""
+    module_id: str
+    items: List[QuizItemAnalytics]
+
+
+class ModuleCompletionStats(BaseModel):
+    """Completion and score aggregates for a module."""
+    module_id: str
+    learners: int
+    completed: int
+    completion_rate: float = Field(description="Share of learners who passed, 0-1")
+    avg_best_score: float
+    avg_attempts: float
 
 
 # ============== Reading Comfort ==============
@@ -157,6 +362,11 @@ class ReadingComfortRequest(BaseModel):
     current_settings: Optional[dict] = None
 
 
+class ReadingComfortBatchRequest(BaseModel):
+    """Schema for recommendations across several reading contexts."""
+    contexts: List[ReadingComfortRequest] = Field(..., min_length=1, max_length=100)
+
+
 class ReadingComfortRecommendation(BaseModel):
     """Schema for reading comfort recommendations."""
     font_size: str
@@ -168,6 +378,35 @@ class ReadingComfortRecommendation(BaseModel):
     tips: List[str]
 
 
+# ============== Dashboard ==============
+class Dashboard(BaseModel):
+    """Composite home-page payload; a section is null if it failed."""
+    user_id: str
+    weekly_summary: Optional[HabitWeeklySummary] = None
+    reminders: Optional[List[ReminderResponse]] = None
+    progress: Optional[List[LearningProgressResponse]] = None
+    preferences: Optional[UserPreferencesResponse] = None
+    timings_ms: Dict[str, float] = Field(description="Time spent building each section")
+    total_ms: float
+    errors: Dict[str, str] = Field(default_factory=dict)
+
+
+# ============== Sync ==============
+class SyncChange(BaseModel):
+    """Latest state of one changed row."""
+    entity: str
+    key: str
+    operation: str = Field(description="upsert or delete")
+    data: Optional[dict] = Field(default=None, description="Current row for upserts")
+
+
+class SyncChanges(BaseModel):
+    """Changes since a version, one entry per row."""
+    version: int = Field(description="Pass as `since` on the next call")
+    has_more: bool
+    changes: List[SyncChange]
+
+
 # ============== Health Check ==============
 class HealthCheck(BaseModel):
     """Schema for health check endpoint."""
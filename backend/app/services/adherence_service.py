@@ -0,0 +1,124 @@
+"""Service for reminder event ingestion and adherence analytics."""
+from sqlalchemy import func, insert
+from sqlmodel import Session, select
+from datetime import datetime, timedelta
+from collections import Counter
+from typing import List
+from app.db.session import dialect_insert
+from app.models import ReminderEventLog, ReminderAdherenceDaily
+from app.schemas import (
+    ReminderEventCreate,
+    ReminderAdherence,
+    ReminderAdherenceReport
+)
+
+EVENT_TYPES = ("fired", "acknowledged", "snoozed", "dismissed")
+
+
+class AdherenceService:
+    """Service for reminder event logs and daily adherence rollups."""
+
+    @staticmethod
+    def ingest_events(
+        session: Session,
+        user_id: str,
+        events: List[ReminderEventCreate]
+    ) -> int:
+        """
+        Append events and fold them into the daily rollups.
+
+        One multi-row insert for the log plus one upsert per
+        (reminder type, day), all in a single transaction.
+        """
+        for event in events:
+            if event.event_type not in EVENT_TYPES:
+                raise ValueError(
+                    f"Unknown event_type: {event.event_type}. Supported: {', '.join(EVENT_TYPES)}"
+                )
+        if not events:
+            return 0
+
+        now = datetime.utcnow()
+        rows = []
+        counts = Counter()
+        for event in events:
+            occurred_at = event.occurred_at or now
+            rows.append({
+                "user_id": user_id,
+                "reminder_id": event.reminder_id,
+                "reminder_type": event.reminder_type,
+                "event_type": event.event_type,
+                "occurred_at": occurred_at,
+                "created_at": now,
+            })
+            counts[(event.reminder_type, occurred_at.date(), event.event_type)] += 1
+
+        session.execute(insert(ReminderEventLog), rows)
+
+        rollups = {}
+        for (reminder_type, day, event_type), count in counts.items():
+            rollup = rollups.setdefault((reminder_type, day), dict.fromkeys(EVENT_TYPES, 0))
+            rollup[event_type] += count
+
+        for (reminder_type, day), increments in rollups.items():
+            statement = dialect_insert(ReminderAdherenceDaily).values(
+                user_id=user_id,
+                reminder_type=reminder_type,
+                day=day,
+                **increments
+            )
+            statement = statement.on_conflict_do_update(
+                index_elements=["user_id", "reminder_type", "day"],
+                set_={
+                    name: getattr(ReminderAdherenceDaily, name) + statement.excluded[name]
+                    for name in EVENT_TYPES
+                }
+            )
+            session.execute(statement)
+
+        session.commit()
+        return len(rows)
+
+    @staticmethod
+    def get_adherence(
+        session: Session,
+        user_id: str,
+        days: int = 30
+    ) -> ReminderAdherenceReport:
+        """Adherence per reminder type over the past N days, from rollups."""
+        end = datetime.utcnow()
+        start = end - timedelta(days=days)
+
+        statement = select(
+            ReminderAdherenceDaily.reminder_type,
+            *[func.sum(getattr(ReminderAdherenceDaily, name)) for name in EVENT_TYPES]
+        ).where(
+            ReminderAdherenceDaily.user_id == user_id,
+            ReminderAdherenceDaily.day >= start.date()
+        ).group_by(ReminderAdherenceDaily.reminder_type)
+
+        by_type = []
+        for reminder_type, *totals in session.exec(statement).all():
+            counts = dict(zip(EVENT_TYPES, (int(t or 0) for t in totals)))
+            by_type.append(ReminderAdherence(
+                reminder_type=reminder_type,
+                adherence_rate=_rate(counts["acknowledged"], counts["fired"]),
+                **counts
+            ))
+
+        return ReminderAdherenceReport(
+            start=start,
+            end=end,
+            adherence_rate=_rate(
+                sum(a.acknowledged for a in by_type),
+                sum(a.fired for a in by_type)
+            ),
+            by_type=sorted(by_type, key=lambda a: a.reminder_type)
+        )
+
+
+def _rate(numerator: int, denominator: int) -> float:
+    """Ratio clamped to 0-1, or 0 when nothing fired."""
+    if denominator <= 0:
+        return 0.0
+    return round(min(1.0, numerator / denominator), 4)
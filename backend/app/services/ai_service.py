@@ -1,14 +1,28 @@
 """AI service for managing LLM interactions."""
+import asyncio
 import logging
+import time
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional
 from app.core.config import settings
 from app.schemas import AIResponse
+from app.services.latency_tracker import LatencyTracker
+from app.services.llm_scheduler import INTERACTIVE, estimate_cost, get_llm_scheduler
+from app.services.semantic_cache import SemanticCache, context_scope
 import json
 
 logger = logging.getLogger(__name__)
 
 
+def fallback_response() -> AIResponse:
+    """Response returned when the provider call fails."""
+    return AIResponse(
+        summary="I encountered an issue. Please try again.",
+        tips=["Consider taking a 20-20-20 break"],
+        reminder="Remember to rest your eyes regularly"
+    )
+
+
 class AIProvider(ABC):
     """Abstract base class for AI providers."""
     
@@ -53,6 +67,11 @@ Always maintain a helpful, encouraging tone while being clear about your limitat
         """Generate AI response."""
         pass
 
+    @abstractmethod
+    def generate_text(self, system_prompt: str, user_prompt: str) -> str:
+        """Plain-text completion for internal jobs such as translation."""
+        pass
+
 
 class GeminiProvider(AIProvider):
     """Google Gemini API provider."""
@@ -77,12 +96,13 @@ class GeminiProvider(AIProvider):
             # Build user prompt with context
             user_prompt = self._build_user_prompt(user_message, context)
             
-            # Call Gemini API
+            # Call Gemini API; the async client lets cancellation abort the request
             import google.generativeai as genai
-            response = genai.GenerativeModel(
+            model = genai.GenerativeModel(
                 model_name=self.model,
                 system_instruction=self.SYSTEM_PROMPT
-            ).generate_content(user_prompt)
+            )
+            response = await model.generate_content_async(user_prompt)
             
             # Parse response
             response_text = response.text
@@ -95,11 +115,16 @@ class GeminiProvider(AIProvider):
         except Exception as e:
             logger.error(f"Error generating Gemini response: {e}")
             # Return fallback response
-            return AIResponse(
-                summary="I encountered an issue. Please try again.",
-                tips=["Consider taking a 20-20-20 break"],
-                reminder="Remember to rest your eyes regularly"
-            )
+            return fallback_response()
+
+    def generate_text(self, system_prompt: str, user_prompt: str) -> str:
+        """Plain-text completion using Google Gemini."""
+        import google.generativeai as genai
+        response = genai.GenerativeModel(
+            model_name=self.model,
+            system_instruction=system_prompt
+        ).generate_content(user_prompt)
+        return response.text
 
     def _build_user_prompt(self, message: str, context: Optional[Dict[str, Any]] = None) -> str:
         """Build user prompt with context."""
@@ -139,8 +164,9 @@ class OpenAIProvider(AIProvider):
     
     def __init__(self):
         try:
-            from openai import OpenAI
+            from openai import AsyncOpenAI, OpenAI
             self.client = OpenAI(api_key=settings.ai_api_key)
+            self.async_client = AsyncOpenAI(api_key=settings.ai_api_key)
             self.model = settings.openai_model
             logger.info(f"OpenAI provider initialized with model: {self.model}")
         except Exception as e:
@@ -154,13 +180,11 @@ class OpenAIProvider(AIProvider):
     ) -> AIResponse:
         """Generate response using OpenAI."""
         try:
-            from openai import OpenAI
-            
             # Build user prompt with context
             user_prompt = self._build_user_prompt(user_message, context)
             
-            # Call OpenAI API
-            response = self.client.chat.completions.create(
+            # Call OpenAI API; cancelling the await closes the connection
+            response = await self.async_client.chat.completions.create(
                 model=self.model,
                 temperature=settings.openai_temperature,
                 messages=[
@@ -178,11 +202,19 @@ class OpenAIProvider(AIProvider):
             
         except Exception as e:
             logger.error(f"Error generating OpenAI response: {e}")
-            return AIResponse(
-                summary="I encountered an issue. Please try again.",
-                tips=["Consider taking a 20-20-20 break"],
-                reminder="Remember to rest your eyes regularly"
-            )
+            return fallback_response()
+
+    def generate_text(self, system_prompt: str, user_prompt: str) -> str:
+        """Plain-text completion using the chat completions API."""
+        response = self.client.chat.completions.create(
+            model=self.model,
+            temperature=settings.openai_temperature,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ]
+        )
+        return response.choices[0].message.content
 
     def _build_user_prompt(self, message: str, context: Optional[Dict[str, Any]] = None) -> str:
         """Build user prompt with context."""
@@ -220,10 +252,10 @@ class OpenRouterProvider(AIProvider):
     
     def __init__(self):
         try:
-            from openai import OpenAI
+            from openai import AsyncOpenAI, OpenAI
             # OpenRouter is compatible with OpenAI's API
             self.site_url = settings.openrouter_site_url
-            self.client = OpenAI(
+            client_options = dict(
                 api_key=settings.ai_api_key,
                 base_url="https://openrouter.ai/api/v1",
                 default_headers={
@@ -231,6 +263,8 @@ class OpenRouterProvider(AIProvider):
                     "X-Title": "EyeCare AI"
                 }
             )
+            self.client = OpenAI(**client_options)
+            self.async_client = AsyncOpenAI(**client_options)
             self.model = settings.openrouter_model
             logger.info(f"OpenRouter provider initialized with model: {self.model}")
         except Exception as e:
@@ -244,9 +278,6 @@ class OpenRouterProvider(AIProvider):
     ) -> AIResponse:
         """Generate response using OpenRouter."""
         try:
-            from openai import OpenAI
-            import sys
-            
             # Build user prompt with context
             user_prompt = self._build_user_prompt(user_message, context)
             
@@ -254,8 +285,9 @@ class OpenRouterProvider(AIProvider):
             logger.info(f"API Key present: {bool(settings.ai_api_key)}")
             logger.info(f"API Key starts with: {settings.ai_api_key[:20] if settings.ai_api_key else 'MISSING'}...")
             
-            # Call OpenRouter API (compatible with OpenAI SDK)
-            response = self.client.chat.completions.create(
+            # Call OpenRouter API (compatible with OpenAI SDK); cancelling the
+            # await closes the connection
+            response = await self.async_client.chat.completions.create(
                 model=self.model,
                 temperature=settings.openrouter_temperature,
                 messages=[
@@ -278,11 +310,19 @@ class OpenRouterProvider(AIProvider):
             error_msg = str(e)
             logger.error(f"Error generating OpenRouter response [{error_type}]: {error_msg}")
             logger.error(f"Traceback: {traceback.format_exc()}")
-            return AIResponse(
-                summary="I encountered an issue. Please try again.",
-                tips=["Consider taking a 20-20-20 break"],
-                reminder="Remember to rest your eyes regularly"
-            )
+            return fallback_response()
+
+    def generate_text(self, system_prompt: str, user_prompt: str) -> str:
+        """Plain-text completion using the chat completions API."""
+        response = self.client.chat.completions.create(
+            model=self.model,
+            temperature=settings.openrouter_temperature,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ]
+        )
+        return response.choices[0].message.content
 
     def _build_user_prompt(self, message: str, context: Optional[Dict[str, Any]] = None) -> str:
         """Build user prompt with context."""
@@ -320,6 +360,19 @@ class AIService:
     
     def __init__(self):
         self.provider = self._initialize_provider()
+        self.cache = SemanticCache(
+            maxsize=settings.chat_cache_size,
+            ttl_seconds=settings.chat_cache_ttl_seconds,
+            threshold=settings.chat_cache_similarity
+        ) if settings.chat_cache_enabled else None
+        self.latency = LatencyTracker(
+            initial=settings.ai_deadline_initial_seconds,
+            minimum=settings.ai_deadline_min_seconds,
+            maximum=settings.ai_deadline_max_seconds,
+            percentile=settings.ai_deadline_percentile,
+            multiplier=settings.ai_deadline_multiplier,
+            min_samples=settings.ai_deadline_min_samples
+        )
     
     def _initialize_provider(self) -> AIProvider:
         """Initialize AI provider based on configuration."""
@@ -337,10 +390,67 @@ class AIService:
     async def chat(
         self,
         user_message: str,
-        context: Optional[Dict[str, Any]] = None
+        context: Optional[Dict[str, Any]] = None,
+        use_cache: bool = True,
+        user_id: str = "",
+        priority: str = INTERACTIVE
     ) -> AIResponse:
-        """Send a message and get AI response."""
-        return await self.provider.generate_response(user_message, context)
+        """
+        Send a message and get AI response.
+        
+        A near-duplicate of a recent message with the same personal context
+        is answered from the cache; fallback responses are never cached.
+        Batch jobs pass use_cache=False so one-off prompts do not evict
+        interactive entries. Provider calls wait for a slot from the LLM
+        scheduler, fair-queued per user_id within their priority class.
+        """
+        if not use_cache or self.cache is None:
+            return await self._generate(user_message, context, user_id, priority)
+        
+        scope = context_scope(context)
+        cached = self.cache.get(user_message, scope)
+        if cached is not None:
+            return cached
+        
+        response = await self._generate(user_message, context, user_id, priority)
+        if response != fallback_response():
+            self.cache.set(user_message, response, scope)
+        return response
+    
+    async def _generate(
+        self,
+        user_message: str,
+        context: Optional[Dict[str, Any]],
+        user_id: str,
+        priority: str
+    ) -> AIResponse:
+        """
+        Call the provider once a scheduler slot is free.
+        
+        The call is cut off at the deadline adapted from the provider's
+        recent latencies and answered with the fallback response; if the
+        caller is cancelled (the client disconnected), the provider request
+        is cancelled with it.
+        """
+        cost = estimate_cost(user_message, *(str(value) for value in (context or {}).values()))
+        async with get_llm_scheduler().slot(user_id, priority, cost):
+            deadline = self.latency.deadline()
+            started = time.perf_counter()
+            try:
+                response = await asyncio.wait_for(
+                    self.provider.generate_response(user_message, context),
+                    timeout=deadline
+                )
+            except asyncio.TimeoutError:
+                self.latency.record_timeout(deadline)
+                logger.warning(f"AI provider call exceeded its {deadline:.1f}s deadline")
+                return fallback_response()
+            except asyncio.CancelledError:
+                self.latency.record_cancelled()
+                raise
+        if response != fallback_response():
+            self.latency.record(time.perf_counter() - started)
+        return response
 
 
 # Singleton instance
@@ -0,0 +1,187 @@
+"""Reading comfort recommendations from a precompiled decision table."""
+import itertools
+from typing import Dict, List, Optional, Tuple
+from app.core.cache import LRUCache
+from app.schemas import ReadingComfortRecommendation
+from app.services.translation_service import SOURCE_LANGUAGE, get_translations
+
+# The rules only distinguish these input classes; anything else is "other"
+SCREEN_CLASSES = ("phone", "tablet", "other")
+LIGHT_CLASSES = ("dim", "bright", "other")
+
+# Upper bound (inclusive) of each session-duration bucket the rules use;
+# the last bucket is open-ended and represented by its lower bound
+DURATION_BUCKETS = (30, 60, 120, 121)
+
+# Preference values the app offers; other stored values are evaluated per call
+FONT_SIZES = ("small", "medium", "large", "xlarge")
+CONTRASTS = ("normal", "high")
+LINE_SPACINGS = ("normal", "comfortable", "spacious")
+TEXT_WIDTHS = ("narrow", "normal", "wide")
+
+TableKey = Tuple[str, str, int, str, str, str, str, bool]
+
+# Translated recommendations keyed by (English body, language)
+_localized = LRUCache("comfort_localized", maxsize=10000)
+
+
+class CompiledRecommendation:
+    """A recommendation and its JSON encoding, shared between requests."""
+
+    __slots__ = ("recommendation", "body")
+
+    def __init__(self, recommendation: ReadingComfortRecommendation):
+        self.recommendation = recommendation
+        self.body: bytes = recommendation.model_dump_json().encode()
+
+
+class ComfortService:
+    """Service for reading comfort recommendations."""
+
+    _table: Optional[Dict[TableKey, CompiledRecommendation]] = None
+
+    @staticmethod
+    def get_table() -> Dict[TableKey, CompiledRecommendation]:
+        """Evaluate the rules once for every input class and preference combination."""
+        if ComfortService._table is None:
+            table = {}
+            for screen, light, duration, font, contrast, spacing, width, dark in itertools.product(
+                SCREEN_CLASSES, LIGHT_CLASSES, DURATION_BUCKETS,
+                FONT_SIZES, CONTRASTS, LINE_SPACINGS, TEXT_WIDTHS, (False, True)
+            ):
+                key = (screen, light, duration, font, contrast, spacing, width, dark)
+                table[key] = CompiledRecommendation(ComfortService.evaluate(
+                    screen, light, duration, font, contrast, spacing, width, dark
+                ))
+            ComfortService._table = table
+        return ComfortService._table
+
+    @staticmethod
+    def recommend(
+        screen_type: str,
+        ambient_light: str,
+        session_duration_minutes: int,
+        preferences
+    ) -> CompiledRecommendation:
+        """Look up the recommendation for a reading context and a user's preferences."""
+        key = (
+            screen_type if screen_type in SCREEN_CLASSES else "other",
+            ambient_light if ambient_light in LIGHT_CLASSES else "other",
+            _duration_bucket(session_duration_minutes),
+            preferences.preferred_font_size or "medium",
+            preferences.preferred_contrast or "normal",
+            preferences.preferred_line_spacing or "normal",
+            preferences.preferred_text_width or "normal",
+            bool(preferences.dark_mode),
+        )
+        compiled = ComfortService.get_table().get(key)
+        if compiled is None:
+            compiled = CompiledRecommendation(ComfortService.evaluate(*key))
+        return compiled
+
+    @staticmethod
+    def localize(compiled: CompiledRecommendation, language: str) -> CompiledRecommendation:
+        """
+        The recommendation with its tips translated.
+
+        Falls back to English while the translation is pending.
+        """
+        if language == SOURCE_LANGUAGE:
+            return compiled
+        key = (compiled.body, language)
+        localized = _localized.get(key)
+        if localized is None:
+            tips = get_translations().localize(compiled.recommendation.tips, language)
+            if tips is None:
+                return compiled
+            localized = CompiledRecommendation(compiled.recommendation.model_copy(update={"tips": tips}))
+            _localized.set(key, localized)
+        return localized
+
+    @staticmethod
+    def request_translations(language: str) -> int:
+        """Queue every canned tip for translation; returns how many strings were queued."""
+        tips = {
+            tip
+            for compiled in ComfortService.get_table().values()
+            for tip in compiled.recommendation.tips
+        }
+        return get_translations().request(sorted(tips), language)
+
+    @staticmethod
+    def evaluate(
+        screen_type: str,
+        ambient_light: str,
+        session_duration_minutes: int,
+        font_size: str,
+        contrast: str,
+        line_spacing: str,
+        text_width: str,
+        dark_mode: bool
+    ) -> ReadingComfortRecommendation:
+        """Apply the recommendation rules to one context."""
+        background_color = "#1a1a1a" if dark_mode else "#ffffff"
+
+        # Adjust based on session duration
+        if session_duration_minutes > 60:
+            font_size = "large"  # Larger font for long sessions
+            line_spacing = "comfortable"  # More comfortable spacing
+
+        # Adjust based on lighting
+        if ambient_light == "dim":
+            background_color = "#1a1a1a"
+            contrast = "high"
+        elif ambient_light == "bright":
+            background_color = "#ffffff"
+            contrast = "normal"
+
+        # Device-specific adjustments
+        if screen_type == "phone":
+            font_size = "large"  # Phones are closer
+        elif screen_type == "tablet":
+            font_size = "medium"
+
+        # Generate tips
+        tips = []
+        if session_duration_minutes > 30:
+            tips.append("Take a 20-20-20 break every 20 minutes")
+
+        if ambient_light == "dim":
+            tips.append("Increase room lighting to reduce eye strain")
+        elif ambient_light == "bright":
+            tips.append("Position screen to avoid glare from bright light")
+
+        if screen_type in ["phone", "tablet"]:
+            tips.append("Hold device further away to reduce accommodation stress")
+
+        tips.append("Keep screen at arm's length and slightly below eye level")
+        tips.append("Blink frequently to maintain eye moisture")
+
+        # Recommend break interval
+        if session_duration_minutes > 120:
+            break_interval = 15
+        else:
+            break_interval = 20  # Default 20-20-20
+
+        return ReadingComfortRecommendation(
+            font_size=font_size,
+            contrast_level=contrast,
+            line_spacing=line_spacing,
+            text_width=text_width,
+            background_color=background_color,
+            recommended_break_interval=break_interval,
+            tips=tips
+        )
+
+
+def _duration_bucket(minutes: int) -> int:
+    """Representative duration of the rules' bucket containing `minutes`."""
+    for bound in DURATION_BUCKETS[:-1]:
+        if minutes <= bound:
+            return bound
+    return DURATION_BUCKETS[-1]
+
+
+def join_bodies(compiled: List[CompiledRecommendation]) -> bytes:
+    """JSON array of pre-encoded recommendations."""
+    return b"[" + b",".join(item.body for item in compiled) + b"]"
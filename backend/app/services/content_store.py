@@ -0,0 +1,226 @@
+"""File-backed learning content with lazy loading and hot reload."""
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.http import make_etag
+from app.schemas import LearningModule
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONTENT_DIR = Path(__file__).resolve().parents[1] / "content" / "learning"
+
+# Quiz file suffixes, in lookup order; YAML needs the optional PyYAML package
+QUIZ_SUFFIXES = (".quiz.json", ".quiz.yaml", ".quiz.yml")
+
+
+class ModuleIndexEntry:
+    """Catalog metadata for one module; the body stays on disk until needed."""
+
+    __slots__ = ("id", "title", "description", "order", "content_path", "quiz_path", "mtime")
+
+    def __init__(self, module_id: str, title: str, description: str, order: int,
+                 content_path: Path, quiz_path: Optional[Path], mtime: Tuple[float, ...]):
+        self.id = module_id
+        self.title = title
+        self.description = description
+        self.order = order
+        self.content_path = content_path
+        self.quiz_path = quiz_path
+        self.mtime = mtime
+
+
+class ContentStore:
+    """Learning modules stored as `<id>.md` files plus optional quiz files.
+
+    Each markdown file starts with a front matter block:
+
+        ---
+        title: Module title
+        description: One-line summary
+        order: 1
+        ---
+
+    Only front matter is read when indexing. Module bodies and quizzes are
+    loaded on first access and held in a bounded LRU keyed by file mtimes,
+    and the directory is rescanned for changes at most every
+    `reload_seconds`.
+    """
+
+    def __init__(self, directory: Path, cache_name: str, cache_size: int = 128, reload_seconds: float = 2.0):
+        self.directory = Path(directory)
+        self.reload_seconds = reload_seconds
+        self.version = 0
+        self._index: Dict[str, ModuleIndexEntry] = {}
+        self._signature: Dict[str, Tuple[float, ...]] = {}
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        # Each store names its cache, since caches are reported by name
+        self._bodies = LRUCache(cache_name, maxsize=cache_size)
+        self.refresh(force=True)
+
+    def refresh(self, force: bool = False) -> bool:
+        """Re-index changed files; returns True if anything changed."""
+        if not force and time.monotonic() - self._checked_at < self.reload_seconds:
+            return False
+        with self._lock:
+            self._checked_at = time.monotonic()
+            signature = self._scan()
+            if signature == self._signature and not force:
+                return False
+
+            index = {}
+            for module_id, mtime in signature.items():
+                previous = self._index.get(module_id)
+                if previous is not None and previous.mtime == mtime:
+                    index[module_id] = previous
+                    continue
+                try:
+                    index[module_id] = self._read_index_entry(module_id, mtime)
+                except (OSError, ValueError) as e:
+                    logger.error(f"Skipping learning module {module_id}: {e}")
+
+            self._index = dict(sorted(index.items(), key=lambda item: (item[1].order, item[0])))
+            self._signature = signature
+            self.version += 1
+            logger.info(f"Learning content indexed: {len(self._index)} modules (version {self.version})")
+            return True
+
+    def list_entries(self) -> List[ModuleIndexEntry]:
+        """Index entries in catalog order."""
+        self.refresh()
+        return list(self._index.values())
+
+    def get_module(self, module_id: str) -> LearningModule:
+        """Load a module, from cache when its files are unchanged."""
+        return self._get_compiled(module_id)[0]
+
+    def get_module_json(self, module_id: str) -> Tuple[bytes, str]:
+        """Pre-encoded JSON for a module and its ETag."""
+        _, body, etag = self._get_compiled(module_id)
+        return body, etag
+
+    def _get_compiled(self, module_id: str) -> Tuple[LearningModule, bytes, str]:
+        """Module, its JSON encoding and ETag."""
+        self.refresh()
+        entry = self._index.get(module_id)
+        if entry is None:
+            raise ValueError(f"Module {module_id} not found")
+        return self._bodies.get_or_set((module_id, entry.mtime), lambda: self._compile(entry))
+
+    def _compile(self, entry: ModuleIndexEntry) -> Tuple[LearningModule, bytes, str]:
+        """Read a module's body and quiz from disk and encode it."""
+        _, content = _split_front_matter(entry.content_path.read_text(encoding="utf-8"))
+        module = LearningModule(
+            id=entry.id,
+            title=entry.title,
+            description=entry.description,
+            content=content,
+            quiz_questions=_load_quiz(entry.quiz_path) if entry.quiz_path else None
+        )
+        body = module.model_dump_json().encode()
+        return module, body, make_etag(body)
+
+    def _scan(self) -> Dict[str, Tuple[float, ...]]:
+        """Map module ids to the mtimes of their content and quiz files."""
+        mtimes: Dict[str, float] = {}
+        quizzes: Dict[str, float] = {}
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if not entry.is_file():
+                    continue
+                if entry.name.endswith(".md"):
+                    mtimes[entry.name[:-3]] = entry.stat().st_mtime
+                    continue
+                for suffix in QUIZ_SUFFIXES:
+                    if entry.name.endswith(suffix):
+                        quizzes[entry.name[:-len(suffix)]] = entry.stat().st_mtime
+        return {
+            module_id: (mtime, quizzes.get(module_id, 0.0))
+            for module_id, mtime in mtimes.items()
+        }
+
+    def _read_index_entry(self, module_id: str, mtime: Tuple[float, ...]) -> ModuleIndexEntry:
+        """Read only the front matter of a module file."""
+        content_path = self.directory / f"{module_id}.md"
+        with open(content_path, encoding="utf-8") as f:
+            if f.readline().strip() != "---":
+                raise ValueError("missing front matter")
+            lines = []
+            for line in f:
+                if line.strip() == "---":
+                    break
+                lines.append(line)
+        meta = _parse_front_matter(lines)
+
+        quiz_path = None
+        for suffix in QUIZ_SUFFIXES:
+            candidate = self.directory / f"{module_id}{suffix}"
+            if candidate.exists():
+                quiz_path = candidate
+                break
+
+        return ModuleIndexEntry(
+            module_id=module_id,
+            title=meta.get("title", module_id),
+            description=meta.get("description", ""),
+            order=int(meta.get("order", 0)),
+            content_path=content_path,
+            quiz_path=quiz_path,
+            mtime=mtime
+        )
+
+
+def _parse_front_matter(lines: List[str]) -> Dict[str, str]:
+    """Parse `key: value` front matter lines."""
+    meta = {}
+    for line in lines:
+        if ":" in line:
+            key, value = line.split(":", 1)
+            meta[key.strip()] = value.strip()
+    return meta
+
+
+def _split_front_matter(text: str) -> Tuple[Dict[str, str], str]:
+    """Split a module file into front matter and markdown body."""
+    lines = text.splitlines(keepends=True)
+    if not lines or lines[0].strip() != "---":
+        return {}, text
+    for i, line in enumerate(lines[1:], start=1):
+        if line.strip() == "---":
+            return _parse_front_matter(lines[1:i]), "".join(lines[i + 1:])
+    return {}, text
+
+
+def _load_quiz(path: Path) -> List[dict]:
+    """Load quiz questions from a JSON or YAML file."""
+    text = path.read_text(encoding="utf-8")
+    if path.suffix == ".json":
+        return json.loads(text)
+    try:
+        import yaml
+    except ImportError:
+        raise ValueError(f"Reading {path.name} requires PyYAML to be installed")
+    return yaml.safe_load(text)
+
+
+# Singleton instance
+_content_store: Optional[ContentStore] = None
+
+
+def get_content_store() -> ContentStore:
+    """Get or create the learning content store."""
+    global _content_store
+    if _content_store is None:
+        _content_store = ContentStore(
+            Path(settings.learning_content_dir) if settings.learning_content_dir else DEFAULT_CONTENT_DIR,
+            cache_name="learning_modules",
+            cache_size=settings.learning_cache_size,
+            reload_seconds=settings.learning_reload_seconds
+        )
+    return _content_store
@@ -0,0 +1,121 @@
+"""Composite home-page dashboard built from concurrent section lookups."""
+import asyncio
+import logging
+import threading
+import time
+from contextlib import nullcontext
+from typing import Any, Callable, Dict, Optional, Tuple
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, select
+from app.db.session import engine
+from app.models import EyeHealthReminder, UserPreferences
+from app.schemas import (
+    Dashboard,
+    LearningProgressResponse,
+    ReminderResponse,
+    UserPreferencesResponse
+)
+from app.services.habit_service import HabitService
+from app.services.preference_service import PreferenceService
+from app.services.progress_service import ProgressService
+
+logger = logging.getLogger(__name__)
+
+# A StaticPool engine (SQLite) has one connection for all threads, so
+# sections that reach the database take turns on it
+_connection_lock = threading.Lock() if isinstance(engine.pool, StaticPool) else None
+
+
+class DashboardService:
+    """Service for assembling the dashboard from independent sections."""
+
+    @staticmethod
+    async def get_dashboard(user_id: str) -> Dashboard:
+        """
+        Run every section concurrently, each with its own session.
+
+        Sections backed by caches return without touching the database. A
+        failing section is reported in `errors` rather than failing the
+        whole dashboard.
+        """
+        # name -> (cache lookup, database build); None from the lookup is a miss
+        sections: Dict[str, Tuple[Callable[[], Any], Callable[[Session], Any]]] = {
+            "weekly_summary": (
+                lambda: HabitService.get_cached_weekly_summary(user_id),
+                lambda session: HabitService.get_weekly_summary(session, user_id)
+            ),
+            "reminders": (
+                _uncached,
+                lambda session: DashboardService._reminders(session, user_id)
+            ),
+            "progress": (
+                _uncached,
+                lambda session: [
+                    LearningProgressResponse(**p.model_dump())
+                    for p in ProgressService.get_user_progress(session, user_id)
+                ]
+            ),
+            "preferences": (
+                lambda: _preferences_response(PreferenceService.get_cached_preferences(user_id)),
+                lambda session: _preferences_response(PreferenceService.get_or_create_preferences(session, user_id))
+            ),
+        }
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*[
+            run_in_threadpool(_run_section, name, cached, build)
+            for name, (cached, build) in sections.items()
+        ])
+
+        data, timings, errors = {}, {}, {}
+        for name, value, elapsed_ms, error in results:
+            data[name] = value
+            timings[name] = elapsed_ms
+            if error is not None:
+                errors[name] = error
+
+        return Dashboard(
+            user_id=user_id,
+            timings_ms=timings,
+            total_ms=round((time.perf_counter() - started) * 1000, 2),
+            errors=errors,
+            **data
+        )
+
+    @staticmethod
+    def _reminders(session: Session, user_id: str):
+        """A user's reminders, soonest to fire first."""
+        statement = select(EyeHealthReminder).where(
+            EyeHealthReminder.user_id == user_id
+        ).order_by(EyeHealthReminder.next_fire_at)
+        return [ReminderResponse(**r.model_dump()) for r in session.exec(statement).all()]
+
+
+def _preferences_response(preferences: Optional[UserPreferences]) -> Optional[UserPreferencesResponse]:
+    return UserPreferencesResponse(**preferences.model_dump()) if preferences is not None else None
+
+
+def _uncached() -> None:
+    """Cache lookup for sections that always read the database."""
+    return None
+
+
+def _run_section(name: str, cached: Callable[[], Any], build: Callable[[Session], Any]):
+    """
+    Build one section, from cache if possible, else in a session of its own.
+
+    Returns (name, value, ms, error). Only the database build takes the
+    StaticPool connection lock, so cache hits never wait for other sections.
+    """
+    started = time.perf_counter()
+    try:
+        value, error = cached(), None
+        if value is None:
+            with _connection_lock or nullcontext():
+                with Session(engine) as session:
+                    value = build(session)
+    except Exception as e:
+        logger.error(f"Dashboard section {name} failed: {e}")
+        value, error = None, str(e)
+    return name, value, round((time.perf_counter() - started) * 1000, 2), error
@@ -0,0 +1,210 @@
+"""Service for streaming full-account data exports."""
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Dict, Iterator, List, Type
+from sqlmodel import Session, SQLModel, select
+from app.db.session import engine
+from app.models import (
+    HabitLog,
+    ChatMessage,
+    EyeHealthReminder,
+    UserPreferences,
+    LearningProgress,
+    LearningQuizAttempt,
+    ReminderEventLog,
+    WeeklyInsight
+)
+
+# Rows fetched per round trip from the server-side cursor
+EXPORT_BATCH_SIZE = 500
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+class ExportService:
+    """Service for exporting a user's rows without loading them into memory."""
+
+    # Exportable tables by name
+    TABLES: Dict[str, Type[SQLModel]] = {
+        HabitLog.__tablename__: HabitLog,
+        ChatMessage.__tablename__: ChatMessage,
+        EyeHealthReminder.__tablename__: EyeHealthReminder,
+        UserPreferences.__tablename__: UserPreferences,
+        LearningProgress.__tablename__: LearningProgress,
+        LearningQuizAttempt.__tablename__: LearningQuizAttempt,
+        ReminderEventLog.__tablename__: ReminderEventLog,
+        WeeklyInsight.__tablename__: WeeklyInsight,
+    }
+
+    @staticmethod
+    def get_model(table: str) -> Type[SQLModel]:
+        """Resolve an exportable table name to its model."""
+        model = ExportService.TABLES.get(table)
+        if model is None:
+            raise ValueError(
+                f"Unknown table: {table}. Supported: {', '.join(ExportService.TABLES)}"
+            )
+        return model
+
+    @staticmethod
+    def validate(tables: List[str], export_format: str) -> None:
+        """Check tables and format before a response starts streaming."""
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(
+                f"Unknown format: {export_format}. Supported: {', '.join(EXPORT_FORMATS)}"
+            )
+        for table in tables:
+            ExportService.get_model(table)
+        if export_format == "parquet":
+            _require_pyarrow()
+
+    @staticmethod
+    def iter_rows(model: Type[SQLModel], user_id: str) -> Iterator[Dict]:
+        """Yield a user's rows as dicts, fetching in batches from a server-side cursor."""
+        columns = ExportService._columns(model)
+        statement = (
+            select(model)
+            .where(model.user_id == user_id)
+            .order_by(model.id)
+            .execution_options(stream_results=True, yield_per=EXPORT_BATCH_SIZE)
+        )
+        # Own session: the generator outlives the request-scoped one
+        with Session(engine) as session:
+            for row in session.exec(statement):
+                yield {name: getattr(row, name) for name in columns}
+                session.expunge(row)
+
+    @staticmethod
+    def stream_ndjson(user_id: str, tables: List[str]) -> Iterator[bytes]:
+        """Stream rows from several tables as newline-delimited JSON."""
+        for table in tables:
+            model = ExportService.get_model(table)
+            buffer = []
+            for row in ExportService.iter_rows(model, user_id):
+                buffer.append(json.dumps({"table": table, "row": row}, default=_json_default))
+                if len(buffer) >= EXPORT_BATCH_SIZE:
+                    yield ("\n".join(buffer) + "\n").encode()
+                    buffer = []
+            if buffer:
+                yield ("\n".join(buffer) + "\n").encode()
+
+    @staticmethod
+    def stream_csv(user_id: str, table: str) -> Iterator[bytes]:
+        """Stream a single table as CSV with a header row."""
+        model = ExportService.get_model(table)
+        columns = ExportService._columns(model)
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=columns)
+        writer.writeheader()
+
+        for count, row in enumerate(ExportService.iter_rows(model, user_id), start=1):
+            writer.writerow({k: _csv_value(v) for k, v in row.items()})
+            if count % EXPORT_BATCH_SIZE == 0:
+                yield buffer.getvalue().encode()
+                buffer.seek(0)
+                buffer.truncate()
+
+        if buffer.tell():
+            yield buffer.getvalue().encode()
+
+    @staticmethod
+    def stream_parquet(user_id: str, table: str) -> Iterator[bytes]:
+        """Stream a single table as Parquet, one row group per batch.
+
+        Requires the optional pyarrow dependency.
+        """
+        pa, pq = _require_pyarrow()
+        model = ExportService.get_model(table)
+        schema = pa.schema([
+            (column.name, _arrow_type(pa, column.type))
+            for column in model.__table__.columns
+        ])
+        sink = _ChunkSink()
+        writer = pq.ParquetWriter(sink, schema)
+
+        batch = []
+        for row in ExportService.iter_rows(model, user_id):
+            batch.append(row)
+            if len(batch) >= EXPORT_BATCH_SIZE:
+                writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                batch = []
+                yield sink.drain()
+        if batch:
+            writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+        writer.close()
+        yield sink.drain()
+
+    @staticmethod
+    def _columns(model: Type[SQLModel]) -> List[str]:
+        """Column names in table order."""
+        return [column.name for column in model.__table__.columns]
+
+
+class _ChunkSink:
+    """Write-only file object that buffers bytes until drained."""
+
+    def __init__(self):
+        self.closed = False
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _require_pyarrow():
+    """Import the optional pyarrow dependency."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError("Parquet export requires pyarrow to be installed")
+    return pa, pq
+
+
+def _json_default(value):
+    """JSON encoder for values the stdlib cannot serialize."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _csv_value(value):
+    """Render a value for CSV output."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _arrow_type(pa, column_type):
+    """Map a column's SQL type to a pyarrow type."""
+    try:
+        python_type = column_type.python_type
+    except NotImplementedError:
+        return pa.string()
+    if python_type is bool:
+        return pa.bool_()
+    if python_type is int:
+        return pa.int64()
+    if python_type is float:
+        return pa.float64()
+    if python_type is datetime:
+        return pa.timestamp("us")
+    return pa.string()
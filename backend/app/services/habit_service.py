@@ -1,11 +1,27 @@
 """Service for managing habit tracking and analytics."""
 from sqlmodel import Session, select
 from datetime import datetime, timedelta
-from typing import List
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.fields import fetch_fields
 from app.models import HabitLog
-from app.schemas import HabitLogCreate, HabitWeeklySummary
+from app.schemas import HabitLogCreate, HabitWeeklySummary, HabitTrendPoint, HabitTrends
+from app.services.sync_service import SyncService
+import numpy as np
 import statistics
 
+# Minimum number of prior logged days before a day can be flagged anomalous
+MIN_ANOMALY_HISTORY = 3
+
+# Weekly summaries keyed by (user_id, window_days); invalidated on new logs.
+# The TTL bounds drift of the rolling window for users who stop logging.
+_summary_cache = LRUCache(
+    "weekly_summary",
+    maxsize=settings.summary_cache_size,
+    ttl_seconds=settings.summary_cache_ttl_seconds
+)
+
 
 class HabitService:
     """Service for habit tracking operations."""
@@ -27,10 +43,18 @@ class HabitService:
             notes=habit_log.notes,
         )
         session.add(db_log)
+        session.flush()
+        SyncService.record(session, user_id, HabitLog.__tablename__, [db_log.id])
         session.commit()
         session.refresh(db_log)
+        HabitService.invalidate_summaries(user_id)
         return db_log
     
+    @staticmethod
+    def invalidate_summaries(user_id: str) -> None:
+        """Drop cached summaries for a user after their logs change."""
+        _summary_cache.invalidate_where(lambda key: key[0] == user_id)
+    
     @staticmethod
     def get_user_habit_logs(
         session: Session,
@@ -38,20 +62,53 @@ class HabitService:
         days: int = 30
     ) -> List[HabitLog]:
         """Get user's habit logs for the past N days."""
+        return session.exec(HabitService._habit_logs_statement(user_id, days)).all()
+    
+    @staticmethod
+    def get_user_habit_log_fields(
+        session: Session,
+        user_id: str,
+        days: int,
+        fields: List[str]
+    ) -> List[Dict[str, Any]]:
+        """Get only the named columns of a user's habit logs."""
+        statement = HabitService._habit_logs_statement(user_id, days)
+        return fetch_fields(session, statement, HabitLog, fields)
+    
+    @staticmethod
+    def _habit_logs_statement(user_id: str, days: int):
+        """SELECT of a user's habit logs for the past N days, newest first."""
         cutoff_date = datetime.utcnow() - timedelta(days=days)
-        statement = select(HabitLog).where(
+        return select(HabitLog).where(
             HabitLog.user_id == user_id,
             HabitLog.date >= cutoff_date
         ).order_by(HabitLog.date.desc())
-        return session.exec(statement).all()
     
     @staticmethod
     def get_weekly_summary(
         session: Session,
-        user_id: str
+        user_id: str,
+        days: int = 7
+    ) -> HabitWeeklySummary:
+        """Get weekly habit summary, served from cache when available."""
+        return _summary_cache.get_or_set(
+            (user_id, days),
+            lambda: HabitService._build_weekly_summary(session, user_id, days)
+        )
+    
+    @staticmethod
+    def get_cached_weekly_summary(user_id: str, days: int = 7) -> Optional[HabitWeeklySummary]:
+        """The cached weekly summary, or None without touching the database."""
+        return _summary_cache.get((user_id, days))
+    
+    @staticmethod
+    def _build_weekly_summary(
+        session: Session,
+        user_id: str,
+        days: int = 7
     ) -> HabitWeeklySummary:
         """Generate weekly habit summary."""
-        week_start = datetime.utcnow() - timedelta(days=7)
+        week_start = datetime.utcnow() - timedelta(days=days)
         week_end = datetime.utcnow()
         
         statement = select(HabitLog).where(
@@ -60,7 +117,58 @@ class HabitService:
             HabitLog.date <= week_end
         )
         logs = session.exec(statement).all()
+        return HabitService._summarize(logs, week_start, week_end)
+    
+    @staticmethod
+    def get_weekly_summaries(
+        session: Session,
+        user_ids: Sequence[str],
+        days: int = 7
+    ) -> Dict[str, HabitWeeklySummary]:
+        """
+        Weekly summaries for many users with a single query.
+        
+        Used by batch jobs; bypasses the summary cache so a pass over all
+        users does not evict the entries serving interactive requests.
+        """
+        week_start = datetime.utcnow() - timedelta(days=days)
+        week_end = datetime.utcnow()
         
+        statement = select(HabitLog).where(
+            HabitLog.user_id.in_(list(user_ids)),
+            HabitLog.date >= week_start,
+            HabitLog.date <= week_end
+        )
+        logs_by_user: Dict[str, List[HabitLog]] = {user_id: [] for user_id in user_ids}
+        for log in session.exec(statement).all():
+            logs_by_user[log.user_id].append(log)
+        
+        return {
+            user_id: HabitService._summarize(logs, week_start, week_end)
+            for user_id, logs in logs_by_user.items()
+        }
+    
+    @staticmethod
+    def get_active_user_ids(
+        session: Session,
+        since: datetime,
+        after: str = "",
+        limit: int = 100
+    ) -> List[str]:
+        """Users with habit logs since a time, in user_id order after a cursor."""
+        statement = select(HabitLog.user_id).where(
+            HabitLog.date >= since,
+            HabitLog.user_id > after
+        ).distinct().order_by(HabitLog.user_id).limit(limit)
+        return list(session.exec(statement).all())
+    
+    @staticmethod
+    def _summarize(
+        logs: Sequence[HabitLog],
+        week_start: datetime,
+        week_end: datetime
+    ) -> HabitWeeklySummary:
+        """Aggregate a week of logs into a summary."""
         if not logs:
             return HabitWeeklySummary(
                 week_start=week_start,
@@ -114,6 +222,151 @@ class HabitService:
             recommendations=recommendations
         )
     
+    @staticmethod
+    def get_trends(
+        session: Session,
+        user_id: str,
+        days: int = 90,
+        window: int = 7,
+        z_threshold: float = 2.5
+    ) -> HabitTrends:
+        """Build daily trend series with moving averages and anomaly flags."""
+        end = datetime.utcnow()
+        start = (end - timedelta(days=days - 1)).replace(hour=0, minute=0, second=0, microsecond=0)
+        # Extra history so averages, deltas and z-scores are defined from day one
+        history = max(window, 7)
+        
+        statement = select(
+            HabitLog.date,
+            HabitLog.screen_time_hours,
+            HabitLog.eye_strain_level
+        ).where(
+            HabitLog.user_id == user_id,
+            HabitLog.date >= start - timedelta(days=history),
+            HabitLog.date <= end
+        )
+        rows = session.exec(statement).all()
+        
+        return HabitService.compute_trends(rows, start, end, days, window, z_threshold)
+    
+    @staticmethod
+    def compute_trends(
+        rows: Sequence[Tuple[datetime, float, int]],
+        start: datetime,
+        end: datetime,
+        days: int,
+        window: int,
+        z_threshold: float
+    ) -> HabitTrends:
+        """Compute trend series from (date, screen_time, strain) rows."""
+        history = max(window, 7)
+        n = days + history
+        origin = np.datetime64(start.date(), "D") - np.timedelta64(history, "D")
+        
+        if rows:
+            dates, screen, strain = zip(*rows)
+            offsets = (np.array(dates, dtype="datetime64[D]") - origin).astype(np.int64)
+            screen = np.asarray(screen, dtype=np.float64)
+            strain = np.asarray(strain, dtype=np.float64)
+            in_range = (offsets >= 0) & (offsets < n)
+            offsets, screen, strain = offsets[in_range], screen[in_range], strain[in_range]
+        else:
+            offsets = np.empty(0, dtype=np.int64)
+            screen = strain = np.empty(0, dtype=np.float64)
+        
+        counts = np.bincount(offsets, minlength=n)
+        daily_screen = HabitService._daily_mean(offsets, screen, counts)
+        daily_strain = HabitService._daily_mean(offsets, strain, counts)
+        
+        screen_avg = HabitService._rolling_mean(daily_screen, window)
+        strain_avg = HabitService._rolling_mean(daily_strain, window)
+        screen_delta = HabitService._shift_delta(daily_screen, 7)
+        strain_delta = HabitService._shift_delta(daily_strain, 7)
+        screen_z = HabitService._rolling_zscore(daily_screen, window)
+        strain_z = HabitService._rolling_zscore(daily_strain, window)
+        
+        with np.errstate(invalid="ignore"):
+            anomalous = (np.abs(np.nan_to_num(screen_z)) >= z_threshold) | (
+                np.abs(np.nan_to_num(strain_z)) >= z_threshold
+            )
+        
+        points = []
+        anomalies = []
+        for i in range(history, n):
+            day = start + timedelta(days=i - history)
+            point = HabitTrendPoint(
+                date=day,
+                log_count=int(counts[i]),
+                screen_time=_as_float(daily_screen[i]),
+                strain_level=_as_float(daily_strain[i]),
+                screen_time_avg=_as_float(screen_avg[i]),
+                strain_level_avg=_as_float(strain_avg[i]),
+                screen_time_wow_delta=_as_float(screen_delta[i]),
+                strain_level_wow_delta=_as_float(strain_delta[i]),
+                screen_time_zscore=_as_float(screen_z[i]),
+                strain_level_zscore=_as_float(strain_z[i]),
+                is_anomaly=bool(anomalous[i])
+            )
+            points.append(point)
+            if point.is_anomaly:
+                anomalies.append(day)
+        
+        return HabitTrends(
+            start=start,
+            end=end,
+            days=days,
+            window=window,
+            z_threshold=z_threshold,
+            points=points,
+            anomalies=anomalies
+        )
+    
+    @staticmethod
+    def _daily_mean(offsets: np.ndarray, values: np.ndarray, counts: np.ndarray) -> np.ndarray:
+        """Average values per day bucket; days without logs are NaN."""
+        sums = np.bincount(offsets, weights=values, minlength=len(counts))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(counts > 0, sums / counts, np.nan)
+    
+    @staticmethod
+    def _window_sums(values: np.ndarray, lo: np.ndarray, hi: np.ndarray):
+        """Sum, sum of squares and count of non-NaN values in [lo, hi)."""
+        present = ~np.isnan(values)
+        filled = np.where(present, values, 0.0)
+        csum = np.concatenate(([0.0], np.cumsum(filled)))
+        csq = np.concatenate(([0.0], np.cumsum(filled * filled)))
+        ccount = np.concatenate(([0], np.cumsum(present)))
+        return csum[hi] - csum[lo], csq[hi] - csq[lo], ccount[hi] - ccount[lo]
+    
+    @staticmethod
+    def _rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+        """Trailing moving average over the last `window` days, ignoring gaps."""
+        hi = np.arange(1, len(values) + 1)
+        lo = np.maximum(0, hi - window)
+        sums, _, count = HabitService._window_sums(values, lo, hi)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(count > 0, sums / count, np.nan)
+    
+    @staticmethod
+    def _shift_delta(values: np.ndarray, lag: int) -> np.ndarray:
+        """Difference between each day and the day `lag` days earlier."""
+        delta = np.full(len(values), np.nan)
+        delta[lag:] = values[lag:] - values[:-lag]
+        return delta
+    
+    @staticmethod
+    def _rolling_zscore(values: np.ndarray, window: int) -> np.ndarray:
+        """Z-score of each day against the preceding `window` days."""
+        hi = np.arange(len(values))
+        lo = np.maximum(0, hi - window)
+        sums, squares, count = HabitService._window_sums(values, lo, hi)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = sums / count
+            std = np.sqrt(np.maximum(squares / count - mean * mean, 0.0))
+            z = (values - mean) / std
+        valid = (count >= MIN_ANOMALY_HISTORY) & (std > 1e-9) & ~np.isnan(values)
+        return np.where(valid, z, np.nan)
+    
     @staticmethod
     def _calculate_habit_score(
         screen_time: float,
@@ -162,3 +415,10 @@ class HabitService:
             recommendations.append("Great work! Keep maintaining your healthy eye habits.")
         
         return recommendations
+
+
+def _as_float(value: float):
+    """Convert a NumPy scalar to a rounded float, mapping NaN to None."""
+    if np.isnan(value):
+        return None
+    return round(float(value), 2)
@@ -0,0 +1,325 @@
+"""Nightly batch generation of weekly AI insights."""
+import asyncio
+import json
+import logging
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Optional, Set, Tuple
+from fastapi.concurrency import run_in_threadpool
+from sqlmodel import Session, select
+from app.core.config import settings
+from app.db.session import dialect_insert, engine
+from app.models import InsightJobRun, WeeklyInsight
+from app.schemas import AIResponse, HabitWeeklySummary, InsightJobReport, WeeklyInsightResponse
+from app.services.ai_service import fallback_response, get_ai_service
+from app.services.habit_service import HabitService
+from app.services.llm_scheduler import BACKGROUND
+from app.services.user_context_service import UserContextService
+
+logger = logging.getLogger(__name__)
+
+RUNNING = "running"
+COMPLETED = "completed"
+
+INSIGHT_PROMPT = (
+    "Reflect on my eye-care habits over the past week: what went well, "
+    "what I should improve, and one concrete goal for the coming week."
+)
+
+
+def week_start_of(day: date) -> date:
+    """Monday of the week containing day."""
+    return day - timedelta(days=day.weekday())
+
+
+class RateLimiter:
+    """Spaces calls evenly to stay within a per-minute budget."""
+
+    def __init__(self, per_minute: float):
+        self.interval = 60.0 / per_minute if per_minute > 0 else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait for the next free slot."""
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class InsightService:
+    """Service for reading stored weekly insights and batch progress."""
+
+    @staticmethod
+    def get_current_insight(session: Session, user_id: str) -> Optional[WeeklyInsightResponse]:
+        """The user's insight for this week, or last week's until this week's exists."""
+        earliest = week_start_of(datetime.utcnow().date()) - timedelta(days=7)
+        statement = select(WeeklyInsight).where(
+            WeeklyInsight.user_id == user_id,
+            WeeklyInsight.week_start >= earliest
+        ).order_by(WeeklyInsight.week_start.desc()).limit(1)
+        insight = session.exec(statement).first()
+        if insight is None:
+            return None
+        return WeeklyInsightResponse(
+            week_start=insight.week_start,
+            summary=insight.summary,
+            tips=json.loads(insight.tips),
+            reminder=insight.reminder,
+            created_at=insight.created_at
+        )
+
+    @staticmethod
+    def get_latest_run(session: Session) -> Optional[InsightJobReport]:
+        """Progress of the most recent batch run."""
+        run = session.exec(select(InsightJobRun).order_by(InsightJobRun.run_date.desc())).first()
+        if run is None:
+            return None
+        users_per_second = None
+        if run.finished_at is not None:
+            elapsed = (run.finished_at - run.started_at).total_seconds()
+            users_per_second = round(run.processed / elapsed, 2) if elapsed > 0 else None
+        return InsightJobReport(
+            run_date=run.run_date,
+            week_start=run.week_start,
+            status=run.status,
+            processed=run.processed,
+            generated=run.generated,
+            skipped=run.skipped,
+            failed=run.failed,
+            started_at=run.started_at,
+            finished_at=run.finished_at,
+            users_per_second=users_per_second
+        )
+
+
+class InsightJob:
+    """Walks active users in chunks and stores a weekly insight for each.
+
+    Progress is committed per chunk together with the chunk's insights, so
+    a run interrupted by a restart resumes after the last committed user.
+    Users who already have this week's insight are skipped, which makes
+    re-running a night cheap and lets users who became active mid-week
+    get theirs on the following night. Provider calls are bounded by a
+    concurrency limit and a requests-per-minute budget.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = 100,
+        concurrency: int = 4,
+        requests_per_minute: float = 60.0
+    ):
+        self.chunk_size = chunk_size
+        self.concurrency = concurrency
+        self.requests_per_minute = requests_per_minute
+        self._task: Optional[asyncio.Task] = None
+
+    async def run_once(self, today: Optional[date] = None) -> InsightJobReport:
+        """Run (or resume) tonight's batch and report its progress."""
+        today = today or datetime.utcnow().date()
+        week_start = week_start_of(today)
+        run_id, cursor, status = await run_in_threadpool(self._claim_run, today, week_start)
+        if status == COMPLETED:
+            return await run_in_threadpool(self._report)
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        limiter = RateLimiter(self.requests_per_minute)
+        started = time.perf_counter()
+        processed = 0
+
+        while True:
+            user_ids, summaries, done = await run_in_threadpool(self._load_chunk, cursor, week_start)
+            if not user_ids:
+                break
+            todo = [user_id for user_id in user_ids if user_id not in done]
+            responses = await asyncio.gather(*[
+                self._generate(semaphore, limiter, user_id, summaries[user_id]) for user_id in todo
+            ])
+            cursor = user_ids[-1]
+            await run_in_threadpool(
+                self._save_chunk, run_id, week_start, cursor,
+                dict(zip(todo, responses)), len(user_ids) - len(todo)
+            )
+            processed += len(user_ids)
+
+        report = await run_in_threadpool(self._finish, run_id)
+        elapsed = time.perf_counter() - started
+        logger.info(
+            f"Weekly insights for {week_start}: {report.generated} generated, "
+            f"{report.skipped} skipped, {report.failed} failed; "
+            f"{processed} users this session in {elapsed:.1f}s "
+            f"({processed / elapsed if elapsed > 0 else 0:.1f} users/s)"
+        )
+        return report
+
+    async def run(self, hour_utc: int) -> None:
+        """Resume an interrupted run, then run the batch every night at hour_utc until cancelled."""
+        unfinished = await run_in_threadpool(self._unfinished_run_date)
+        if unfinished is not None:
+            try:
+                await self.run_once(unfinished)
+            except Exception as e:
+                logger.error(f"Resuming weekly insight batch failed: {e}")
+        while True:
+            now = datetime.now(timezone.utc)
+            next_run = now.replace(hour=hour_utc, minute=0, second=0, microsecond=0)
+            if next_run <= now:
+                next_run += timedelta(days=1)
+            await asyncio.sleep((next_run - now).total_seconds())
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"Weekly insight batch failed: {e}")
+
+    def start(self, hour_utc: int) -> None:
+        """Start the nightly schedule as a background task."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run(hour_utc))
+
+    async def stop(self) -> None:
+        """Cancel the nightly schedule; an interrupted run resumes next time."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _generate(
+        self,
+        semaphore: asyncio.Semaphore,
+        limiter: RateLimiter,
+        user_id: str,
+        summary: HabitWeeklySummary
+    ) -> Optional[AIResponse]:
+        """One provider call within the budget; None on failure."""
+        async with semaphore:
+            await limiter.acquire()
+            try:
+                context = {"recent_habits": UserContextService.render_habits(summary)}
+                response = await get_ai_service().chat(
+                    INSIGHT_PROMPT, context, use_cache=False, user_id=user_id, priority=BACKGROUND
+                )
+            except Exception as e:
+                logger.error(f"Weekly insight for {user_id} failed: {e}")
+                return None
+        return None if response == fallback_response() else response
+
+    def _claim_run(self, today: date, week_start: date) -> Tuple[int, str, str]:
+        """Create tonight's run row if needed; returns (id, cursor, status)."""
+        with Session(engine) as session:
+            statement = dialect_insert(InsightJobRun).values(
+                run_date=today,
+                week_start=week_start,
+                status=RUNNING,
+                cursor="",
+                processed=0,
+                generated=0,
+                skipped=0,
+                failed=0,
+                started_at=datetime.utcnow()
+            ).on_conflict_do_nothing(index_elements=["run_date"])
+            session.execute(statement)
+            session.commit()
+            run = session.exec(select(InsightJobRun).where(InsightJobRun.run_date == today)).one()
+            return run.id, run.cursor, run.status
+
+    def _load_chunk(
+        self,
+        cursor: str,
+        week_start: date
+    ) -> Tuple[List[str], Dict[str, HabitWeeklySummary], Set[str]]:
+        """Next chunk of active users, their summaries, and who already has an insight."""
+        with Session(engine) as session:
+            since = datetime.utcnow() - timedelta(days=7)
+            user_ids = HabitService.get_active_user_ids(session, since, after=cursor, limit=self.chunk_size)
+            if not user_ids:
+                return [], {}, set()
+            done = set(session.exec(select(WeeklyInsight.user_id).where(
+                WeeklyInsight.user_id.in_(user_ids),
+                WeeklyInsight.week_start == week_start
+            )).all())
+            todo = [user_id for user_id in user_ids if user_id not in done]
+            summaries = HabitService.get_weekly_summaries(session, todo) if todo else {}
+            return user_ids, summaries, done
+
+    def _save_chunk(
+        self,
+        run_id: int,
+        week_start: date,
+        cursor: str,
+        responses: Dict[str, Optional[AIResponse]],
+        skipped: int
+    ) -> None:
+        """Store a chunk's insights and advance the cursor in one transaction."""
+        now = datetime.utcnow()
+        rows = [
+            {
+                "user_id": user_id,
+                "week_start": week_start,
+                "summary": response.summary,
+                "tips": json.dumps(response.tips),
+                "reminder": response.reminder,
+                "created_at": now,
+            }
+            for user_id, response in responses.items()
+            if response is not None
+        ]
+        failed = len(responses) - len(rows)
+        with Session(engine) as session:
+            if rows:
+                session.execute(
+                    dialect_insert(WeeklyInsight).values(rows).on_conflict_do_nothing(
+                        index_elements=["user_id", "week_start"]
+                    )
+                )
+            run = session.get(InsightJobRun, run_id)
+            run.cursor = cursor
+            run.processed += len(responses) + skipped
+            run.generated += len(rows)
+            run.skipped += skipped
+            run.failed += failed
+            session.add(run)
+            session.commit()
+
+    def _finish(self, run_id: int) -> InsightJobReport:
+        """Mark the run completed and report it."""
+        with Session(engine) as session:
+            run = session.get(InsightJobRun, run_id)
+            run.status = COMPLETED
+            run.finished_at = datetime.utcnow()
+            session.add(run)
+            session.commit()
+            return InsightService.get_latest_run(session)
+
+    def _unfinished_run_date(self) -> Optional[date]:
+        """Date of the most recent run if it was interrupted."""
+        with Session(engine) as session:
+            run = session.exec(select(InsightJobRun).order_by(InsightJobRun.run_date.desc())).first()
+            return run.run_date if run is not None and run.status == RUNNING else None
+
+    def _report(self) -> InsightJobReport:
+        """Report the latest run without changing it."""
+        with Session(engine) as session:
+            return InsightService.get_latest_run(session)
+
+
+# Singleton instance
+_insight_job: Optional[InsightJob] = None
+
+
+def get_insight_job() -> InsightJob:
+    """Get or create the weekly insight job."""
+    global _insight_job
+    if _insight_job is None:
+        _insight_job = InsightJob(
+            chunk_size=settings.insight_chunk_size,
+            concurrency=settings.insight_concurrency,
+            requests_per_minute=settings.insight_requests_per_minute
+        )
+    return _insight_job
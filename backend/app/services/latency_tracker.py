@@ -0,0 +1,82 @@
+"""Observed provider latency and the adaptive deadline derived from it."""
+from collections import deque
+from typing import Dict
+
+
+class LatencyTracker:
+    """Rolling latency window for one provider.
+
+    The deadline for the next call is a high percentile of recent
+    latencies times a safety multiplier, clamped to [minimum, maximum];
+    until min_samples calls have completed the initial deadline applies.
+    Calls cut off by the deadline are recorded at the deadline, so when
+    the provider slows down as a whole the deadline rises with it instead
+    of failing every call.
+    """
+
+    def __init__(
+        self,
+        initial: float = 30.0,
+        minimum: float = 5.0,
+        maximum: float = 60.0,
+        percentile: float = 0.99,
+        multiplier: float = 1.5,
+        min_samples: int = 20,
+        window: int = 500
+    ):
+        self.initial = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.percentile = percentile
+        self.multiplier = multiplier
+        self.min_samples = min_samples
+        self._samples = deque(maxlen=window)
+        self._deadline = initial
+        self.timeouts = 0
+        self.cancelled = 0
+
+    def deadline(self) -> float:
+        """Seconds the next provider call may take."""
+        return self._deadline
+
+    def record(self, seconds: float) -> None:
+        """Record a completed call."""
+        self._samples.append(seconds)
+        self._update()
+
+    def record_timeout(self, deadline: float) -> None:
+        """Record a call cut off at its deadline."""
+        self.timeouts += 1
+        self._samples.append(deadline)
+        self._update()
+
+    def record_cancelled(self) -> None:
+        """Record a call abandoned by its caller."""
+        self.cancelled += 1
+
+    def stats(self) -> Dict[str, float]:
+        """Latency percentiles, the current deadline and cut-off counters."""
+        samples = sorted(self._samples)
+        return {
+            "samples": len(samples),
+            "p50_ms": round(percentile(samples, 0.50) * 1000, 2),
+            "p95_ms": round(percentile(samples, 0.95) * 1000, 2),
+            "p99_ms": round(percentile(samples, 0.99) * 1000, 2),
+            "deadline_ms": round(self._deadline * 1000, 2),
+            "timeouts": self.timeouts,
+            "cancelled": self.cancelled,
+        }
+
+    def _update(self) -> None:
+        """Recompute the deadline from the window."""
+        if len(self._samples) < self.min_samples:
+            return
+        observed = percentile(sorted(self._samples), self.percentile) * self.multiplier
+        self._deadline = min(self.maximum, max(self.minimum, observed))
+
+
+def percentile(values: list, fraction: float) -> float:
+    """Nearest-rank percentile of sorted values."""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(fraction * len(values)))]
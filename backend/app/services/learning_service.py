@@ -1,264 +1,177 @@
 """Learning module content and quiz management."""
-from typing import List, Dict, Any
-from app.schemas import LearningModule, QuizResult
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple, Type
+from pydantic import BaseModel, TypeAdapter
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.http import make_etag
+from app.schemas import LearningModule, LearningModuleSummary, QuizResult
+from app.services.content_store import get_content_store
+from app.services.translation_service import SOURCE_LANGUAGE, get_translations
+
+# Translated JSON keyed by (view, module_id, content version, language), plus
+# a completion flag for the full listing. Only complete translations are
+# stored, so entries stay valid for their version.
+_localized_json = LRUCache("learning_localized", maxsize=settings.learning_cache_size)
+
+
+class CompiledCatalog:
+    """A module listing JSON-encoded once per content version, with a hash."""
+    
+    def __init__(self, schema: Type[BaseModel], modules: Sequence[BaseModel], version: int):
+        self.version = version
+        self.body: bytes = TypeAdapter(List[schema]).dump_json(list(modules))
+        self.etag: str = make_etag(self.body)
 
 
 class LearningService:
     """Service for managing learning content."""
     
-    # Learning modules database
-    MODULES = {
-        "eyes_101": {
-            "id": "eyes_101",
-            "title": "Eyes 101: How Your Eyes Work",
-            "description": "Learn the basics of eye anatomy and how vision works.",
-            "content": """
-## How Your Eyes Work
-
-Your eyes are amazing organs that allow you to see the world around you!
-
-### Main Parts:
-1. **Cornea**: The clear front layer that focuses light
-2. **Lens**: Adjusts focus for near and far objects
-3. **Retina**: Contains light-sensitive cells that send signals to your brain
-4. **Optic Nerve**: Carries visual information to your brain
-
-### The Vision Process:
-1. Light enters through the cornea
-2. Light passes through the lens which focuses it
-3. Light hits the retina at the back of the eye
-4. Retina cells convert light into signals
-5. Signals travel via optic nerve to your brain
-6. Brain interprets the signals and you see!
-
-### Fun Facts:
-- Your eyes can see in color, black and white, and even in very dim light
-- Your eyes move about 100,000 times per day
-- The muscles in your eyes are the most active muscles in your body
-""",
-            "quiz_questions": [
-                {
-                    "question": "Which part of the eye focuses light?",
-                    "options": ["Cornea", "Retina", "Iris", "Optic Nerve"],
-                    "correct": 0
-                },
-                {
-                    "question": "What is the optic nerve responsible for?",
-                    "options": ["Focusing light", "Carrying visual signals to the brain", "Adjusting pupil size", "Protecting the eye"],
-                    "correct": 1
-                }
-            ]
-        },
-        "digital_eye_strain": {
-            "id": "digital_eye_strain",
-            "title": "Digital Eye Strain: Prevention Tips",
-            "description": "Understand and prevent eye strain from screen use.",
-            "content": """
-## Digital Eye Strain (Computer Vision Syndrome)
-
-Many people experience discomfort when using screens. This is called digital eye strain.
-
-### Why It Happens:
-- When looking at screens, we blink 66% less than normal
-- Our eyes focus at the same distance for long periods
-- Screens emit blue light which can strain eyes
-- Poor posture and lighting make it worse
-
-### Common Symptoms:
-- Dry, irritated eyes
-- Blurred vision
-- Headaches
-- Neck and shoulder pain
-- Eye fatigue
-
-### Prevention Strategies:
-
-#### The 20-20-20 Rule ⭐
-**Every 20 minutes, look at something 20 feet away for 20 seconds**
-
-This is THE most important rule for digital eye health!
-
-#### Proper Workspace Setup:
-- Position screen 20-24 inches from your eyes
-- Top of screen at or slightly below eye level
-- Reduce glare by adjusting lighting or screen angle
-- Maintain good posture (shoulders relaxed, back straight)
-
-#### Screen Settings:
-- Increase font size if text is too small
-- Use high contrast between text and background
-- Enable dark mode in the evening
-- Reduce brightness to match surroundings
-
-#### Eye Care Habits:
-- Blink deliberately and often
-- Keep eyes moist (use artificial tears if needed)
-- Take regular breaks away from screens
-- Stay hydrated (drink water throughout the day)
-""",
-            "quiz_questions": [
-                {
-                    "question": "How many times less do we blink when using screens?",
-                    "options": ["25% less", "50% less", "66% less", "80% less"],
-                    "correct": 2
-                },
-                {
-                    "question": "What should you do every 20 minutes (20-20-20 rule)?",
-                    "options": ["Close your eyes", "Look 20 feet away for 20 seconds", "Drink 20ml of water", "Blink 20 times"],
-                    "correct": 1
-                }
-            ]
-        },
-        "lighting_guide": {
-            "id": "lighting_guide",
-            "title": "Proper Lighting for Eye Comfort",
-            "description": "Learn how to optimize lighting for reading and screen use.",
-            "content": """
-## Lighting and Eye Comfort
-
-Good lighting is crucial for eye comfort and overall vision quality.
-
-### Types of Lighting:
-
-#### Ambient Lighting
-- General room brightness
-- Should be 3-4 times the brightness of your screen
-- Prevents contrast stress on your eyes
-
-#### Task Lighting
-- Direct light focused on what you're reading/working on
-- Prevents the need for excessive brightness
-- Should come from behind or beside you (not overhead)
-
-#### Natural Light
-- Best for eye health
-- Provides full spectrum light
-- Position workspace near windows when possible
-- Avoid direct sunlight on screens (causes glare)
-
-### Common Lighting Problems:
-
-#### Glare:
-- Caused by light reflecting off surfaces
-- Reduces contrast and visibility
-- Solutions: Position screen away from windows, use matte screens, adjust lamp angles
-
-#### Insufficient Lighting:
-- Strains eyes due to constant focusing effort
-- Solutions: Add task lighting, move closer to light source, increase screen brightness moderately
-
-#### Excessive Brightness:
-- Can cause discomfort and headaches
-- Solutions: Reduce screen brightness, use anti-glare screen protector
-
-### Ideal Setup:
-1. Soft ambient lighting throughout the room
-2. Task lighting that doesn't create glare
-3. Screen positioned perpendicular to windows
-4. Brightness adjusted to match surroundings
-5. No direct light sources in your field of view
-
-### Color Temperature:
-- **Warm light (2700K)**: Evening/relaxation - reduces blue light
-- **Cool light (4000-5000K)**: Daytime/work - closer to natural daylight
-- Use warm light 1-2 hours before bedtime to improve sleep
-""",
-            "quiz_questions": [
-                {
-                    "question": "Ideal ambient lighting should be how many times brighter than your screen?",
-                    "options": ["1-2 times", "3-4 times", "5-6 times", "10+ times"],
-                    "correct": 1
-                }
-            ]
-        },
-        "break_importance": {
-            "id": "break_importance",
-            "title": "Why Breaks Matter for Eye Health",
-            "description": "Understand the importance of regular breaks.",
-            "content": """
-## The Power of Breaks
-
-Taking breaks is not a luxury—it's essential for eye health!
-
-### What Happens During Long Focus Sessions:
-- Eye muscles become fatigued (just like any muscle)
-- Accommodation (focusing ability) decreases
-- Blink rate drops
-- Eyes become dry and irritated
-- Overall vision becomes less sharp
-
-### Benefits of Regular Breaks:
-1. **Muscle Recovery**: Eye muscles relax and reset
-2. **Tear Production**: Eyes re-hydrate
-3. **Mental Refreshment**: Reduces mental fatigue
-4. **Better Focus**: When you return, you focus better
-5. **Improved Posture**: Prevents neck and back pain
-
-### Break Guidelines:
-
-#### Frequent Micro-Breaks:
-- Every 20 minutes: 20-second break (20-20-20 rule)
-- Look away from screen
-- Allow eyes to relax naturally
-
-#### Regular Breaks:
-- Every 1-2 hours: 5-10 minute break
-- Get up and walk
-- Do light stretching
-- Get some distance from screens
-
-#### Longer Breaks:
-- Every 4 hours: 15-30 minute break
-- Go outside (natural light is best)
-- Do activities that don't require screen use
-- Eat a healthy snack
-
-### Break Activities:
-✓ Look out a window
-✓ Walk around
-✓ Stretch (neck, shoulders, back)
-✓ Close eyes and rest
-✓ Play a non-screen game
-✓ Hydrate with water
-✓ Do light exercises
-
-### Remote Work Tips:
-- Set timers as reminders
-- Use break apps (like 20-20-20 timers)
-- Move your desk to vary scenery
-- Take lunch breaks away from your desk
-""",
-            "quiz_questions": [
-                {
-                    "question": "What is the 20-20-20 rule?",
-                    "options": [
-                        "Take 20 breaks of 20 minutes",
-                        "Every 20 minutes, look 20 feet away for 20 seconds",
-                        "Every 20 hours, rest for 20 minutes",
-                        "Use 20 glasses of water per day"
-                    ],
-                    "correct": 1
-                }
+    _summary: Optional[CompiledCatalog] = None
+    
+    @staticmethod
+    def get_summary() -> CompiledCatalog:
+        """Get the summary listing, built from the content index alone."""
+        store = get_content_store()
+        entries = store.list_entries()
+        summary = LearningService._summary
+        if summary is None or summary.version != store.version:
+            modules = [
+                LearningModuleSummary(id=entry.id, title=entry.title, description=entry.description)
+                for entry in entries
             ]
-        }
-    }
+            summary = CompiledCatalog(LearningModuleSummary, modules, store.version)
+            LearningService._summary = summary
+        return summary
     
     @staticmethod
     def get_all_modules() -> List[LearningModule]:
         """Get all learning modules."""
-        modules = []
-        for module_id, module_data in LearningService.MODULES.items():
-            modules.append(LearningModule(**module_data))
-        return modules
+        store = get_content_store()
+        return [store.get_module(entry.id) for entry in store.list_entries()]
     
     @staticmethod
     def get_module(module_id: str) -> LearningModule:
         """Get a specific module by ID."""
-        if module_id not in LearningService.MODULES:
-            raise ValueError(f"Module {module_id} not found")
+        return get_content_store().get_module(module_id)
+    
+    @staticmethod
+    def get_catalog_etag(language: str = SOURCE_LANGUAGE) -> str:
+        """ETag for the full listing, derived from the content index without loading bodies."""
+        signature = [(entry.id, entry.mtime) for entry in get_content_store().list_entries()]
+        return make_etag(repr((signature, language)).encode())
+    
+    @staticmethod
+    def iter_catalog_json(language: str = SOURCE_LANGUAGE) -> Iterator[bytes]:
+        """
+        The full listing as a JSON array, one module at a time.
         
-        module_data = LearningService.MODULES[module_id]
-        return LearningModule(**module_data)
+        Module bodies come from the content store's bounded LRU (and the
+        translated JSON from its own), so no copy of the whole catalog is
+        ever held in memory.
+        """
+        yield b"["
+        for i, entry in enumerate(get_content_store().list_entries()):
+            if i:
+                yield b","
+            localized = None
+            if language != SOURCE_LANGUAGE:
+                localized = LearningService.get_localized_module_json(entry.id, language)
+            body, _ = localized or LearningService.get_module_json(entry.id)
+            yield body
+        yield b"]"
+    
+    @staticmethod
+    def is_catalog_translated(language: str) -> bool:
+        """Whether every module is translated into language; queues whatever is missing."""
+        store = get_content_store()
+        entries = store.list_entries()
+        key = ("full", None, store.version, language)
+        if _localized_json.get(key) is None:
+            localized = [LearningService.get_localized_module_json(entry.id, language) for entry in entries]
+            if any(module is None for module in localized):
+                return False
+            _localized_json.set(key, True)
+        return True
+    
+    @staticmethod
+    def get_summary_json() -> Tuple[bytes, str]:
+        """Pre-encoded JSON for the module summaries and its ETag."""
+        summary = LearningService.get_summary()
+        return summary.body, summary.etag
+    
+    @staticmethod
+    def get_module_json(module_id: str) -> Tuple[bytes, str]:
+        """Pre-encoded JSON for one module and its ETag."""
+        return get_content_store().get_module_json(module_id)
+    
+    @staticmethod
+    def get_localized_summary_json(language: str) -> Optional[Tuple[bytes, str]]:
+        """Translated JSON for the module summaries, or None while translations are pending."""
+        store = get_content_store()
+        entries = store.list_entries()
+        
+        def build():
+            texts = [text for entry in entries for text in (entry.title, entry.description)]
+            translated = get_translations().localize(texts, language)
+            if translated is None:
+                return None
+            modules = [
+                LearningModuleSummary(id=entry.id, title=title, description=description)
+                for entry, title, description in zip(entries, translated[::2], translated[1::2])
+            ]
+            summary = CompiledCatalog(LearningModuleSummary, modules, store.version)
+            return summary.body, summary.etag
+        
+        return _get_localized(("summary", None, store.version, language), build)
+    
+    @staticmethod
+    def get_localized_module_json(module_id: str, language: str) -> Optional[Tuple[bytes, str]]:
+        """Translated JSON for one module, or None while translations are pending."""
+        module = LearningService.get_module(module_id)
+        
+        def build():
+            localized = LearningService.localize_module(module, language)
+            if localized is None:
+                return None
+            body = localized.model_dump_json().encode()
+            return body, make_etag(body)
+        
+        return _get_localized(("module", module_id, get_content_store().version, language), build)
+    
+    @staticmethod
+    def localize_module(module: LearningModule, language: str) -> Optional[LearningModule]:
+        """A module with its text translated, or None while translations are pending."""
+        translated = get_translations().localize(_module_texts(module), language)
+        if translated is None:
+            return None
+        
+        parts = iter(translated)
+        title, description, content = next(parts), next(parts), next(parts)
+        quiz_questions = None
+        if module.quiz_questions is not None:
+            quiz_questions = [
+                {
+                    **question,
+                    "question": next(parts),
+                    "options": [next(parts) for _ in question["options"]],
+                }
+                for question in module.quiz_questions
+            ]
+        return module.model_copy(update={
+            "title": title,
+            "description": description,
+            "content": content,
+            "quiz_questions": quiz_questions,
+        })
+    
+    @staticmethod
+    def request_translations(language: str) -> int:
+        """Queue every module's text for translation; returns how many strings were queued."""
+        translations = get_translations()
+        return sum(
+            translations.request(_module_texts(module), language)
+            for module in LearningService.get_all_modules()
+        )
     
     @staticmethod
     def check_quiz(
@@ -266,11 +179,8 @@ Taking breaks is not a luxury—it's essential for eye health!
         answers: List[int]
     ) -> QuizResult:
         """Check quiz answers and return result."""
-        if module_id not in LearningService.MODULES:
-            raise ValueError(f"Module {module_id} not found")
-        
-        module = LearningService.MODULES[module_id]
-        questions = module.get("quiz_questions", [])
+        module = LearningService.get_module(module_id)
+        questions = module.quiz_questions or []
         
         if not questions:
             raise ValueError(f"Module {module_id} has no quiz")
@@ -278,11 +188,15 @@ Taking breaks is not a luxury—it's essential for eye health!
         if len(answers) != len(questions):
             raise ValueError("Number of answers must match number of questions")
         
+        for number, (answer, question) in enumerate(zip(answers, questions), start=1):
+            if not 0 <= answer < len(question["options"]):
+                raise ValueError(f"Answer {number} must be an option index from 0 to {len(question['options']) - 1}")
+        
         # Calculate score
-        correct = 0
-        for i, answer in enumerate(answers):
-            if answer == questions[i]["correct"]:
-                correct += 1
+        question_results = [
+            answer == question["correct"] for answer, question in zip(answers, questions)
+        ]
+        correct = sum(question_results)
         
         score = int((correct / len(questions)) * 100)
         passed = score >= 70
@@ -301,5 +215,25 @@ Taking breaks is not a luxury—it's essential for eye health!
             module_id=module_id,
             score=score,
             passed=passed,
-            feedback=feedback
+            feedback=feedback,
+            question_results=question_results
         )
+
+
+def _module_texts(module: LearningModule) -> List[str]:
+    """Translatable strings of a module, in a fixed order."""
+    texts = [module.title, module.description, module.content]
+    for question in module.quiz_questions or []:
+        texts.append(question["question"])
+        texts.extend(question["options"])
+    return texts
+
+
+def _get_localized(key, build: Callable[[], Optional[Tuple[bytes, str]]]) -> Optional[Tuple[bytes, str]]:
+    """Cached translated JSON; incomplete translations are rebuilt on each call."""
+    cached = _localized_json.get(key)
+    if cached is None:
+        cached = build()
+        if cached is not None:
+            _localized_json.set(key, cached)
+    return cached
@@ -0,0 +1,186 @@
+"""Priority and per-user fair scheduling of upstream LLM calls."""
+import asyncio
+import math
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, Optional
+from app.core.config import settings
+from app.services.latency_tracker import percentile
+
+# Priority classes, served strictly in this order
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+PRIORITIES = (INTERACTIVE, BACKGROUND)
+
+# Queue waits kept per class for percentiles
+_WAIT_SAMPLES = 1000
+
+
+def estimate_cost(*texts: Optional[str]) -> int:
+    """Rough prompt size in tokens, used as the fair-queuing cost of a call."""
+    return max(1, sum(len(text) for text in texts if text) // 4)
+
+
+class _Waiter:
+    __slots__ = ("user_id", "cost", "future", "enqueued_at")
+
+    def __init__(self, user_id: str, cost: int, future: asyncio.Future):
+        self.user_id = user_id
+        self.cost = cost
+        self.future = future
+        self.enqueued_at = time.perf_counter()
+
+
+class _FairQueue:
+    """Deficit round robin over per-user FIFO queues."""
+
+    def __init__(self, quantum: int):
+        self.quantum = quantum
+        self._users: "OrderedDict[str, Deque[_Waiter]]" = OrderedDict()
+        self._deficit: Dict[str, int] = {}
+        self.size = 0
+
+    def push(self, waiter: _Waiter) -> None:
+        """Queue a waiter behind its user's earlier calls."""
+        if waiter.user_id not in self._users:
+            self._users[waiter.user_id] = deque()
+            self._deficit[waiter.user_id] = 0
+        self._users[waiter.user_id].append(waiter)
+        self.size += 1
+
+    def pop(self) -> Optional[_Waiter]:
+        """
+        Next waiter in DRR order.
+
+        Each user's turn adds one quantum to its deficit; it is served while
+        the deficit covers its next call's cost, so a user sending large
+        prompts gets the same token share as one sending many small ones.
+        """
+        while self._users:
+            user_id, waiters = next(iter(self._users.items()))
+            head = waiters[0]
+            if self._deficit[user_id] < head.cost:
+                # Skip whole rounds the user could not afford anyway
+                rounds = math.ceil((head.cost - self._deficit[user_id]) / self.quantum)
+                if len(self._users) == 1:
+                    self._deficit[user_id] += rounds * self.quantum
+                else:
+                    self._deficit[user_id] += self.quantum
+                    self._users.move_to_end(user_id)
+                    continue
+            self._deficit[user_id] -= head.cost
+            waiters.popleft()
+            self.size -= 1
+            if not waiters:
+                del self._users[user_id]
+                del self._deficit[user_id]
+            return head
+        return None
+
+    def remove(self, waiter: _Waiter) -> None:
+        """Drop a waiter whose caller gave up."""
+        waiters = self._users.get(waiter.user_id)
+        if waiters is None or waiter not in waiters:
+            return
+        waiters.remove(waiter)
+        self.size -= 1
+        if not waiters:
+            del self._users[waiter.user_id]
+            del self._deficit[waiter.user_id]
+
+
+class LLMScheduler:
+    """Admits provider calls into a fixed number of slots.
+
+    Interactive calls are always admitted before background ones, and
+    background calls may hold at most `background_limit` slots, so the
+    remaining slots stay free for chat arrivals and interactive wait does
+    not depend on how much batch work is queued. Within a class, users are
+    served by deficit round robin weighted by prompt size, so one heavy
+    user cannot starve the others.
+    """
+
+    def __init__(self, concurrency: int = 8, background_limit: int = 6, quantum: int = 500):
+        self.concurrency = concurrency
+        self.background_limit = min(background_limit, concurrency)
+        self._queues = {priority: _FairQueue(quantum) for priority in PRIORITIES}
+        self._running = {priority: 0 for priority in PRIORITIES}
+        self._waits = {priority: deque(maxlen=_WAIT_SAMPLES) for priority in PRIORITIES}
+        self._served = {priority: 0 for priority in PRIORITIES}
+
+    @asynccontextmanager
+    async def slot(self, user_id: str, priority: str = INTERACTIVE, cost: int = 1) -> AsyncIterator[None]:
+        """Hold a provider slot for the duration of the block."""
+        if priority not in self._queues:
+            raise ValueError(f"Unknown priority: {priority}")
+        waiter = _Waiter(user_id, cost, asyncio.get_running_loop().create_future())
+        self._queues[priority].push(waiter)
+        self._dispatch()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Granted just as the caller gave up; hand the slot on
+                self._release(priority)
+            else:
+                self._queues[priority].remove(waiter)
+            raise
+        try:
+            yield
+        finally:
+            self._release(priority)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Queue length, running calls and queue-wait percentiles per class."""
+        stats = {}
+        for priority in PRIORITIES:
+            waits = sorted(self._waits[priority])
+            stats[priority] = {
+                "queued": self._queues[priority].size,
+                "running": self._running[priority],
+                "served": self._served[priority],
+                "wait_p50_ms": round(percentile(waits, 0.50) * 1000, 2),
+                "wait_p95_ms": round(percentile(waits, 0.95) * 1000, 2),
+                "wait_max_ms": round((waits[-1] if waits else 0.0) * 1000, 2),
+            }
+        return stats
+
+    def _release(self, priority: str) -> None:
+        """Free a slot and admit whoever is next."""
+        self._running[priority] -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Fill free slots, interactive first."""
+        while sum(self._running.values()) < self.concurrency:
+            waiter = self._queues[INTERACTIVE].pop()
+            priority = INTERACTIVE
+            if waiter is None and self._running[BACKGROUND] < self.background_limit:
+                waiter = self._queues[BACKGROUND].pop()
+                priority = BACKGROUND
+            if waiter is None:
+                return
+            if waiter.future.cancelled():
+                # Its caller is still unwinding and will find it gone
+                continue
+            self._running[priority] += 1
+            self._served[priority] += 1
+            self._waits[priority].append(time.perf_counter() - waiter.enqueued_at)
+            waiter.future.set_result(None)
+
+
+# Singleton instance
+_llm_scheduler: Optional[LLMScheduler] = None
+
+
+def get_llm_scheduler() -> LLMScheduler:
+    """Get or create the LLM call scheduler."""
+    global _llm_scheduler
+    if _llm_scheduler is None:
+        _llm_scheduler = LLMScheduler(
+            concurrency=settings.llm_concurrency,
+            background_limit=settings.llm_background_concurrency,
+            quantum=settings.llm_fair_quantum
+        )
+    return _llm_scheduler
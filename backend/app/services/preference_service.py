@@ -1,7 +1,22 @@
 """Service for user preferences management."""
 from sqlmodel import Session, select
+from datetime import datetime, time
+from typing import List, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.db.session import dialect_insert
 from app.models import UserPreferences
 from app.schemas import UserPreferencesUpdate, UserPreferencesResponse
+from app.services.sync_service import SyncService
+
+# Detached preference rows keyed by user_id; invalidated on update.
+# The TTL bounds staleness when another worker applies the update.
+_preferences_cache = LRUCache(
+    "user_preferences",
+    maxsize=settings.preferences_cache_size,
+    ttl_seconds=settings.preferences_cache_ttl_seconds
+)
 
 
 class PreferenceService:
@@ -12,19 +27,30 @@ class PreferenceService:
         session: Session,
         user_id: str
     ) -> UserPreferences:
-        """Get user preferences or create defaults."""
-        statement = select(UserPreferences).where(
-            UserPreferences.user_id == user_id
-        )
-        preferences = session.exec(statement).first()
+        """
+        Get user preferences or create defaults, served from cache when available.
         
-        if not preferences:
-            preferences = UserPreferences(user_id=user_id)
-            session.add(preferences)
-            session.commit()
-            session.refresh(preferences)
-        
-        return preferences
+        The returned row is a detached, shared snapshot: read it, but make
+        changes through update_preferences.
+        """
+        return _preferences_cache.get_or_set(
+            user_id,
+            lambda: PreferenceService._snapshot(PreferenceService._load_or_create(session, user_id))
+        )
+    
+    @staticmethod
+    def get_cached_preferences(user_id: str) -> Optional[UserPreferences]:
+        """The cached preference snapshot, or None without touching the database."""
+        return _preferences_cache.get(user_id)
+    
+    @staticmethod
+    def find_preferences(session: Session, user_id: str) -> Optional[UserPreferences]:
+        """Cached or stored preferences, or None for a user without any; never creates a row."""
+        cached = _preferences_cache.get(user_id)
+        if cached is not None:
+            return cached
+        preferences = PreferenceService._select(session, user_id)
+        return PreferenceService._snapshot(preferences) if preferences is not None else None
     
     @staticmethod
     def update_preferences(
@@ -33,19 +59,78 @@ class PreferenceService:
         preferences_update: UserPreferencesUpdate
     ) -> UserPreferences:
         """Update user preferences."""
-        preferences = PreferenceService.get_or_create_preferences(session, user_id)
-        
         update_data = preferences_update.model_dump(exclude_unset=True)
+        PreferenceService._validate(update_data)
+        
+        preferences = PreferenceService._load_or_create(session, user_id)
+        
         for key, value in update_data.items():
             setattr(preferences, key, value)
         
-        preferences.updated_at = __import__('datetime').datetime.utcnow()
+        preferences.updated_at = datetime.utcnow()
         session.add(preferences)
+        SyncService.record(session, user_id, UserPreferences.__tablename__, [user_id])
         session.commit()
         session.refresh(preferences)
+        _preferences_cache.invalidate(user_id)
         
         return preferences
     
+    @staticmethod
+    def get_languages(session: Session) -> List[str]:
+        """Distinct content languages users have chosen."""
+        statement = select(UserPreferences.language).distinct()
+        return [language for language in session.exec(statement).all() if language]
+    
+    @staticmethod
+    def _load_or_create(session: Session, user_id: str) -> UserPreferences:
+        """
+        Load a user's row, inserting defaults first if there is none.
+        
+        The insert is ON CONFLICT DO NOTHING, so concurrent first requests
+        for a new user both succeed and read the same row.
+        """
+        preferences = PreferenceService._select(session, user_id)
+        if preferences is None:
+            defaults = UserPreferences(user_id=user_id).model_dump(exclude={"id"})
+            statement = dialect_insert(UserPreferences).values(**defaults).on_conflict_do_nothing(
+                index_elements=["user_id"]
+            )
+            if session.execute(statement).rowcount == 1:
+                SyncService.record(session, user_id, UserPreferences.__tablename__, [user_id])
+            session.commit()
+            preferences = PreferenceService._select(session, user_id)
+        return preferences
+    
+    @staticmethod
+    def _select(session: Session, user_id: str) -> Optional[UserPreferences]:
+        """Read a user's preference row."""
+        statement = select(UserPreferences).where(
+            UserPreferences.user_id == user_id
+        )
+        return session.exec(statement).first()
+    
+    @staticmethod
+    def _snapshot(preferences: UserPreferences) -> UserPreferences:
+        """Copy a row into an instance no session will expire or refresh."""
+        return UserPreferences(**preferences.model_dump())
+    
+    @staticmethod
+    def _validate(update_data: dict) -> None:
+        """Reject unknown time zones and malformed HH:MM times."""
+        if update_data.get("timezone"):
+            try:
+                ZoneInfo(update_data["timezone"])
+            except (ZoneInfoNotFoundError, ValueError):
+                raise ValueError(f"Unknown time zone: {update_data['timezone']}")
+        
+        for key in ("working_hours_start", "working_hours_end", "quiet_hours_start", "quiet_hours_end"):
+            if update_data.get(key):
+                try:
+                    time.fromisoformat(update_data[key])
+                except ValueError:
+                    raise ValueError(f"{key} must be in HH:MM format")
+    
     @staticmethod
     def get_reading_comfort_settings(
         session: Session,
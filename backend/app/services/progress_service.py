@@ -0,0 +1,174 @@
+"""Service for learning progress, quiz attempts and leaderboards."""
+from sqlalchemy import case, func, insert, or_
+from sqlmodel import Session, select
+from datetime import datetime
+from typing import List, Optional
+from app.db.session import dialect_insert
+from app.models import LearningProgress, LearningQuizAttempt
+from app.schemas import (
+    QuizResult,
+    LeaderboardEntry,
+    ModuleLeaderboard,
+    ModuleCompletionStats
+)
+from app.services.sync_service import SyncService
+
+
+class ProgressService:
+    """Service for per-(user, module) progress maintained by upsert."""
+
+    @staticmethod
+    def record_attempt(
+        session: Session,
+        user_id: str,
+        module_id: str,
+        module_title: str,
+        result: QuizResult
+    ) -> LearningProgress:
+        """
+        Append an attempt and fold it into the user's progress row.
+
+        The progress row keeps the best score, the attempt count and the
+        first time the quiz was passed; both writes share one transaction.
+        """
+        now = datetime.utcnow()
+        session.execute(insert(LearningQuizAttempt).values(
+            user_id=user_id,
+            module_id=module_id,
+            score=result.score,
+            passed=result.passed,
+            created_at=now
+        ))
+
+        statement = dialect_insert(LearningProgress).values(
+            user_id=user_id,
+            module_id=module_id,
+            module_title=module_title,
+            completed=result.passed,
+            quiz_score=result.score,
+            attempts=1,
+            created_at=now,
+            completed_at=now if result.passed else None,
+            last_attempt_at=now
+        )
+        excluded = statement.excluded
+        statement = statement.on_conflict_do_update(
+            index_elements=["user_id", "module_id"],
+            set_={
+                "module_title": excluded.module_title,
+                "quiz_score": case(
+                    (LearningProgress.quiz_score.is_(None), excluded.quiz_score),
+                    (excluded.quiz_score > LearningProgress.quiz_score, excluded.quiz_score),
+                    else_=LearningProgress.quiz_score
+                ),
+                "completed": or_(LearningProgress.completed, excluded.completed),
+                "completed_at": func.coalesce(LearningProgress.completed_at, excluded.completed_at),
+                "attempts": LearningProgress.attempts + 1,
+                "last_attempt_at": excluded.last_attempt_at,
+            }
+        )
+        session.execute(statement)
+        SyncService.record(session, user_id, LearningProgress.__tablename__, [module_id])
+        session.commit()
+
+        return ProgressService.get_progress(session, user_id, module_id)
+
+    @staticmethod
+    def get_progress(
+        session: Session,
+        user_id: str,
+        module_id: str
+    ) -> Optional[LearningProgress]:
+        """Get a user's progress row for one module."""
+        statement = select(LearningProgress).where(
+            LearningProgress.user_id == user_id,
+            LearningProgress.module_id == module_id
+        )
+        return session.exec(statement).first()
+
+    @staticmethod
+    def get_user_progress(session: Session, user_id: str) -> List[LearningProgress]:
+        """Get a user's progress rows, most recently started first."""
+        statement = select(LearningProgress).where(
+            LearningProgress.user_id == user_id
+        ).order_by(LearningProgress.created_at.desc())
+        return session.exec(statement).all()
+
+    @staticmethod
+    def get_attempts(
+        session: Session,
+        user_id: str,
+        module_id: str,
+        limit: int = 50
+    ) -> List[LearningQuizAttempt]:
+        """Get a user's most recent attempts at a module's quiz."""
+        statement = select(LearningQuizAttempt).where(
+            LearningQuizAttempt.user_id == user_id,
+            LearningQuizAttempt.module_id == module_id
+        ).order_by(LearningQuizAttempt.created_at.desc()).limit(limit)
+        return session.exec(statement).all()
+
+    @staticmethod
+    def get_leaderboard(
+        session: Session,
+        module_id: str,
+        limit: int = 10
+    ) -> ModuleLeaderboard:
+        """Top best scores for a module; ties go to whoever passed first."""
+        statement = select(
+            LearningProgress.user_id,
+            LearningProgress.quiz_score,
+            LearningProgress.attempts,
+            LearningProgress.completed_at
+        ).where(
+            LearningProgress.module_id == module_id,
+            LearningProgress.quiz_score.is_not(None)
+        ).order_by(
+            LearningProgress.quiz_score.desc(),
+            # Learners who never passed sort after those who did
+            LearningProgress.completed_at.is_(None),
+            LearningProgress.completed_at,
+            LearningProgress.attempts
+        ).limit(limit)
+
+        entries = [
+            LeaderboardEntry(
+                rank=rank,
+                user_id=user_id,
+                best_score=score,
+                attempts=attempts,
+                completed_at=completed_at
+            )
+            for rank, (user_id, score, attempts, completed_at)
+            in enumerate(session.execute(statement).all(), start=1)
+        ]
+        return ModuleLeaderboard(module_id=module_id, entries=entries)
+
+    @staticmethod
+    def get_completion_stats(
+        session: Session,
+        module_id: Optional[str] = None
+    ) -> List[ModuleCompletionStats]:
+        """Learner counts, completion rate and average best score per module."""
+        statement = select(
+            LearningProgress.module_id,
+            func.count(),
+            func.sum(case((LearningProgress.completed, 1), else_=0)),
+            func.avg(LearningProgress.quiz_score),
+            func.avg(LearningProgress.attempts)
+        ).group_by(LearningProgress.module_id).order_by(LearningProgress.module_id)
+        if module_id is not None:
+            statement = statement.where(LearningProgress.module_id == module_id)
+
+        return [
+            ModuleCompletionStats(
+                module_id=row_module_id,
+                learners=learners,
+                completed=int(completed or 0),
+                completion_rate=round(int(completed or 0) / learners, 4) if learners else 0.0,
+                avg_best_score=round(float(avg_score or 0), 2),
+                avg_attempts=round(float(avg_attempts or 0), 2)
+            )
+            for row_module_id, learners, completed, avg_score, avg_attempts
+            in session.execute(statement).all()
+        ]
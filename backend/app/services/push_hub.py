@@ -0,0 +1,153 @@
+"""Server-to-client push delivery for reminders and notifications."""
+import asyncio
+import itertools
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Hashable, Optional, Set
+from app.core.config import settings
+from app.schemas import ReminderEvent
+
+_message_ids = itertools.count()
+
+
+class PushConnection:
+    """A single client connection with a bounded outgoing queue.
+
+    When the queue is full the oldest pending message is dropped. Messages
+    published with a coalesce key replace any pending message with the same
+    key, so a slow client only ever sees the latest value.
+    """
+
+    __slots__ = ("user_id", "max_queue", "dropped", "closed", "_pending", "_ready")
+
+    def __init__(self, user_id: str, max_queue: int):
+        self.user_id = user_id
+        self.max_queue = max_queue
+        self.dropped = 0
+        self.closed = False
+        self._pending: "OrderedDict[Hashable, Dict[str, Any]]" = OrderedDict()
+        self._ready = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def offer(self, message: Dict[str, Any], coalesce_key: Optional[str] = None) -> None:
+        """Queue a message without blocking."""
+        key = coalesce_key if coalesce_key is not None else next(_message_ids)
+        if key in self._pending:
+            self._pending[key] = message
+            return
+        if len(self._pending) >= self.max_queue:
+            self._pending.popitem(last=False)
+            self.dropped += 1
+        self._pending[key] = message
+        self._ready.set()
+
+    def close(self) -> None:
+        """Mark the connection closed and wake any waiting reader."""
+        self.closed = True
+        self._ready.set()
+
+    async def get(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """Next queued message, or None on timeout or close."""
+        if not self._pending:
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                return None
+        if self.closed or not self._pending:
+            return None
+        _, message = self._pending.popitem(last=False)
+        return message
+
+
+class PushHub:
+    """Per-user registry of open connections with fan-out publishing.
+
+    Publishing is non-blocking and must happen on the event loop. The hub
+    is per process; clients connect to whichever worker serves them.
+
+    Events are not fanned out across workers. Reminder events come from
+    the reminder scheduler, which runs on the one worker with
+    REMINDER_SCHEDULER_ENABLED, so only clients connected to that worker
+    receive them; deploy push with a single worker (or route push
+    connections to the scheduler worker). `stats()` reports whether this
+    worker delivers reminders.
+    """
+
+    def __init__(self, max_queue: int = 100):
+        self.max_queue = max_queue
+        self._connections: Dict[str, Set[PushConnection]] = {}
+        self.published = 0
+        self.delivers_reminders = False
+
+    def connect(self, user_id: str) -> PushConnection:
+        """Register a new connection for a user."""
+        connection = PushConnection(user_id, self.max_queue)
+        self._connections.setdefault(user_id, set()).add(connection)
+        return connection
+
+    def disconnect(self, connection: PushConnection) -> None:
+        """Unregister and close a connection."""
+        connection.close()
+        connections = self._connections.get(connection.user_id)
+        if connections is None:
+            return
+        connections.discard(connection)
+        if not connections:
+            del self._connections[connection.user_id]
+
+    def publish(
+        self,
+        user_id: str,
+        event_type: str,
+        data: Optional[Dict[str, Any]] = None,
+        coalesce: bool = False
+    ) -> int:
+        """Queue an event for every connection of a user.
+
+        With coalesce=True a pending event of the same type is replaced
+        instead of queued again. Returns the number of connections reached.
+        """
+        connections = self._connections.get(user_id)
+        if not connections:
+            return 0
+        message = {
+            "type": event_type,
+            "data": data or {},
+            "sent_at": datetime.utcnow().isoformat(),
+        }
+        coalesce_key = event_type if coalesce else None
+        for connection in connections:
+            connection.offer(message, coalesce_key)
+        self.published += 1
+        return len(connections)
+
+    def publish_reminder(self, event: ReminderEvent) -> None:
+        """Scheduler listener that pushes due reminders to their owner."""
+        self.publish(event.user_id, "reminder", event.model_dump(mode="json"))
+
+    def stats(self) -> Dict[str, int]:
+        """Connection and delivery counters."""
+        connections = [c for conns in self._connections.values() for c in conns]
+        return {
+            "users": len(self._connections),
+            "connections": len(connections),
+            "queued": sum(len(c) for c in connections),
+            "dropped": sum(c.dropped for c in connections),
+            "published": self.published,
+            "delivers_reminders": self.delivers_reminders,
+        }
+
+
+# Singleton instance
+_push_hub: Optional[PushHub] = None
+
+
+def get_push_hub() -> PushHub:
+    """Get or create the push hub instance."""
+    global _push_hub
+    if _push_hub is None:
+        _push_hub = PushHub(max_queue=settings.push_queue_size)
+    return _push_hub
@@ -0,0 +1,230 @@
+"""Per-question quiz analytics, buffered in memory and flushed in batches."""
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Tuple
+from fastapi.concurrency import run_in_threadpool
+from sqlmodel import Session, select
+from app.db.session import dialect_insert, engine
+from app.models import QuizItemStats, QuizOptionCount
+from app.schemas import LearningModule, QuizAnalytics, QuizItemAnalytics
+
+logger = logging.getLogger(__name__)
+
+ITEM_SUMS = ("responses", "correct", "sum_total", "sum_total_sq", "sum_correct_total")
+
+# Below this many responses discrimination is too noisy to report
+MIN_DISCRIMINATION_RESPONSES = 10
+
+
+def quiz_version(questions: Optional[List[dict]]) -> str:
+    """
+    Hash of a quiz's questions and options.
+
+    Stable across workers and restarts, unlike the content store's version
+    counter, and unaffected by edits to the module text.
+    """
+    encoded = json.dumps(questions or [], sort_keys=True).encode()
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+class QuizAnalyticsBuffer:
+    """Accumulates per-question counters between flushes.
+
+    Recording is O(questions) in memory; a flush writes one upsert per
+    touched question and option, however many submissions arrived.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._items: Dict[Tuple[str, str, int], List[int]] = defaultdict(lambda: [0] * len(ITEM_SUMS))
+        self._options: Counter = Counter()
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def record(self, module_id: str, version: str, answers: List[int], question_results: List[bool]) -> None:
+        """Add one graded submission of a quiz version to the pending counters."""
+        total = sum(question_results)
+        with self._lock:
+            for index, (answer, correct) in enumerate(zip(answers, question_results)):
+                sums = self._items[(module_id, version, index)]
+                sums[0] += 1
+                sums[1] += correct
+                sums[2] += total
+                sums[3] += total * total
+                sums[4] += total if correct else 0
+                self._options[(module_id, version, index, answer)] += 1
+
+    def flush(self, session: Session) -> int:
+        """Write pending counters; returns the number of questions touched."""
+        with self._lock:
+            items, self._items = self._items, defaultdict(lambda: [0] * len(ITEM_SUMS))
+            options, self._options = self._options, Counter()
+        if not items:
+            return 0
+
+        try:
+            for (module_id, version, question_index), sums in items.items():
+                increments = dict(zip(ITEM_SUMS, sums))
+                statement = dialect_insert(QuizItemStats).values(
+                    module_id=module_id,
+                    question_index=question_index,
+                    quiz_version=version,
+                    **increments
+                )
+                statement = statement.on_conflict_do_update(
+                    index_elements=["module_id", "question_index", "quiz_version"],
+                    set_={
+                        name: getattr(QuizItemStats, name) + statement.excluded[name]
+                        for name in ITEM_SUMS
+                    }
+                )
+                session.execute(statement)
+
+            for (module_id, version, question_index, option_index), count in options.items():
+                statement = dialect_insert(QuizOptionCount).values(
+                    module_id=module_id,
+                    question_index=question_index,
+                    option_index=option_index,
+                    quiz_version=version,
+                    count=count
+                )
+                statement = statement.on_conflict_do_update(
+                    index_elements=["module_id", "question_index", "option_index", "quiz_version"],
+                    set_={"count": QuizOptionCount.count + statement.excluded.count}
+                )
+                session.execute(statement)
+
+            session.commit()
+        except Exception:
+            session.rollback()
+            self._merge_back(items, options)
+            raise
+        return len(items)
+
+    async def run(self, interval_seconds: float) -> None:
+        """Flush periodically until cancelled."""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            await run_in_threadpool(self._flush_logged)
+
+    def start(self, interval_seconds: float) -> None:
+        """Start the periodic flush as a background task."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run(interval_seconds))
+
+    async def stop(self) -> None:
+        """Cancel the periodic flush and write whatever is pending."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await run_in_threadpool(self._flush_logged)
+
+    def _flush_logged(self) -> None:
+        """Flush with a session of its own, logging failures."""
+        try:
+            with Session(engine) as session:
+                self.flush(session)
+        except Exception as e:
+            logger.error(f"Failed to flush quiz analytics: {e}")
+
+    def _merge_back(self, items: Dict[Tuple[str, str, int], List[int]], options: Counter) -> None:
+        """Return unwritten counters to the buffer for the next flush."""
+        with self._lock:
+            for key, sums in items.items():
+                pending = self._items[key]
+                for i, value in enumerate(sums):
+                    pending[i] += value
+            self._options.update(options)
+
+
+class QuizAnalyticsService:
+    """Service for reading per-question quiz analytics."""
+
+    @staticmethod
+    def get_analytics(session: Session, module: LearningModule) -> QuizAnalytics:
+        """Difficulty, discrimination and answer distribution per question."""
+        get_quiz_analytics().flush(session)
+
+        # Rows for other versions of the quiz describe other questions
+        version = quiz_version(module.quiz_questions)
+        item_rows = session.exec(
+            select(QuizItemStats).where(
+                QuizItemStats.module_id == module.id,
+                QuizItemStats.quiz_version == version
+            )
+        ).all()
+        stats = {row.question_index: row for row in item_rows}
+
+        option_rows = session.exec(
+            select(QuizOptionCount).where(
+                QuizOptionCount.module_id == module.id,
+                QuizOptionCount.quiz_version == version
+            )
+        ).all()
+        option_counts: Dict[Tuple[int, int], int] = {
+            (row.question_index, row.option_index): row.count for row in option_rows
+        }
+
+        items = []
+        for index, question in enumerate(module.quiz_questions or []):
+            row = stats.get(index)
+            responses = row.responses if row else 0
+            items.append(QuizItemAnalytics(
+                question_index=index,
+                question=question["question"],
+                responses=responses,
+                difficulty=round(row.correct / responses, 4) if responses else 0.0,
+                discrimination=_item_rest_correlation(row) if row else None,
+                option_counts=[
+                    option_counts.get((index, option), 0)
+                    for option in range(len(question["options"]))
+                ]
+            ))
+        return QuizAnalytics(module_id=module.id, items=items)
+
+
+def _item_rest_correlation(row: QuizItemStats) -> Optional[float]:
+    """
+    Pearson correlation between an item and the rest score, from running sums.
+
+    The rest score excludes the item itself (rest = total - x), so an item
+    is not correlated with its own contribution. With x in {0, 1}:
+    sum(rest) = T - C, sum(rest^2) = TT - 2XT + C and sum(x * rest) = XT - C.
+    """
+    n = row.responses
+    if n < MIN_DISCRIMINATION_RESPONSES:
+        return None
+    c = row.correct
+    sum_rest = row.sum_total - c
+    sum_rest_sq = row.sum_total_sq - 2 * row.sum_correct_total + c
+    sum_x_rest = row.sum_correct_total - c
+
+    covariance = n * sum_x_rest - c * sum_rest
+    variance_x = n * c - c * c
+    variance_rest = n * sum_rest_sq - sum_rest * sum_rest
+    if variance_x <= 0 or variance_rest <= 0:
+        return None
+    return round(covariance / math.sqrt(variance_x * variance_rest), 4)
+
+
+# Singleton instance
+_quiz_analytics: Optional[QuizAnalyticsBuffer] = None
+
+
+def get_quiz_analytics() -> QuizAnalyticsBuffer:
+    """Get or create the quiz analytics buffer."""
+    global _quiz_analytics
+    if _quiz_analytics is None:
+        _quiz_analytics = QuizAnalyticsBuffer()
+    return _quiz_analytics
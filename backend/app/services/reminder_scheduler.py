@@ -0,0 +1,264 @@
+"""Server-side reminder scheduling."""
+import asyncio
+import heapq
+import inspect
+import itertools
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, List, Optional, Union
+from fastapi.concurrency import run_in_threadpool
+from sqlmodel import Session, select
+from app.db.session import engine
+from app.models import EyeHealthReminder
+from app.schemas import ReminderEvent
+from app.services.reminder_service import ReminderService, next_fire_time
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on how long the run loop sleeps between checks
+MAX_SLEEP_SECONDS = 60.0
+
+ReminderListener = Callable[[ReminderEvent], Union[None, Awaitable[None]]]
+
+
+class _Entry:
+    """Heap entry for a scheduled reminder."""
+
+    __slots__ = ("fire_at", "seq", "reminder_id", "user_id", "reminder_type", "interval", "active")
+
+    def __init__(self, fire_at: float, seq: int, reminder_id: int, user_id: str,
+                 reminder_type: str, interval: float):
+        self.fire_at = fire_at
+        self.seq = seq
+        self.reminder_id = reminder_id
+        self.user_id = user_id
+        self.reminder_type = reminder_type
+        self.interval = interval
+        self.active = True
+
+    def __lt__(self, other: "_Entry") -> bool:
+        return (self.fire_at, self.seq) < (other.fire_at, other.seq)
+
+
+class ReminderScheduler:
+    """Min-heap of enabled reminders keyed by next fire time.
+
+    Schedule and unschedule are O(log n) and O(1); replaced entries are
+    deactivated in place and skipped when they surface (lazy deletion),
+    with a rebuild once stale entries outnumber live ones. Due events are
+    claimed in the database before dispatch, so several scheduling
+    workers never fire the same reminder twice.
+    """
+
+    def __init__(self):
+        self._heap: List[_Entry] = []
+        self._entries: Dict[int, _Entry] = {}
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._listeners: List[ReminderListener] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add_listener(self, listener: ReminderListener) -> None:
+        """Register a callback invoked for each due reminder."""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def load(self, session: Session) -> int:
+        """Schedule every enabled reminder from the database."""
+        ReminderService.backfill_schedule(session)
+        statement = select(EyeHealthReminder).where(EyeHealthReminder.is_enabled == True)  # noqa: E712
+        count = 0
+        for reminder in session.exec(statement):
+            self.sync(reminder)
+            count += 1
+        logger.info(f"Reminder scheduler loaded {count} reminders")
+        return count
+
+    def sync(self, reminder: EyeHealthReminder, now: Optional[datetime] = None) -> None:
+        """Schedule, reschedule or drop a reminder to match its database row."""
+        if not reminder.is_enabled:
+            self.unschedule(reminder.id)
+            return
+
+        now = now or datetime.utcnow()
+        fire_at = reminder.next_fire_at
+        if fire_at is None:
+            anchor = reminder.updated_at or reminder.created_at or now
+            fire_at = next_fire_time(anchor, reminder.interval_minutes, now)
+        self.schedule(
+            reminder.id,
+            reminder.user_id,
+            reminder.reminder_type,
+            reminder.interval_minutes,
+            fire_at
+        )
+
+    def schedule(
+        self,
+        reminder_id: int,
+        user_id: str,
+        reminder_type: str,
+        interval_minutes: int,
+        fire_at: datetime
+    ) -> None:
+        """Insert or replace a reminder's next fire time."""
+        entry = _Entry(
+            _to_timestamp(fire_at),
+            next(self._seq),
+            reminder_id,
+            user_id,
+            reminder_type,
+            interval_minutes * 60.0
+        )
+        with self._lock:
+            previous = self._entries.get(reminder_id)
+            if previous is not None:
+                previous.active = False
+            self._entries[reminder_id] = entry
+            heapq.heappush(self._heap, entry)
+            self._maybe_compact()
+        self._notify()
+
+    def unschedule(self, reminder_id: int) -> None:
+        """Remove a reminder from the schedule."""
+        with self._lock:
+            entry = self._entries.pop(reminder_id, None)
+            if entry is not None:
+                entry.active = False
+                self._maybe_compact()
+
+    def next_fire_at(self) -> Optional[datetime]:
+        """Earliest scheduled fire time, if any."""
+        with self._lock:
+            self._discard_stale()
+            if not self._heap:
+                return None
+            return _from_timestamp(self._heap[0].fire_at)
+
+    def pop_due(self, now: Optional[datetime] = None) -> List[ReminderEvent]:
+        """Collect reminders due at `now` and advance each by its interval."""
+        now_ts = _to_timestamp(now or datetime.utcnow())
+        events = []
+        with self._lock:
+            while self._heap and self._heap[0].fire_at <= now_ts:
+                entry = heapq.heappop(self._heap)
+                if not entry.active:
+                    continue
+                events.append(ReminderEvent(
+                    reminder_id=entry.reminder_id,
+                    user_id=entry.user_id,
+                    reminder_type=entry.reminder_type,
+                    fire_at=_from_timestamp(entry.fire_at)
+                ))
+                # Skip missed intervals rather than firing a burst of catch-up events
+                missed = int((now_ts - entry.fire_at) // entry.interval) + 1
+                entry.fire_at += missed * entry.interval
+                entry.seq = next(self._seq)
+                heapq.heappush(self._heap, entry)
+        return events
+
+    async def dispatch(self, events: List[ReminderEvent]) -> None:
+        """Deliver events to every listener, logging listener failures."""
+        for event in events:
+            for listener in self._listeners:
+                try:
+                    result = listener(event)
+                    if inspect.isawaitable(result):
+                        await result
+                except Exception as e:
+                    logger.error(f"Reminder listener failed for reminder {event.reminder_id}: {e}")
+
+    async def run(self) -> None:
+        """Fire due reminders until cancelled."""
+        self._wakeup = asyncio.Event()
+        while True:
+            now = datetime.utcnow()
+            events = self.pop_due(now)
+            if events:
+                events = await run_in_threadpool(_claim_events, events, now)
+            await self.dispatch(events)
+
+            next_at = self.next_fire_at()
+            delay = MAX_SLEEP_SECONDS
+            if next_at is not None:
+                delay = min(delay, max(0.0, (next_at - datetime.utcnow()).total_seconds()))
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> None:
+        """Start the run loop as a background task."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """Cancel the run loop."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _notify(self) -> None:
+        """Wake the run loop so it re-reads the earliest fire time."""
+        if self._wakeup is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if loop is not None:
+            self._wakeup.set()
+
+    def _discard_stale(self) -> None:
+        """Pop deactivated entries off the top of the heap."""
+        while self._heap and not self._heap[0].active:
+            heapq.heappop(self._heap)
+
+    def _maybe_compact(self) -> None:
+        """Rebuild the heap once stale entries outnumber live ones."""
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._heap = [entry for entry in self._heap if entry.active]
+            heapq.heapify(self._heap)
+
+
+def _claim_events(events: List[ReminderEvent], now: datetime) -> List[ReminderEvent]:
+    """Persist fires and keep only events this worker claimed first."""
+    try:
+        with Session(engine) as session:
+            return ReminderService.claim_ids(session, [e.reminder_id for e in events], now)
+    except Exception as e:
+        logger.error(f"Failed to claim due reminders: {e}")
+        return []
+
+
+def _to_timestamp(value: datetime) -> float:
+    """POSIX timestamp of a naive UTC datetime."""
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+def _from_timestamp(value: float) -> datetime:
+    """Naive UTC datetime from a POSIX timestamp."""
+    return datetime.fromtimestamp(value, tz=timezone.utc).replace(tzinfo=None)
+
+
+# Singleton instance
+_scheduler: Optional[ReminderScheduler] = None
+
+
+def get_reminder_scheduler() -> ReminderScheduler:
+    """Get or create the reminder scheduler instance."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = ReminderScheduler()
+    return _scheduler
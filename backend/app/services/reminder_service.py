@@ -0,0 +1,339 @@
+"""Service for reminder scheduling state."""
+from sqlalchemy import delete, update
+from sqlmodel import Session, select
+from datetime import datetime, time, timedelta, timezone
+from typing import Iterable, Iterator, List, Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+import heapq
+import itertools
+from app.models import EyeHealthReminder, UserPreferences
+from app.schemas import (
+    ReminderEvent,
+    ReminderOccurrence,
+    ReminderTemplate,
+    ReminderFilter,
+    ReminderUpdate
+)
+from app.services.sync_service import SyncService, DELETE
+
+# Standard reminder bundle, by template name
+REMINDER_TEMPLATES = {
+    "20-20-20": ReminderTemplate(name="20-20-20", reminder_type="20-20-20", interval_minutes=20),
+    "hydration": ReminderTemplate(name="hydration", reminder_type="Hydration", interval_minutes=60),
+    "posture": ReminderTemplate(name="posture", reminder_type="Posture Check", interval_minutes=30),
+    "blink": ReminderTemplate(name="blink", reminder_type="Blink Exercise", interval_minutes=15),
+}
+
+
+def next_fire_time(anchor: datetime, interval_minutes: int, now: datetime) -> datetime:
+    """First time after `now` on the interval grid starting at `anchor`."""
+    interval = timedelta(minutes=interval_minutes)
+    if anchor > now:
+        return anchor
+    elapsed = now - anchor
+    return anchor + (elapsed // interval + 1) * interval
+
+
+def parse_time_window(start: Optional[str], end: Optional[str]) -> Optional[Tuple[time, time]]:
+    """Parse an HH:MM-HH:MM window; None if unset or malformed."""
+    if not start or not end:
+        return None
+    try:
+        return time.fromisoformat(start), time.fromisoformat(end)
+    except ValueError:
+        return None
+
+
+def in_time_window(value: time, window: Tuple[time, time]) -> bool:
+    """Whether a local time falls in a window, which may wrap past midnight."""
+    start, end = window
+    if start <= end:
+        return start <= value < end
+    return value >= start or value < end
+
+
+def get_zone(name: Optional[str]) -> ZoneInfo:
+    """Resolve an IANA time zone name, falling back to UTC."""
+    try:
+        return ZoneInfo(name or "UTC")
+    except (ZoneInfoNotFoundError, ValueError):
+        return ZoneInfo("UTC")
+
+
+class ReminderService:
+    """Service for maintaining and claiming reminder fire times."""
+
+    @staticmethod
+    def reset_schedule(reminder: EyeHealthReminder, now: Optional[datetime] = None) -> None:
+        """Set next_fire_at after a create or update; disabled reminders get none."""
+        now = now or datetime.utcnow()
+        if reminder.is_enabled:
+            reminder.next_fire_at = now + timedelta(minutes=reminder.interval_minutes)
+        else:
+            reminder.next_fire_at = None
+
+    @staticmethod
+    def apply_templates(
+        session: Session,
+        user_id: str,
+        names: Optional[List[str]] = None,
+        skip_existing: bool = True
+    ) -> List[EyeHealthReminder]:
+        """Create reminders from templates in a single transaction."""
+        names = names or list(REMINDER_TEMPLATES)
+        unknown = [name for name in names if name not in REMINDER_TEMPLATES]
+        if unknown:
+            raise ValueError(
+                f"Unknown templates: {', '.join(unknown)}. Supported: {', '.join(REMINDER_TEMPLATES)}"
+            )
+        
+        existing = set()
+        if skip_existing:
+            statement = select(EyeHealthReminder.reminder_type).where(
+                EyeHealthReminder.user_id == user_id
+            )
+            existing = set(session.exec(statement).all())
+        
+        now = datetime.utcnow()
+        reminders = []
+        for name in dict.fromkeys(names):
+            template = REMINDER_TEMPLATES[name]
+            if template.reminder_type in existing:
+                continue
+            reminder = EyeHealthReminder(
+                user_id=user_id,
+                reminder_type=template.reminder_type,
+                interval_minutes=template.interval_minutes,
+                use_browser_notification=template.use_browser_notification,
+                notification_sound=template.notification_sound,
+                created_at=now,
+                updated_at=now
+            )
+            ReminderService.reset_schedule(reminder, now)
+            reminders.append(reminder)
+        
+        session.add_all(reminders)
+        session.flush()
+        ids = [reminder.id for reminder in reminders]
+        SyncService.record(session, user_id, EyeHealthReminder.__tablename__, ids)
+        session.commit()
+        return ReminderService._reload(session, ids)
+
+    @staticmethod
+    def bulk_update(
+        session: Session,
+        user_id: str,
+        reminder_filter: ReminderFilter,
+        reminder_update: ReminderUpdate
+    ) -> List[EyeHealthReminder]:
+        """Apply one update to every matching reminder in a single transaction."""
+        update_data = reminder_update.model_dump(exclude_unset=True)
+        if update_data.get("interval_minutes") is not None and update_data["interval_minutes"] < 1:
+            raise ValueError("Interval must be at least 1 minute")
+        
+        reminders = session.exec(ReminderService._filtered(user_id, reminder_filter)).all()
+        now = datetime.utcnow()
+        for reminder in reminders:
+            for key, value in update_data.items():
+                setattr(reminder, key, value)
+            reminder.updated_at = now
+            if "interval_minutes" in update_data or "is_enabled" in update_data:
+                ReminderService.reset_schedule(reminder, now)
+            session.add(reminder)
+        
+        ids = [reminder.id for reminder in reminders]
+        SyncService.record(session, user_id, EyeHealthReminder.__tablename__, ids)
+        session.commit()
+        return ReminderService._reload(session, ids)
+
+    @staticmethod
+    def bulk_delete(
+        session: Session,
+        user_id: str,
+        reminder_filter: ReminderFilter
+    ) -> List[int]:
+        """Delete every matching reminder with one statement; returns their ids."""
+        statement = ReminderService._filtered(user_id, reminder_filter).with_only_columns(
+            EyeHealthReminder.id
+        )
+        ids = list(session.exec(statement).all())
+        if ids:
+            session.execute(delete(EyeHealthReminder).where(EyeHealthReminder.id.in_(ids)))
+            SyncService.record(session, user_id, EyeHealthReminder.__tablename__, ids, DELETE)
+            session.commit()
+        return ids
+
+    @staticmethod
+    def _reload(session: Session, ids: List[int]) -> List[EyeHealthReminder]:
+        """Refresh reminders expired by a commit with a single SELECT."""
+        if not ids:
+            return []
+        statement = select(EyeHealthReminder).where(
+            EyeHealthReminder.id.in_(ids)
+        ).order_by(EyeHealthReminder.id)
+        return list(session.exec(statement).all())
+
+    @staticmethod
+    def _filtered(user_id: str, reminder_filter: ReminderFilter):
+        """SELECT of a user's reminders matching a bulk filter."""
+        statement = select(EyeHealthReminder).where(EyeHealthReminder.user_id == user_id)
+        if reminder_filter.ids is not None:
+            statement = statement.where(EyeHealthReminder.id.in_(reminder_filter.ids))
+        if reminder_filter.reminder_types is not None:
+            statement = statement.where(EyeHealthReminder.reminder_type.in_(reminder_filter.reminder_types))
+        if reminder_filter.is_enabled is not None:
+            statement = statement.where(EyeHealthReminder.is_enabled == reminder_filter.is_enabled)
+        return statement.order_by(EyeHealthReminder.id)
+
+    @staticmethod
+    def backfill_schedule(session: Session, now: Optional[datetime] = None) -> int:
+        """Give enabled reminders created before next_fire_at existed a fire time."""
+        now = now or datetime.utcnow()
+        statement = select(EyeHealthReminder).where(
+            EyeHealthReminder.is_enabled == True,  # noqa: E712
+            EyeHealthReminder.next_fire_at == None  # noqa: E711
+        )
+        count = 0
+        for reminder in session.exec(statement).all():
+            anchor = reminder.updated_at or reminder.created_at or now
+            reminder.next_fire_at = next_fire_time(anchor, reminder.interval_minutes, now)
+            session.add(reminder)
+            count += 1
+        if count:
+            session.commit()
+        return count
+
+    @staticmethod
+    def claim_due(
+        session: Session,
+        now: Optional[datetime] = None,
+        limit: int = 500
+    ) -> List[ReminderEvent]:
+        """
+        Claim reminders due at `now` and advance their next fire time.
+
+        Uses the partial due-reminder index. Safe to call from several
+        workers: each due row is claimed by exactly one caller.
+        """
+        now = now or datetime.utcnow()
+        statement = select(EyeHealthReminder).where(
+            EyeHealthReminder.is_enabled == True,  # noqa: E712
+            EyeHealthReminder.next_fire_at <= now
+        ).order_by(EyeHealthReminder.next_fire_at).limit(limit)
+        return ReminderService._claim(session, session.exec(statement).all(), now)
+
+    @staticmethod
+    def claim_ids(
+        session: Session,
+        reminder_ids: Iterable[int],
+        now: Optional[datetime] = None
+    ) -> List[ReminderEvent]:
+        """Claim specific reminders if they are still due at `now`."""
+        now = now or datetime.utcnow()
+        reminder_ids = list(reminder_ids)
+        if not reminder_ids:
+            return []
+        statement = select(EyeHealthReminder).where(
+            EyeHealthReminder.id.in_(reminder_ids),
+            EyeHealthReminder.is_enabled == True,  # noqa: E712
+            EyeHealthReminder.next_fire_at <= now
+        )
+        return ReminderService._claim(session, session.exec(statement).all(), now)
+
+    @staticmethod
+    def _claim(
+        session: Session,
+        candidates: List[EyeHealthReminder],
+        now: datetime
+    ) -> List[ReminderEvent]:
+        """Advance each candidate with a compare-and-set on next_fire_at."""
+        events = []
+        for reminder in candidates:
+            due_at = reminder.next_fire_at
+            statement = update(EyeHealthReminder).where(
+                EyeHealthReminder.id == reminder.id,
+                EyeHealthReminder.next_fire_at == due_at
+            ).values(
+                last_fired_at=now,
+                next_fire_at=next_fire_time(due_at, reminder.interval_minutes, now)
+            )
+            # Another worker advanced the row first if nothing matched
+            if session.execute(statement).rowcount == 1:
+                events.append(ReminderEvent(
+                    reminder_id=reminder.id,
+                    user_id=reminder.user_id,
+                    reminder_type=reminder.reminder_type,
+                    fire_at=due_at
+                ))
+        session.commit()
+        return events
+
+    @staticmethod
+    def get_calendar(
+        session: Session,
+        user_id: str,
+        preferences: UserPreferences,
+        limit: int = 50,
+        horizon_days: int = 7,
+        now: Optional[datetime] = None
+    ) -> List[ReminderOccurrence]:
+        """Next fire times across all of a user's enabled reminders."""
+        statement = select(EyeHealthReminder).where(
+            EyeHealthReminder.user_id == user_id,
+            EyeHealthReminder.is_enabled == True  # noqa: E712
+        )
+        reminders = session.exec(statement).all()
+        return list(itertools.islice(
+            ReminderService.iter_calendar(reminders, preferences, now or datetime.utcnow(), horizon_days),
+            limit
+        ))
+
+    @staticmethod
+    def iter_calendar(
+        reminders: Iterable[EyeHealthReminder],
+        preferences: UserPreferences,
+        now: datetime,
+        horizon_days: int
+    ) -> Iterator[ReminderOccurrence]:
+        """Lazily merge each reminder's clipped fire times into one sorted stream."""
+        zone = get_zone(preferences.timezone)
+        working = parse_time_window(preferences.working_hours_start, preferences.working_hours_end)
+        quiet = parse_time_window(preferences.quiet_hours_start, preferences.quiet_hours_end)
+        until = now + timedelta(days=horizon_days)
+
+        streams = [
+            ReminderService._iter_occurrences(reminder, now, until, zone, working, quiet)
+            for reminder in reminders
+        ]
+        return heapq.merge(*streams, key=lambda occurrence: occurrence.fire_at)
+
+    @staticmethod
+    def _iter_occurrences(
+        reminder: EyeHealthReminder,
+        now: datetime,
+        until: datetime,
+        zone: ZoneInfo,
+        working: Optional[Tuple[time, time]],
+        quiet: Optional[Tuple[time, time]]
+    ) -> Iterator[ReminderOccurrence]:
+        """Fire times of one reminder inside working hours and outside quiet hours."""
+        interval = timedelta(minutes=reminder.interval_minutes)
+        fire_at = reminder.next_fire_at or now + interval
+        if fire_at < now:
+            fire_at = next_fire_time(fire_at, reminder.interval_minutes, now)
+
+        while fire_at <= until:
+            local = fire_at.replace(tzinfo=timezone.utc).astimezone(zone)
+            local_time = local.time()
+            if (working is None or in_time_window(local_time, working)) and (
+                quiet is None or not in_time_window(local_time, quiet)
+            ):
+                yield ReminderOccurrence(
+                    reminder_id=reminder.id,
+                    reminder_type=reminder.reminder_type,
+                    fire_at=fire_at,
+                    local_time=local,
+                    use_browser_notification=reminder.use_browser_notification,
+                    notification_sound=reminder.notification_sound
+                )
+            fire_at += interval
@@ -0,0 +1,266 @@
+"""Near-duplicate cache of chat responses using MinHash LSH."""
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, NamedTuple, Optional, Tuple
+import numpy as np
+from app.schemas import AIResponse
+
+# Signature length = bands * rows. With 16 bands of 4 rows, two prompts
+# share a bucket with probability 1 - (1 - J^4)^16: ~50% at Jaccard 0.5,
+# ~87% at 0.6 and ~99.6% at 0.8. Candidates are then checked exactly.
+LSH_BANDS = 16
+LSH_ROWS = 4
+
+_MASK64 = np.uint64(0xFFFFFFFFFFFFFFFF)
+_rng = np.random.default_rng(20240)
+# Odd multipliers give a family of universal hashes over 64-bit words
+_MULTIPLIERS = _rng.integers(1, 2**63, LSH_BANDS * LSH_ROWS, dtype=np.uint64) | np.uint64(1)
+_OFFSETS = _rng.integers(0, 2**63, LSH_BANDS * LSH_ROWS, dtype=np.uint64)
+
+_TOKEN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+# Negations collapse to one marker; prompts only match others of the same
+# polarity, so "should I use drops" never answers "should I not use drops"
+NEGATION = "not"
+NEGATIONS = frozenset("""
+not no never without nothing dont don't doesnt doesn't isnt isn't cant can't
+cannot shouldnt shouldn't wont won't
+""".split())
+
+STOPWORDS = frozenset("""
+a about after all also am an and any are as at be been being but by can could
+day do does doing for from get getting got had has have how i i'm if in into is
+it it's its just lot me my of on or our really so some that that's the their them then there
+these they this to too very was we what what's when which while who why will with would
+you your
+""".split())
+
+# Domain paraphrases mapped onto one canonical term
+SYNONYMS = {
+    "sore": "hurt", "ache": "hurt", "aching": "hurt", "achy": "hurt", "pain": "hurt",
+    "painful": "hurt", "hurting": "hurt", "hurts": "hurt", "strain": "hurt", "strained": "hurt",
+    "tired": "fatigue", "exhausted": "fatigue", "fatigued": "fatigue",
+    "programming": "code", "coding": "code", "developing": "code", "development": "code",
+    "computer": "screen", "monitor": "screen", "display": "screen", "laptop": "screen",
+    "pc": "screen", "screens": "screen",
+    "smartphone": "phone", "mobile": "phone",
+    "dryness": "dry", "itchy": "dry", "gritty": "dry",
+    "eyes": "eye",
+    "breaks": "break", "rest": "break", "pause": "break",
+    "lighting": "light", "lights": "light", "lamp": "light", "brightness": "light",
+    "evening": "night", "late": "night",
+    "blurry": "blur", "blurred": "blur", "blurriness": "blur",
+    "reading": "read", "reads": "read",
+    "working": "work", "job": "work", "office": "work",
+    "tips": "tip", "advice": "tip", "suggestions": "tip", "recommendations": "tip",
+    "prevent": "reduce", "avoid": "reduce", "lower": "reduce",
+}
+
+
+def shingles(text: str) -> FrozenSet[str]:
+    """Canonical words and word bigrams of a prompt."""
+    words = []
+    for token in _TOKEN.findall(text.lower()):
+        if token in STOPWORDS:
+            continue
+        token = NEGATION if token in NEGATIONS else SYNONYMS.get(token, token)
+        if len(token) > 4 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        words.append(token)
+    return frozenset(words + [f"{a} {b}" for a, b in zip(words, words[1:])])
+
+
+def minhash(features: FrozenSet[str]) -> np.ndarray:
+    """MinHash signature: the minimum of each hash function over the features."""
+    hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(f.encode(), digest_size=8).digest(), "little") for f in features),
+        dtype=np.uint64,
+        count=len(features)
+    )
+    # uint64 arithmetic wraps, i.e. computes (a * x + b) mod 2^64
+    with np.errstate(over="ignore"):
+        permuted = (hashes[:, None] * _MULTIPLIERS + _OFFSETS) & _MASK64
+    return permuted.min(axis=0)
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    """Exact Jaccard similarity of two shingle sets."""
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class _Entry(NamedTuple):
+    scope: str
+    features: FrozenSet[str]
+    bucket_keys: Tuple[Tuple[int, bytes], ...]
+    response: AIResponse
+    expires_at: Optional[float]
+
+
+class SemanticCache:
+    """Bounded LRU index from prompts to responses, matched by near-duplicate text.
+
+    Prompts are reduced to shingle sets, MinHash signatures are split into
+    LSH bands, and only entries sharing a band bucket with the query are
+    compared by exact Jaccard similarity. Entries are partitioned by scope
+    so a response is only reused for the same personal context.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 2000,
+        ttl_seconds: Optional[float] = None,
+        threshold: float = 0.6
+    ):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self.threshold = threshold
+        self._entries: "OrderedDict[int, _Entry]" = OrderedDict()
+        self._buckets: Dict[Tuple[int, bytes], set] = {}
+        self._exact: Dict[Tuple[str, FrozenSet[str]], int] = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self.exact_hits = 0
+        self.near_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lookup_seconds = 0.0
+        self._lookups = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, prompt: str, scope: str = "") -> Optional[AIResponse]:
+        """The cached response for the most similar prompt at or above the threshold."""
+        started = time.perf_counter()
+        features = shingles(prompt)
+        with self._lock:
+            response = self._find(scope, features) if features else None
+            if response is None:
+                self.misses += 1
+            self._lookup_seconds += time.perf_counter() - started
+            self._lookups += 1
+        return response
+
+    def set(self, prompt: str, response: AIResponse, scope: str = "") -> None:
+        """Index a prompt and its response, evicting the least recently used entry if full."""
+        features = shingles(prompt)
+        if not features:
+            return
+        bucket_keys = _bucket_keys(minhash(features))
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+        with self._lock:
+            previous = self._exact.get((scope, features))
+            if previous is not None:
+                self._remove(previous)
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = _Entry(scope, features, bucket_keys, response, expires_at)
+            self._exact[(scope, features)] = entry_id
+            for key in bucket_keys:
+                self._buckets.setdefault(key, set()).add(entry_id)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all entries and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self._buckets.clear()
+            self._exact.clear()
+            self.exact_hits = self.near_hits = self.misses = self.evictions = 0
+            self._lookup_seconds = 0.0
+            self._lookups = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Size, hit-ratio split into exact and near-duplicate hits, and lookup cost."""
+        hits = self.exact_hits + self.near_hits
+        lookups = hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl_seconds,
+            "threshold": self.threshold,
+            "exact_hits": self.exact_hits,
+            "near_hits": self.near_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            "near_hit_ratio": round(self.near_hits / lookups, 4) if lookups else 0.0,
+            "avg_lookup_us": round(self._lookup_seconds / self._lookups * 1e6, 2) if self._lookups else 0.0,
+        }
+
+    def _find(self, scope: str, features: FrozenSet[str]) -> Optional[AIResponse]:
+        """Exact shingle match first, then the best LSH candidate. Caller holds the lock."""
+        entry_id = self._exact.get((scope, features))
+        if entry_id is not None and self._is_live(entry_id):
+            self.exact_hits += 1
+            self._entries.move_to_end(entry_id)
+            return self._entries[entry_id].response
+
+        candidates = set()
+        for key in _bucket_keys(minhash(features)):
+            candidates.update(self._buckets.get(key, ()))
+
+        best_id, best_similarity = None, self.threshold
+        for candidate in candidates:
+            entry = self._entries[candidate]
+            if entry.scope != scope or (NEGATION in entry.features) != (NEGATION in features):
+                continue
+            if not self._is_live(candidate):
+                continue
+            similarity = jaccard(features, entry.features)
+            if similarity >= best_similarity:
+                best_id, best_similarity = candidate, similarity
+        if best_id is None:
+            return None
+        self.near_hits += 1
+        self._entries.move_to_end(best_id)
+        return self._entries[best_id].response
+
+    def _is_live(self, entry_id: int) -> bool:
+        """Whether an entry is still within its TTL; expired entries are removed."""
+        expires_at = self._entries[entry_id].expires_at
+        if expires_at is None or expires_at > time.monotonic():
+            return True
+        self._remove(entry_id)
+        return False
+
+    def _remove(self, entry_id: int) -> None:
+        """Drop an entry from the LRU order, the exact index and its buckets."""
+        entry = self._entries.pop(entry_id)
+        if self._exact.get((entry.scope, entry.features)) == entry_id:
+            del self._exact[(entry.scope, entry.features)]
+        for key in entry.bucket_keys:
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(entry_id)
+                if not bucket:
+                    del self._buckets[key]
+
+
+def _bucket_keys(signature: np.ndarray) -> Tuple[Tuple[int, bytes], ...]:
+    """One (band, band-hash) bucket key per LSH band."""
+    return tuple(
+        (band, signature[band * LSH_ROWS:(band + 1) * LSH_ROWS].tobytes())
+        for band in range(LSH_BANDS)
+    )
+
+
+def context_scope(context: Optional[Dict[str, Any]]) -> str:
+    """
+    Partition key for a chat context.
+
+    Personal context (habits, preferences) changes what a good answer is
+    and must not leak between users, so it is part of the key; the time of
+    day is left out.
+    """
+    if not context:
+        return ""
+    items = sorted((k, str(v)) for k, v in context.items() if k != "time_of_day")
+    return hashlib.sha256(repr(items).encode()).hexdigest()[:16] if items else ""
@@ -0,0 +1,159 @@
+"""Service for the per-user change feed used by delta sync."""
+from sqlalchemy import insert
+from sqlmodel import Session, select
+from datetime import datetime
+from typing import Dict, Iterable, Tuple
+from app.db.session import dialect_insert
+from app.models import (
+    ChangeLogEntry,
+    HabitLog,
+    EyeHealthReminder,
+    UserPreferences,
+    LearningProgress,
+    SyncVersion
+)
+from app.schemas import (
+    HabitLogResponse,
+    ReminderResponse,
+    UserPreferencesResponse,
+    LearningProgressResponse,
+    SyncChange,
+    SyncChanges
+)
+
+UPSERT = "upsert"
+DELETE = "delete"
+
+# Synced entities: model, key column, key type and response schema
+ENTITIES = {
+    HabitLog.__tablename__: (HabitLog, "id", int, HabitLogResponse),
+    EyeHealthReminder.__tablename__: (EyeHealthReminder, "id", int, ReminderResponse),
+    UserPreferences.__tablename__: (UserPreferences, "user_id", str, UserPreferencesResponse),
+    LearningProgress.__tablename__: (LearningProgress, "module_id", str, LearningProgressResponse),
+}
+
+
+class SyncService:
+    """Service for recording and reading per-user changes."""
+
+    @staticmethod
+    def record(
+        session: Session,
+        user_id: str,
+        entity: str,
+        keys: Iterable,
+        operation: str = UPSERT
+    ) -> None:
+        """
+        Append changes in the caller's transaction; the caller commits.
+
+        Scheduler fire-time updates are not recorded: they are derived on
+        the server and would otherwise add a change every interval.
+        """
+        keys = [str(key) for key in keys]
+        if not keys:
+            return
+        last = SyncService._reserve_versions(session, user_id, len(keys))
+        now = datetime.utcnow()
+        rows = [
+            {
+                "user_id": user_id,
+                "version": version,
+                "entity": entity,
+                "entity_key": key,
+                "operation": operation,
+                "created_at": now,
+            }
+            for version, key in enumerate(keys, start=last - len(keys) + 1)
+        ]
+        session.execute(insert(ChangeLogEntry), rows)
+
+    @staticmethod
+    def get_version(session: Session, user_id: str) -> int:
+        """Latest version for a user, or 0 if nothing was recorded."""
+        statement = select(SyncVersion.version).where(SyncVersion.user_id == user_id)
+        return session.exec(statement).first() or 0
+
+    @staticmethod
+    def get_changes(
+        session: Session,
+        user_id: str,
+        since: int,
+        limit: int = 500
+    ) -> SyncChanges:
+        """
+        Changes after `since`, collapsed to the latest operation per row.
+
+        Upserts carry the row's current state, so replaying a page is
+        idempotent. A row deleted after its last logged upsert is reported
+        as a delete.
+        """
+        statement = select(ChangeLogEntry).where(
+            ChangeLogEntry.user_id == user_id,
+            ChangeLogEntry.version > since
+        ).order_by(ChangeLogEntry.version).limit(limit + 1)
+        entries = session.exec(statement).all()
+        has_more = len(entries) > limit
+        entries = entries[:limit]
+
+        latest: Dict[Tuple[str, str], str] = {}
+        for entry in entries:
+            key = (entry.entity, entry.entity_key)
+            latest.pop(key, None)
+            latest[key] = entry.operation
+
+        rows = SyncService._load_rows(session, user_id, [
+            key for key, operation in latest.items() if operation == UPSERT
+        ])
+
+        changes = []
+        for (entity, entity_key), operation in latest.items():
+            data = rows.get((entity, entity_key)) if operation == UPSERT else None
+            changes.append(SyncChange(
+                entity=entity,
+                key=entity_key,
+                operation=operation if data is not None else DELETE,
+                data=data
+            ))
+
+        return SyncChanges(
+            version=entries[-1].version if entries else since,
+            has_more=has_more,
+            changes=changes
+        )
+
+    @staticmethod
+    def _reserve_versions(session: Session, user_id: str, count: int) -> int:
+        """
+        Advance a user's version counter by count; returns the new value.
+
+        The upsert locks the counter row until the caller commits, so a
+        second writer for the same user waits and always takes, and
+        publishes, the higher versions.
+        """
+        statement = dialect_insert(SyncVersion).values(user_id=user_id, version=count)
+        statement = statement.on_conflict_do_update(
+            index_elements=["user_id"],
+            set_={"version": SyncVersion.version + count}
+        ).returning(SyncVersion.version)
+        return session.execute(statement).scalar_one()
+
+    @staticmethod
+    def _load_rows(session: Session, user_id: str, keys) -> Dict[Tuple[str, str], dict]:
+        """Current rows for upserted keys, with one SELECT per entity."""
+        by_entity: Dict[str, list] = {}
+        for entity, entity_key in keys:
+            if entity in ENTITIES:
+                by_entity.setdefault(entity, []).append(entity_key)
+
+        rows = {}
+        for entity, entity_keys in by_entity.items():
+            model, key_name, key_type, schema = ENTITIES[entity]
+            key_column = getattr(model, key_name)
+            statement = select(model).where(
+                model.user_id == user_id,
+                key_column.in_([key_type(k) for k in entity_keys])
+            )
+            for row in session.exec(statement).all():
+                rows[(entity, str(getattr(row, key_name)))] = schema(**row.model_dump()).model_dump(mode="json")
+        return rows
@@ -0,0 +1,273 @@
+"""Persistent translation cache for learning content and canned tips."""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from fastapi.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.services.llm_scheduler import BACKGROUND, estimate_cost, get_llm_scheduler
+
+logger = logging.getLogger(__name__)
+
+# Language content is authored in; it is served without translation
+SOURCE_LANGUAGE = "en"
+
+LANGUAGE_NAMES = {
+    "ar": "Arabic", "de": "German", "es": "Spanish", "fr": "French", "hi": "Hindi",
+    "it": "Italian", "ja": "Japanese", "ko": "Korean", "nl": "Dutch", "pl": "Polish",
+    "pt": "Portuguese", "ru": "Russian", "tr": "Turkish", "vi": "Vietnamese", "zh": "Chinese",
+}
+
+
+def content_hash(text: str) -> str:
+    """Stable key for a source string."""
+    return hashlib.sha256(text.encode()).hexdigest()[:32]
+
+
+class Translator(ABC):
+    """Translates batches of strings."""
+
+    @abstractmethod
+    def translate(self, texts: List[str], language: str) -> List[str]:
+        """Translate each text into language, preserving order."""
+
+
+class LLMTranslator(Translator):
+    """Translator backed by the configured AI provider."""
+
+    SYSTEM_PROMPT = (
+        "You translate eye-health education content. Translate every string in the "
+        "JSON array the user sends into {language}. Keep markdown, numbers, units and "
+        "names such as \"20-20-20 rule\" intact. Reply with only a JSON array of "
+        "translated strings, in the same order and of the same length."
+    )
+
+    def translate(self, texts: List[str], language: str) -> List[str]:
+        """Translate a batch in one completion."""
+        from app.services.ai_service import get_ai_service
+
+        system_prompt = self.SYSTEM_PROMPT.format(language=LANGUAGE_NAMES.get(language, language))
+        reply = get_ai_service().provider.generate_text(
+            system_prompt,
+            json.dumps(texts, ensure_ascii=False)
+        )
+        match = re.search(r"\[.*\]", reply, re.DOTALL)
+        translated = json.loads(match.group()) if match else None
+        if not isinstance(translated, list) or len(translated) != len(texts):
+            raise ValueError("Translation reply did not match the request")
+        return [str(text) for text in translated]
+
+
+class TranslationCache:
+    """Translations keyed by (content hash, language), persisted as files.
+
+    Each translation is written to `<directory>/<language>/<hash>.txt` with
+    an atomic rename, so workers sharing the directory never see partial
+    files and never overwrite each other's entries. Lookups are served from
+    memory; a miss first checks for a file another worker has written, and
+    only then is queued and translated in batches by a background task.
+    Callers serve the source text in the meantime.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        languages: Iterable[str],
+        translator: Optional[Translator] = None,
+        batch_size: int = 20,
+        retry_seconds: float = 300.0
+    ):
+        self.directory = Path(directory)
+        self.languages = frozenset(languages)
+        self.translator = translator or LLMTranslator()
+        self.batch_size = batch_size
+        self.retry_seconds = retry_seconds
+        self._texts: Dict[Tuple[str, str], str] = {}
+        self._pending: Dict[Tuple[str, str], str] = {}
+        self._in_flight: Set[Tuple[str, str]] = set()
+        self._retry_at: Dict[Tuple[str, str], float] = {}
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.translated = 0
+        self.failures = 0
+        self._load()
+
+    def supports(self, language: Optional[str]) -> bool:
+        """Whether content is translated into language."""
+        return language in self.languages
+
+    def localize(self, texts: List[str], language: str) -> Optional[List[str]]:
+        """
+        Translations of all texts, or None if any is not available yet.
+
+        Missing translations are queued, so the next call after the
+        background task has run can succeed.
+        """
+        if language == SOURCE_LANGUAGE:
+            return list(texts)
+        if not self.supports(language):
+            return None
+        keys = [(content_hash(text), language) for text in texts]
+        translated = [self._lookup(*key) for key in keys]
+        if any(text is None for text in translated):
+            self.request(texts, language)
+            return None
+        return translated
+
+    def request(self, texts: Iterable[str], language: str) -> int:
+        """Queue texts that are not translated yet; returns how many were added."""
+        if not self.supports(language):
+            return 0
+        now = time.monotonic()
+        added = 0
+        for text in texts:
+            key = (content_hash(text), language)
+            if self._lookup(*key) is not None:
+                continue
+            with self._lock:
+                if key in self._pending or key in self._in_flight:
+                    continue
+                if self._retry_at.get(key, 0) > now:
+                    continue
+                self._pending[key] = text
+                added += 1
+        return added
+
+    def translate_pending(self) -> int:
+        """Translate queued texts in per-language batches; returns how many were stored."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._in_flight.update(pending)
+        by_language: Dict[str, List[Tuple[str, str]]] = {}
+        for (digest, language), text in pending.items():
+            by_language.setdefault(language, []).append((digest, text))
+
+        stored = 0
+        for language, items in by_language.items():
+            for start in range(0, len(items), self.batch_size):
+                batch = items[start:start + self.batch_size]
+                try:
+                    translated = self.translator.translate([text for _, text in batch], language)
+                except Exception as e:
+                    logger.error(f"Failed to translate {len(batch)} strings into {language}: {e}")
+                    self.failures += len(batch)
+                    retry_at = time.monotonic() + self.retry_seconds
+                    with self._lock:
+                        for digest, _ in batch:
+                            self._retry_at[(digest, language)] = retry_at
+                    continue
+                for (digest, _), text in zip(batch, translated):
+                    self._store(digest, language, text)
+                    stored += 1
+        with self._lock:
+            self._in_flight.difference_update(pending)
+        self.translated += stored
+        return stored
+
+    async def run(self, interval_seconds: float) -> None:
+        """Translate queued texts periodically until cancelled."""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            if self._pending:
+                # One background slot covers the sweep's batches
+                cost = estimate_cost(*self._pending.values())
+                async with get_llm_scheduler().slot("translations", BACKGROUND, cost):
+                    await run_in_threadpool(self.translate_pending)
+
+    def start(self, interval_seconds: float) -> None:
+        """Start the background translation task."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run(interval_seconds))
+
+    async def stop(self) -> None:
+        """Cancel the background task; queued texts are dropped and re-queued on demand."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, int]:
+        """Cache size, queue length and translation counters."""
+        return {
+            "cached": len(self._texts),
+            "pending": len(self._pending),
+            "translated": self.translated,
+            "failures": self.failures,
+        }
+
+    def _store(self, digest: str, language: str, text: str) -> None:
+        """Persist one translation and make it visible to lookups."""
+        path = self.directory / language / f"{digest}.txt"
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_text(text, encoding="utf-8")
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.error(f"Failed to persist translation {path}: {e}")
+        with self._lock:
+            self._texts[(digest, language)] = text
+            self._retry_at.pop((digest, language), None)
+
+    def _lookup(self, digest: str, language: str) -> Optional[str]:
+        """
+        A translation from memory, else from a file another worker has written.
+
+        Texts this worker has queued, is translating, or is backing off
+        from are not looked for on disk, so a missing text costs one file
+        open before it is queued rather than one on every request.
+        """
+        key = (digest, language)
+        text = self._texts.get(key)
+        if text is not None:
+            return text
+        with self._lock:
+            if key in self._pending or key in self._in_flight or self._retry_at.get(key, 0) > time.monotonic():
+                return None
+        try:
+            text = (self.directory / language / f"{digest}.txt").read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.error(f"Failed to read translation {digest} ({language}): {e}")
+            return None
+        with self._lock:
+            self._texts[key] = text
+            self._retry_at.pop(key, None)
+        return text
+
+    def _load(self) -> None:
+        """Read persisted translations for the configured languages."""
+        for language in self.languages:
+            for path in (self.directory / language).glob("*.txt"):
+                try:
+                    self._texts[(path.stem, language)] = path.read_text(encoding="utf-8")
+                except OSError as e:
+                    logger.error(f"Failed to read translation {path}: {e}")
+
+
+# Singleton instance
+_translations: Optional[TranslationCache] = None
+
+
+def get_translations() -> TranslationCache:
+    """Get or create the translation cache."""
+    global _translations
+    if _translations is None:
+        _translations = TranslationCache(
+            directory=Path(settings.translation_cache_dir),
+            languages=[lang.strip() for lang in settings.translation_languages.split(",") if lang.strip()],
+            batch_size=settings.translation_batch_size,
+            retry_seconds=settings.translation_retry_seconds
+        )
+    return _translations
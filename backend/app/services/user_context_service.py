@@ -0,0 +1,63 @@
+"""Compact per-user context attached to chat prompts."""
+from sqlmodel import Session
+from typing import Dict
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.models import UserPreferences
+from app.schemas import HabitWeeklySummary
+from app.services.habit_service import HabitService
+from app.services.preference_service import PreferenceService
+
+# Rendered snapshots keyed by user_id, stored with the summary and
+# preference objects they were rendered from
+_context_cache = LRUCache("chat_user_context", maxsize=settings.summary_cache_size)
+
+
+class UserContextService:
+    """Service for the habit and preference context sent with chat messages."""
+
+    @staticmethod
+    def get_context(session: Session, user_id: str) -> Dict[str, str]:
+        """
+        The `recent_habits` and `user_preferences` prompt context for a user.
+
+        Both sources come from their services' caches, which hand out the
+        same object until the underlying rows change; the snapshot is only
+        re-rendered when either object is replaced, and a warm lookup runs
+        no queries.
+        """
+        summary = HabitService.get_weekly_summary(session, user_id)
+        preferences = PreferenceService.get_or_create_preferences(session, user_id)
+
+        cached = _context_cache.get(user_id)
+        if cached is not None and cached[0] is summary and cached[1] is preferences:
+            return cached[2]
+
+        context = {
+            "recent_habits": UserContextService.render_habits(summary),
+            "user_preferences": UserContextService.render_preferences(preferences),
+        }
+        _context_cache.set(user_id, (summary, preferences, context))
+        return context
+
+    @staticmethod
+    def render_habits(summary: HabitWeeklySummary) -> str:
+        """One-line digest of the weekly habit aggregates."""
+        if not (summary.avg_screen_time or summary.avg_strain_level or summary.total_breaks):
+            return "no habits logged in the past 7 days"
+        return (
+            f"past 7 days: {summary.avg_screen_time:.1f}h screen time/day, "
+            f"eye strain {summary.avg_strain_level:.1f}/10, "
+            f"{summary.total_breaks} breaks, habit score {summary.habit_score}/100"
+        )
+
+    @staticmethod
+    def render_preferences(preferences: UserPreferences) -> str:
+        """One-line digest of the preferences relevant to eye-care advice."""
+        return (
+            f"age range {preferences.age_range}, "
+            f"works {preferences.working_hours_start}-{preferences.working_hours_end} {preferences.timezone}, "
+            f"dark mode {'on' if preferences.dark_mode else 'off'}, "
+            f"font {preferences.preferred_font_size}, "
+            f"language {preferences.language}"
+        )
@@ -0,0 +1,54 @@
+/**
+ * Custom hook for keeping loaded data current from the delta sync feed
+ */
+import { useRef, useCallback } from 'react'
+import { apiService } from '../services/api'
+
+export function useChangeFeed(request) {
+  const version = useRef(null)
+
+  // Take the current version; call before the initial full fetch so
+  // nothing written in between is missed
+  const start = useCallback(async () => {
+    const data = await request(apiService.getChanges())
+    version.current = data.version
+  }, [request])
+
+  // All changes since the last version, following `has_more`
+  const pull = useCallback(async () => {
+    if (version.current === null) return []
+    const changes = []
+    let page
+    do {
+      page = await request(apiService.getChanges(version.current))
+      changes.push(...page.changes)
+      version.current = page.version
+    } while (page.has_more)
+    return changes
+  }, [request])
+
+  return { start, pull }
+}
+
+/**
+ * Apply one entity's changes to a list of rows.
+ * Updated rows keep their place; new ones are added at the start or end.
+ */
+export function applyChanges(items, changes, entity, keyField, { prepend = false } = {}) {
+  let result = items
+  changes
+    .filter((change) => change.entity === entity)
+    .forEach((change) => {
+      const index = result.findIndex(
+        (item) => String(item[keyField]) === change.key
+      )
+      if (change.operation === 'delete') {
+        if (index !== -1) result = result.filter((_, i) => i !== index)
+      } else if (index !== -1) {
+        result = result.map((item, i) => (i === index ? change.data : item))
+      } else {
+        result = prepend ? [change.data, ...result] : [...result, change.data]
+      }
+    })
+  return result
+}
@@ -5,9 +5,11 @@ import { useState, useEffect } from 'react';
 import { Disclaimer } from '../components/Disclaimer';
 import { apiService } from '../services/api';
 import { useApi } from '../hooks/useApi';
+import { useChangeFeed, applyChanges } from '../hooks/useChangeFeed';
 
 export function HabitsPage() {
   const { request, loading, error } = useApi();
+  const { start, pull } = useChangeFeed(request);
   const [formData, setFormData] = useState({
     screen_time_hours: 8,
     breaks_taken: 2,
@@ -26,16 +28,34 @@ export function HabitsPage() {
 
   const fetchLogs = async () => {
     try {
+      await start();
       const data = await request(apiService.getHabitLogs());
       setLogs(data);
 
-      const summaryData = await request(apiService.getWeeklySummary());
-      setSummary(summaryData);
+      await fetchSummary();
     } catch (err) {
       console.log('Error fetching logs:', err);
     }
   };
 
+  const fetchSummary = async () => {
+    const summaryData = await request(apiService.getWeeklySummary());
+    setSummary(summaryData);
+  };
+
+  const syncLogs = async () => {
+    try {
+      const changes = await pull();
+      setLogs((current) =>
+        applyChanges(current, changes, 'habit_logs', 'id', { prepend: true })
+      );
+
+      await fetchSummary();
+    } catch (err) {
+      console.log('Error syncing logs:', err);
+    }
+  };
+
   const handleSubmit = async (e) => {
     e.preventDefault();
     setSubmitted(false);
@@ -52,8 +72,8 @@ export function HabitsPage() {
         notes: '',
       });
 
-      // Refresh logs
-      fetchLogs();
+      // Pick up the new log without refetching the list
+      syncLogs();
 
       // Clear success message after 3 seconds
       setTimeout(() => setSubmitted(false), 3000);
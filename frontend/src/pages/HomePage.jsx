@@ -14,8 +14,8 @@ export function HomePage() {
   useEffect(() => {
     const fetchData = async () => {
       try {
-        const data = await request(apiService.getWeeklySummary());
-        setWeeklyData(data);
+        const data = await request(apiService.getDashboard());
+        setWeeklyData(data.weekly_summary);
       } catch (err) {
         console.log('No habit data yet');
       }
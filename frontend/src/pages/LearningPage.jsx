@@ -4,9 +4,11 @@
 import { useState, useEffect } from 'react';
 import { apiService } from '../services/api';
 import { useApi } from '../hooks/useApi';
+import { useChangeFeed, applyChanges } from '../hooks/useChangeFeed';
 
 export function LearningPage() {
   const { request, loading } = useApi();
+  const { start, pull } = useChangeFeed(request);
   const [modules, setModules] = useState([]);
   const [activeModule, setActiveModule] = useState(null);
   const [quizAnswers, setQuizAnswers] = useState([]);
@@ -20,7 +22,7 @@ export function LearningPage() {
 
   const fetchModules = async () => {
     try {
-      const data = await request(apiService.getAllModules());
+      const data = await request(apiService.getModuleSummaries());
       setModules(data);
     } catch (err) {
       console.log('Error fetching modules:', err);
@@ -29,17 +31,43 @@ export function LearningPage() {
 
   const fetchProgress = async () => {
     try {
+      await start();
       const data = await request(apiService.getLearningProgress());
-      const progressMap = {};
-      data.forEach((p) => {
-        progressMap[p.module_id] = p;
-      });
-      setProgress(progressMap);
+      setProgress(toProgressMap(data));
     } catch (err) {
       console.log('No progress yet');
     }
   };
 
+  const syncProgress = async () => {
+    try {
+      const changes = await pull();
+      setProgress((current) =>
+        toProgressMap(
+          applyChanges(
+            Object.values(current),
+            changes,
+            'learning_progress',
+            'module_id'
+          )
+        )
+      );
+    } catch (err) {
+      console.log('Error syncing progress:', err);
+    }
+  };
+
+  const openModule = async (moduleId) => {
+    try {
+      const data = await request(apiService.getModule(moduleId));
+      setActiveModule(data);
+      setQuizAnswers([]);
+      setQuizResult(null);
+    } catch (err) {
+      console.log('Error fetching module:', err);
+    }
+  };
+
   const handleQuizSubmit = async () => {
     if (quizAnswers.length === 0) {
       alert('Please answer all questions');
@@ -51,7 +79,7 @@ export function LearningPage() {
         apiService.submitQuiz(activeModule.id, quizAnswers)
       );
       setQuizResult(result);
-      fetchProgress();
+      syncProgress();
     } catch (err) {
       console.log('Error submitting quiz:', err);
     }
@@ -68,11 +96,7 @@ export function LearningPage() {
               <div
                 key={module.id}
                 className="bg-white rounded-lg shadow hover:shadow-lg transition cursor-pointer"
-                onClick={() => {
-                  setActiveModule(module);
-                  setQuizAnswers([]);
-                  setQuizResult(null);
-                }}
+                onClick={() => openModule(module.id)}
               >
                 <div className="p-6">
                   <h3 className="text-xl font-bold mb-2">{module.title}</h3>
@@ -215,3 +239,11 @@ export function LearningPage() {
     </div>
   );
 }
+
+function toProgressMap(rows) {
+  const progressMap = {};
+  rows.forEach((p) => {
+    progressMap[p.module_id] = p;
+  });
+  return progressMap;
+}
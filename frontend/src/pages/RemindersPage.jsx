@@ -4,6 +4,7 @@
 import { useState, useEffect } from 'react';
 import { apiService } from '../services/api';
 import { useApi } from '../hooks/useApi';
+import { useChangeFeed, applyChanges } from '../hooks/useChangeFeed';
 import { useGlobalTimer } from '../hooks/useGlobalTimer';
 
 // Sound utility to play "stop stop" alert
@@ -184,6 +185,7 @@ function CountdownDisplay({ reminder, timeLeft }) {
 
 export function RemindersPage() {
   const { request, loading } = useApi();
+  const { start, pull } = useChangeFeed(request);
   const [reminders, setReminders] = useState([]);
   const [newReminder, setNewReminder] = useState({
     reminder_type: '20-20-20',
@@ -210,6 +212,7 @@ export function RemindersPage() {
 
   const fetchReminders = async () => {
     try {
+      await start();
       const data = await request(apiService.getReminders());
       setReminders(data);
     } catch (err) {
@@ -217,6 +220,17 @@ export function RemindersPage() {
     }
   };
 
+  const syncReminders = async () => {
+    try {
+      const changes = await pull();
+      setReminders((current) =>
+        applyChanges(current, changes, 'eye_health_reminders', 'id')
+      );
+    } catch (err) {
+      console.log('Error syncing reminders:', err);
+    }
+  };
+
   const handleAddReminder = async (e) => {
     e.preventDefault();
     try {
@@ -227,7 +241,7 @@ export function RemindersPage() {
         use_browser_notification: true,
         notification_sound: true,
       });
-      fetchReminders();
+      syncReminders();
     } catch (err) {
       console.log('Error adding reminder:', err);
     }
@@ -249,7 +263,7 @@ export function RemindersPage() {
         startTimer(reminder);
       }
       
-      fetchReminders();
+      syncReminders();
     } catch (err) {
       console.log('Error updating reminder:', err);
     }
@@ -262,7 +276,7 @@ export function RemindersPage() {
         if (activeTimer?.id === reminderId) {
           stopTimer();
         }
-        fetchReminders();
+        syncReminders();
       } catch (err) {
         console.log('Error deleting reminder:', err);
       }
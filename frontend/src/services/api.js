@@ -24,6 +24,11 @@ function getUserId() {
 axiosInstance.interceptors.request.use((config) => {
   config.params = config.params || {}
   config.params.user_id = getUserId()
+  // One key per call: a retry of the same request config reuses it, so the
+  // backend replays the first response instead of executing again
+  if (config.method === 'post' && !config.headers['Idempotency-Key']) {
+    config.headers['Idempotency-Key'] = crypto.randomUUID()
+  }
   return config
 })
 
@@ -41,28 +46,59 @@ export const apiService = {
   deleteChatMessage: (messageId) =>
     axiosInstance.delete(`/chat/history/${messageId}`),
 
+  // Dashboard
+  getDashboard: () => axiosInstance.get('/dashboard/'),
+
+  // Delta sync: omit `since` to get the current version token
+  getChanges: (since = null) =>
+    axiosInstance.get('/sync/changes', { params: since === null ? {} : { since } }),
+
   // Habit tracking endpoints
   createHabitLog: (data) => axiosInstance.post('/habits/log', data),
 
-  getHabitLogs: (days = 30) =>
-    axiosInstance.get('/habits/logs', { params: { days } }),
+  getHabitLogs: (days = 30, fields = null) =>
+    axiosInstance.get('/habits/logs', {
+      params: fields ? { days, fields: fields.join(',') } : { days },
+    }),
 
   getWeeklySummary: () => axiosInstance.get('/habits/weekly-summary'),
 
+  getHabitTrends: (days = 90, window = 7) =>
+    axiosInstance.get('/habits/trends', { params: { days, window } }),
+
   // Reminders endpoints
   createReminder: (data) => axiosInstance.post('/reminders/', data),
 
   getReminders: () => axiosInstance.get('/reminders/'),
 
+  getReminderCalendar: (limit = 50, horizonDays = 7) =>
+    axiosInstance.get('/reminders/calendar', {
+      params: { limit, horizon_days: horizonDays },
+    }),
+
   updateReminder: (reminderId, data) =>
     axiosInstance.patch(`/reminders/${reminderId}`, data),
 
   deleteReminder: (reminderId) =>
     axiosInstance.delete(`/reminders/${reminderId}`),
 
+  getReminderTemplates: () => axiosInstance.get('/reminders/templates'),
+
+  applyReminderTemplates: (templates = null) =>
+    axiosInstance.post('/reminders/bulk/templates', { templates }),
+
+  bulkUpdateReminders: (update, filter = {}) =>
+    axiosInstance.patch('/reminders/bulk', { filter, update }),
+
+  bulkDeleteReminders: (filter = {}) =>
+    axiosInstance.post('/reminders/bulk/delete', filter),
+
   // Learning endpoints
   getAllModules: () => axiosInstance.get('/learning/modules'),
 
+  getModuleSummaries: () =>
+    axiosInstance.get('/learning/modules', { params: { view: 'summary' } }),
+
   getModule: (moduleId) => axiosInstance.get(`/learning/modules/${moduleId}`),
 
   submitQuiz: (moduleId, answers) =>
@@ -76,10 +112,21 @@ export const apiService = {
   getModuleProgress: (moduleId) =>
     axiosInstance.get(`/learning/progress/${moduleId}`),
 
+  getModuleAttempts: (moduleId) =>
+    axiosInstance.get(`/learning/progress/${moduleId}/attempts`),
+
+  getModuleLeaderboard: (moduleId, limit = 10) =>
+    axiosInstance.get(`/learning/modules/${moduleId}/leaderboard`, { params: { limit } }),
+
+  getLearningStats: () => axiosInstance.get('/learning/stats'),
+
   // Reading comfort endpoints
   getReadingRecommendations: (data) =>
     axiosInstance.post('/reading-comfort/recommendations', data),
 
+  getReadingRecommendationsBatch: (contexts) =>
+    axiosInstance.post('/reading-comfort/recommendations/batch', { contexts }),
+
   getUserPreferences: () => axiosInstance.get('/reading-comfort/preferences'),
 
   updateUserPreferences: (data) =>
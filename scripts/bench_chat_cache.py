@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+"""
+Benchmark the near-duplicate chat cache: how many paraphrases that an
+exact-match cache would miss are answered, how many unrelated questions
+are wrongly answered, and lookup cost with a full cache.
+"""
+from __future__ import annotations
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "backend"))
+
+from app.schemas import AIResponse  # noqa: E402
+from app.services.semantic_cache import SemanticCache  # noqa: E402
+
+# Each group holds paraphrases of one question
+GROUPS = [
+    ["My eyes hurt after coding", "eyes sore after programming all day",
+     "my eyes ache after a day of coding", "Eyes hurt from programming"],
+    ["How do I reduce eye strain?", "tips to prevent eye strain",
+     "how can I avoid eye strain", "advice to reduce eye strain"],
+    ["My eyes feel dry at the computer", "dry eyes when using my laptop",
+     "my eyes get dry in front of the monitor", "eyes feel gritty at the computer"],
+    ["How often should I take breaks?", "how often should I take a break from the screen",
+     "how frequently should I rest my eyes", "how often should I pause from the screen"],
+    ["Is reading on my phone at night bad?", "is reading on my smartphone late bad",
+     "reading on phone at night bad for eyes?", "is it bad to read on my mobile in the evening"],
+    ["What lighting is best for reading?", "best lighting for reading",
+     "what lamp is best for reading", "what light should I use for reading"],
+    ["My vision gets blurry after work", "blurry vision after working on the computer",
+     "my vision is blurred after my job", "vision blurry after office work"],
+    ["Should I use eye drops?", "should I use eye drops for my eyes",
+     "are eye drops a good idea", "should I use drops for my eyes"],
+    ["What is the 20-20-20 rule?", "explain the 20 20 20 rule",
+     "what's the 20-20-20 rule", "how does the 20-20-20 rule work"],
+    ["My eyes are tired in the evening", "tired eyes at night",
+     "eyes exhausted late in the day", "my eyes feel fatigued in the evening"],
+]
+
+# Questions that resemble a group but need a different answer
+DISTINCT = [
+    "should I not use eye drops", "my eyes hurt after reading", "dry skin at the computer",
+    "how often should I blink", "is reading on my phone in the morning bad",
+    "my screen is too dim", "what is the 10-10-10 rule", "my eyes are tired in the morning",
+    "what lighting is best for sleeping", "my eyes itch after swimming",
+]
+
+FILLER_WORDS = (
+    "screen glasses contacts posture humidity font zoom monitor distance blue light filter "
+    "glare contrast blink water sleep desk chair window sunlight outdoors kids games tv"
+).split()
+
+
+def main(n: int = 10000) -> None:
+    random.seed(7)
+
+    # Prime with the first phrasing of each question, then ask the others:
+    # an exact-match cache misses every one of them
+    cache = SemanticCache(maxsize=2000, threshold=0.6)
+    for group, variants in enumerate(GROUPS):
+        cache.set(variants[0], AIResponse(summary=str(group), tips=[]))
+    paraphrases = [(group, v) for group, variants in enumerate(GROUPS) for v in variants[1:]]
+    hits = wrong = 0
+    for group, prompt in paraphrases:
+        response = cache.get(prompt)
+        if response is not None:
+            hits += 1
+            wrong += response.summary != str(group)
+    false_hits = sum(cache.get(prompt) is not None for prompt in DISTINCT)
+
+    # Lookup cost with a full cache of unrelated prompts
+    full = SemanticCache(maxsize=2000, threshold=0.6)
+    for i in range(2000):
+        full.set(" ".join(random.sample(FILLER_WORDS, 6)), AIResponse(summary=str(i), tips=[]))
+    queries = [random.choice(random.choice(GROUPS)) for _ in range(n)]
+    t0 = time.perf_counter()
+    for prompt in queries:
+        full.get(prompt)
+    lookup_us = (time.perf_counter() - t0) / n * 1e6
+
+    print(f"paraphrases answered={hits}/{len(paraphrases)} ({hits / len(paraphrases):.0%} "
+          f"over exact match), wrong group={wrong}")
+    print(f"distinct questions wrongly answered={false_hits}/{len(DISTINCT)}")
+    print(f"lookup={lookup_us:.1f}us/call with {len(full)} entries")
+
+
+if __name__ == "__main__":
+    main()
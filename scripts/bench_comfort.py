@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+"""
+Benchmark reading comfort recommendations: per-call rule evaluation and
+JSON encoding (the previous path) against the precompiled lookup table.
+"""
+from __future__ import annotations
+import random
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "backend"))
+
+from app.services.comfort_service import (  # noqa: E402
+    ComfortService,
+    CONTRASTS,
+    FONT_SIZES,
+    LINE_SPACINGS,
+    TEXT_WIDTHS,
+)
+
+
+def _contexts(n: int) -> list:
+    screens = ["phone", "tablet", "desktop", "book"]
+    lights = ["dim", "normal", "bright"]
+    contexts = []
+    for _ in range(n):
+        preferences = SimpleNamespace(
+            preferred_font_size=random.choice(FONT_SIZES),
+            preferred_contrast=random.choice(CONTRASTS),
+            preferred_line_spacing=random.choice(LINE_SPACINGS),
+            preferred_text_width=random.choice(TEXT_WIDTHS),
+            dark_mode=random.random() < 0.5,
+        )
+        contexts.append((random.choice(screens), random.choice(lights), random.randint(1, 240), preferences))
+    return contexts
+
+
+def main(n: int = 100_000) -> None:
+    contexts = _contexts(n)
+
+    t0 = time.perf_counter()
+    ComfortService.get_table()
+    compile_ms = (time.perf_counter() - t0) * 1000
+
+    t0 = time.perf_counter()
+    for screen, light, minutes, p in contexts:
+        ComfortService.evaluate(
+            screen, light, minutes,
+            p.preferred_font_size, p.preferred_contrast,
+            p.preferred_line_spacing, p.preferred_text_width, p.dark_mode
+        ).model_dump_json()
+    evaluate_us = (time.perf_counter() - t0) / n * 1e6
+
+    t0 = time.perf_counter()
+    for screen, light, minutes, p in contexts:
+        ComfortService.recommend(screen, light, minutes, p).body
+    lookup_us = (time.perf_counter() - t0) / n * 1e6
+
+    print(f"table entries={len(ComfortService.get_table())} compile={compile_ms:.1f}ms")
+    print(f"evaluate+encode={evaluate_us:.2f}us/call lookup={lookup_us:.2f}us/call "
+          f"speedup={evaluate_us / lookup_us:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+"""
+Benchmark the reminder scheduler at 1M active reminders.
+Measures bulk load, incremental reschedule/unschedule and due dispatch.
+"""
+from __future__ import annotations
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "backend"))
+
+from app.services.reminder_scheduler import ReminderScheduler  # noqa: E402
+
+
+def main(count: int = 1_000_000, ops: int = 100_000) -> None:
+    now = datetime(2025, 1, 1, 9, 0)
+    scheduler = ReminderScheduler()
+
+    t0 = time.perf_counter()
+    for reminder_id in range(count):
+        interval = random.choice((20, 30, 45, 60))
+        fire_at = now + timedelta(seconds=random.randint(1, interval * 60))
+        scheduler.schedule(reminder_id, f"user_{reminder_id % 50_000}", "20-20-20", interval, fire_at)
+    load = time.perf_counter() - t0
+    print(f"load {count:,} reminders: {load:.2f}s ({load / count * 1e6:.2f}us/op)")
+
+    t0 = time.perf_counter()
+    for _ in range(ops):
+        reminder_id = random.randrange(count)
+        scheduler.schedule(reminder_id, "user", "20-20-20", 30, now + timedelta(minutes=random.randint(1, 30)))
+    update = time.perf_counter() - t0
+    print(f"reschedule x{ops:,}: {update / ops * 1e6:.2f}us/op")
+
+    t0 = time.perf_counter()
+    for _ in range(ops):
+        scheduler.unschedule(random.randrange(count))
+    delete = time.perf_counter() - t0
+    print(f"unschedule x{ops:,}: {delete / ops * 1e6:.2f}us/op")
+
+    fired = 0
+    t0 = time.perf_counter()
+    for second in range(1, 61):
+        fired += len(scheduler.pop_due(now + timedelta(seconds=second)))
+    dispatch = time.perf_counter() - t0
+    print(f"dispatch first minute: {fired:,} events in {dispatch:.2f}s ({dispatch / max(fired, 1) * 1e6:.2f}us/event)")
+    print(f"live reminders: {len(scheduler):,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python
+"""
+Benchmark habit trend computation over a year of daily logs.
+Target: p95 under 50 ms.
+"""
+from __future__ import annotations
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "backend"))
+
+from app.services.habit_service import HabitService  # noqa: E402
+
+
+def main(days: int = 365, runs: int = 200) -> None:
+    end = datetime.utcnow()
+    start = (end - timedelta(days=days - 1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    rows = [
+        (start + timedelta(days=i, hours=random.randint(8, 20)),
+         random.uniform(2, 12),
+         random.randint(1, 10))
+        for i in range(-7, days)
+    ]
+
+    timings = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        HabitService.compute_trends(rows, start, end, days, 7, 2.5)
+        timings.append((time.perf_counter() - t0) * 1000)
+
+    timings.sort()
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f"days={days} runs={runs} median={statistics.median(timings):.2f}ms p95={p95:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
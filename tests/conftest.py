@@ -15,3 +15,6 @@ def _add_backend_to_path():
 
 
 _add_backend_to_path()
+
+# Use a throwaway in-memory database instead of ./eyecare.db
+os.environ.setdefault("DATABASE_URL", "sqlite://")
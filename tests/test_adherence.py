@@ -0,0 +1,54 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.db.session import create_db_and_tables, dialect_insert, engine
+from app.main import app
+from app.models import ReminderAdherenceDaily
+
+
+create_db_and_tables()
+client = TestClient(app)
+
+
+def _events(event_type, count, reminder_type="20-20-20", occurred_at=None):
+    return [
+        {"reminder_type": reminder_type, "event_type": event_type, "occurred_at": occurred_at}
+        for _ in range(count)
+    ]
+
+
+def test_ingest_and_adherence_rollup():
+    user_id = "adherence_user"
+    yesterday = (datetime.utcnow() - timedelta(days=1)).isoformat()
+    batch = _events("fired", 4) + _events("acknowledged", 3) + _events("dismissed", 1)
+    batch += _events("fired", 2, occurred_at=yesterday) + _events("snoozed", 2, occurred_at=yesterday)
+    batch += _events("fired", 2, reminder_type="hydration")
+
+    resp = client.post(f"/api/reminders/events?user_id={user_id}", json={"events": batch})
+    assert resp.json() == {"accepted": len(batch)}
+    # A second batch increments the existing daily rollup rows
+    client.post(f"/api/reminders/events?user_id={user_id}", json={"events": _events("acknowledged", 1)})
+
+    report = client.get("/api/reminders/adherence", params={"user_id": user_id}).json()
+    by_type = {a["reminder_type"]: a for a in report["by_type"]}
+    assert by_type["20-20-20"]["fired"] == 6
+    assert by_type["20-20-20"]["acknowledged"] == 4
+    assert by_type["20-20-20"]["snoozed"] == 2
+    assert by_type["20-20-20"]["adherence_rate"] == round(4 / 6, 4)
+    assert by_type["hydration"]["adherence_rate"] == 0.0
+    assert report["adherence_rate"] == 0.5
+
+
+def test_ingest_rejects_unknown_event_type():
+    resp = client.post("/api/reminders/events?user_id=u", json={"events": _events("exploded", 1)})
+    assert resp.status_code == 400
+
+
+def test_unsupported_dialect_fails_at_startup(monkeypatch):
+    monkeypatch.setattr(engine.dialect, "name", "mysql")
+    with pytest.raises(RuntimeError, match="not supported on mysql"):
+        create_db_and_tables()
+    with pytest.raises(RuntimeError):
+        dialect_insert(ReminderAdherenceDaily)
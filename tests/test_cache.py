@@ -0,0 +1,53 @@
+import time
+
+from app.core.cache import LRUCache
+
+
+def test_lru_eviction_and_stats():
+    cache = LRUCache("test_lru", maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)  # evicts "b", the least recently used
+
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    stats = cache.stats()
+    assert stats["size"] == 2
+    assert stats["evictions"] == 1
+    assert stats["hits"] == 2 and stats["misses"] == 1
+
+
+def test_ttl_expiry():
+    cache = LRUCache("test_ttl", ttl_seconds=0.01)
+    cache.set("a", 1)
+    time.sleep(0.02)
+    assert cache.get("a") is None
+
+
+def test_get_or_set_and_invalidate_where():
+    cache = LRUCache("test_read_through")
+    calls = []
+    factory = lambda: calls.append(1) or "value"
+
+    assert cache.get_or_set(("u1", 7), factory) == "value"
+    assert cache.get_or_set(("u1", 7), factory) == "value"
+    assert len(calls) == 1
+
+    cache.invalidate_where(lambda key: key[0] == "u1")
+    cache.get_or_set(("u1", 7), factory)
+    assert len(calls) == 2
+
+
+def test_get_or_set_does_not_store_value_invalidated_while_computing():
+    cache = LRUCache("test_read_through_race")
+
+    def stale_factory():
+        # A write lands and invalidates the key while the value is computed
+        cache.invalidate("u1")
+        return "stale"
+
+    assert cache.get_or_set("u1", stale_factory) == "stale"
+    assert cache.get("u1") is None
+    assert cache.get_or_set("u1", lambda: "fresh") == "fresh"
+    assert cache.get("u1") == "fresh"
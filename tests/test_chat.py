@@ -0,0 +1,276 @@
+import asyncio
+import json
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlmodel import Session, select
+
+from app.db.session import create_db_and_tables, engine
+from app.main import app
+from app.models import ChatMessage
+from app.schemas import AIResponse
+from app.services import ai_service
+from app.services.latency_tracker import LatencyTracker
+from app.services.semantic_cache import SemanticCache, context_scope
+
+
+create_db_and_tables()
+client = TestClient(app)
+
+
+class _RecordingAIService:
+    def __init__(self):
+        self.contexts = []
+
+    async def chat(self, user_message, context=None, user_id="", **kwargs):
+        self.contexts.append(dict(context or {}))
+        return AIResponse(summary="ok", tips=["blink"], reminder="rest")
+
+
+def _send(monkeypatch, user_id, **body):
+    recorder = _RecordingAIService()
+    monkeypatch.setattr(ai_service, "_ai_service", recorder)
+    resp = client.post("/api/chat/message", params={"user_id": user_id}, json={"user_message": "My eyes hurt", **body})
+    assert resp.status_code == 200
+    return recorder.contexts[-1]
+
+
+def test_message_carries_habit_and_preference_context(monkeypatch):
+    user = "chat-context-user"
+    context = _send(monkeypatch, user)
+    assert context["recent_habits"] == "no habits logged in the past 7 days"
+    assert "dark mode off" in context["user_preferences"]
+
+    client.post("/api/habits/log", params={"user_id": user}, json={"screen_time_hours": 6, "breaks_taken": 3})
+    client.patch("/api/reading-comfort/preferences", params={"user_id": user}, json={"dark_mode": True})
+
+    context = _send(monkeypatch, user)
+    assert context["recent_habits"].startswith("past 7 days: 6.0h screen time/day")
+    assert "3 breaks" in context["recent_habits"]
+    assert "dark mode on" in context["user_preferences"]
+
+
+def test_warm_snapshot_runs_no_queries(monkeypatch):
+    user = "chat-context-warm"
+    _send(monkeypatch, user)
+
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        _send(monkeypatch, user)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    # Only storing the chat message itself touches the database
+    assert statements and all("chat_messages" in statement for statement in statements)
+
+
+def test_client_context_takes_precedence(monkeypatch):
+    context = _send(monkeypatch, "chat-context-client", context={"recent_habits": "slept badly"})
+    assert context["recent_habits"] == "slept badly"
+
+
+def _response(text):
+    return AIResponse(summary=text, tips=[])
+
+
+def test_semantic_cache_matches_paraphrases_only():
+    cache = SemanticCache(maxsize=10, threshold=0.6)
+    cache.set("My eyes hurt after coding", _response("coding"))
+
+    assert cache.get("eyes sore after programming all day").summary == "coding"
+    assert cache.get("my eyes hurt after reading") is None
+    assert cache.get("my eyes ache after coding at night").summary == "coding"
+    stats = cache.stats()
+    # The first paraphrase reduces to exactly the same canonical shingles
+    assert stats["exact_hits"] == 1 and stats["near_hits"] == 1 and stats["misses"] == 1
+
+
+def test_semantic_cache_respects_negation_and_scope():
+    cache = SemanticCache(maxsize=10, threshold=0.5)
+    cache.set("should I use eye drops", _response("drops"), scope="a")
+
+    assert cache.get("should I not use eye drops", scope="a") is None
+    assert cache.get("should I use eye drops", scope="b") is None
+    assert cache.get("should I use eye drops", scope="a").summary == "drops"
+
+
+def test_semantic_cache_evicts_least_recently_used():
+    cache = SemanticCache(maxsize=2)
+    cache.set("dry eyes at the computer", _response("dry"))
+    cache.set("best lighting for reading", _response("light"))
+    cache.get("dry eyes at the computer")
+    cache.set("what is the 20-20-20 rule", _response("rule"))
+
+    assert len(cache) == 2
+    assert cache.get("best lighting for reading") is None
+    assert cache.get("dry eyes at the computer").summary == "dry"
+
+
+def test_context_scope_ignores_time_of_day():
+    assert context_scope({"time_of_day": "09:00"}) == ""
+    assert context_scope({"recent_habits": "x", "time_of_day": "09:00"}) == context_scope({"recent_habits": "x"})
+    assert context_scope({"recent_habits": "x"}) != context_scope({"recent_habits": "y"})
+
+
+class _CountingProvider:
+    def __init__(self, response):
+        self.response = response
+        self.calls = 0
+
+    async def generate_response(self, user_message, context=None):
+        self.calls += 1
+        return self.response
+
+
+def _service(response):
+    service = ai_service.AIService.__new__(ai_service.AIService)
+    service.provider = _CountingProvider(response)
+    service.cache = SemanticCache(maxsize=10)
+    service.latency = LatencyTracker()
+    return service
+
+
+def test_ai_service_answers_near_duplicates_from_cache():
+    service = _service(_response("answer"))
+    asyncio.run(service.chat("how do I reduce eye strain", {"time_of_day": "10:00"}))
+    answer = asyncio.run(service.chat("tips to prevent eye strain", {"time_of_day": "22:00"}))
+
+    assert answer.summary == "answer"
+    assert service.provider.calls == 1
+
+
+def test_ai_service_does_not_cache_fallback():
+    service = _service(ai_service.fallback_response())
+    for _ in range(2):
+        asyncio.run(service.chat("how do I reduce eye strain"))
+    assert service.provider.calls == 2
+
+
+class _EchoProvider:
+    async def generate_response(self, user_message, context=None):
+        return _response(context["recent_habits"])
+
+
+def test_cached_answers_never_cross_users(monkeypatch):
+    service = _service(None)
+    service.provider = _EchoProvider()
+    monkeypatch.setattr(ai_service, "_ai_service", service)
+
+    def ask(user_id, hours):
+        client.post("/api/habits/log", params={"user_id": user_id}, json={"screen_time_hours": hours, "breaks_taken": 2})
+        resp = client.post("/api/chat/message", params={"user_id": user_id}, json={"user_message": "how do I reduce eye strain"})
+        return resp.json()["summary"]
+
+    # Close enough habits that a coarse cohort would have merged them
+    answer_a = ask("chat-scope-a", 5)
+    answer_b = ask("chat-scope-b", 6)
+    assert "5.0h" in answer_a
+    assert "6.0h" in answer_b and "5.0h" not in answer_b
+
+
+class _SlowProvider:
+    def __init__(self, delay):
+        self.delay = delay
+        self.cancelled = False
+
+    async def generate_response(self, user_message, context=None):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return _response("slow")
+
+
+def test_straggling_provider_call_gets_fallback_at_deadline():
+    service = _service(None)
+    service.provider = _SlowProvider(delay=5)
+    service.latency = LatencyTracker(initial=0.05)
+
+    answer = asyncio.run(service.chat("how do I reduce eye strain", use_cache=False))
+
+    assert answer == ai_service.fallback_response()
+    assert service.provider.cancelled
+    assert service.latency.stats()["timeouts"] == 1
+
+
+def test_deadline_follows_observed_latency():
+    tracker = LatencyTracker(initial=30, minimum=1, maximum=20, percentile=0.9, multiplier=2, min_samples=10)
+    for _ in range(9):
+        tracker.record(2.0)
+    assert tracker.deadline() == 30
+    tracker.record(2.0)
+    assert tracker.deadline() == 4.0
+    for _ in range(100):
+        tracker.record(0.1)
+    assert tracker.deadline() == 1
+    # Cut-off calls count at the deadline, so a slowdown raises it
+    for _ in range(400):
+        tracker.record_timeout(tracker.deadline())
+    assert tracker.deadline() == 20
+
+
+class _HangingAIService:
+    def __init__(self):
+        self.started = asyncio.Event()
+        self.cancelled = False
+
+    async def chat(self, user_message, context=None, **kwargs):
+        self.started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return _response("too late")
+
+
+def test_client_disconnect_cancels_provider_call(monkeypatch):
+    user = "chat-disconnect-user"
+    hanging = _HangingAIService()
+    monkeypatch.setattr(ai_service, "_ai_service", hanging)
+    body = json.dumps({"user_message": "My eyes hurt"}).encode()
+
+    async def scenario():
+        messages = [{"type": "http.request", "body": body, "more_body": False}]
+        disconnected = asyncio.Event()
+        sent = []
+
+        async def receive():
+            if messages:
+                return messages.pop()
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {
+            "type": "http", "method": "POST", "path": "/api/chat/message", "raw_path": b"/api/chat/message",
+            "query_string": f"user_id={user}".encode(), "root_path": "", "scheme": "http", "http_version": "1.1",
+            "headers": [(b"content-type", b"application/json"), (b"idempotency-key", b"disconnect-1")],
+            "server": ("testserver", 80), "client": ("testclient", 50000),
+        }
+        request = asyncio.create_task(app(scope, receive, send))
+        await hanging.started.wait()
+        disconnected.set()
+        await asyncio.wait_for(request, timeout=5)
+        return sent[0]["status"]
+
+    assert asyncio.run(scenario()) == 499
+    assert hanging.cancelled
+    with Session(engine) as session:
+        assert session.exec(select(ChatMessage).where(ChatMessage.user_id == user)).first() is None
+
+    # The abandoned attempt is not replayed to a retry with the same key
+    monkeypatch.setattr(ai_service, "_ai_service", _RecordingAIService())
+    retry = client.post(
+        "/api/chat/message", params={"user_id": user}, json={"user_message": "My eyes hurt"},
+        headers={"Idempotency-Key": "disconnect-1"}
+    )
+    assert retry.status_code == 200
+    assert "idempotent-replayed" not in retry.headers
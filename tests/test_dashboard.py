@@ -0,0 +1,54 @@
+from fastapi.testclient import TestClient
+
+from app.db.session import create_db_and_tables
+from app.main import app
+
+
+create_db_and_tables()
+client = TestClient(app)
+
+
+def test_dashboard_sections_and_timings():
+    user = "dashboard-user"
+    client.post("/api/habits/log", params={"user_id": user}, json={"screen_time_hours": 4})
+    client.post("/api/reminders/", params={"user_id": user}, json={"reminder_type": "Hydration", "interval_minutes": 60})
+
+    resp = client.get("/api/dashboard/", params={"user_id": user})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["weekly_summary"]["avg_screen_time"] == 4
+    assert [r["reminder_type"] for r in data["reminders"]] == ["Hydration"]
+    assert data["progress"] == []
+    assert data["preferences"]["user_id"] == user
+    assert set(data["timings_ms"]) == {"weekly_summary", "reminders", "progress", "preferences"}
+    assert data["errors"] == {}
+
+
+def test_dashboard_requires_user():
+    assert client.get("/api/dashboard/", params={"user_id": " "}).status_code == 400
+
+
+def test_cached_sections_do_not_wait_for_the_connection_lock(monkeypatch):
+    import threading
+    from app.services import dashboard_service
+
+    user = "dashboard-cached-user"
+    client.get("/api/dashboard/", params={"user_id": user})  # warm the caches
+
+    lock = threading.Lock()
+    acquired = []
+
+    class CountingLock:
+        def __enter__(self):
+            acquired.append(1)
+            return lock.__enter__()
+
+        def __exit__(self, *args):
+            return lock.__exit__(*args)
+
+    monkeypatch.setattr(dashboard_service, "_connection_lock", CountingLock())
+    data = client.get("/api/dashboard/", params={"user_id": user}).json()
+    assert data["errors"] == {}
+    assert data["preferences"]["user_id"] == user
+    # Only the uncached reminders and progress sections reach the database
+    assert len(acquired) == 2
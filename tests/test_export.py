@@ -0,0 +1,64 @@
+import csv
+import io
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.db.session import create_db_and_tables
+from app.main import app
+
+
+create_db_and_tables()
+client = TestClient(app)
+
+USER_ID = "export_user"
+
+
+def setup_module():
+    for hours in (1.5, 2.5):
+        client.post(f"/api/habits/log?user_id={USER_ID}", json={"screen_time_hours": hours})
+    client.post(f"/api/reminders/?user_id={USER_ID}", json={"reminder_type": "hydration", "interval_minutes": 30})
+
+
+def test_full_account_ndjson():
+    resp = client.get("/api/export/", params={"user_id": USER_ID})
+    assert resp.status_code == 200
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    tables = [line["table"] for line in lines]
+    assert tables.count("habit_logs") == 2
+    assert tables.count("eye_health_reminders") == 1
+    assert all(line["row"]["user_id"] == USER_ID for line in lines)
+
+
+def test_table_csv():
+    resp = client.get("/api/export/habit_logs", params={"user_id": USER_ID, "format": "csv"})
+    assert resp.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(resp.text)))
+    assert [float(r["screen_time_hours"]) for r in rows] == [1.5, 2.5]
+
+
+def test_table_parquet():
+    pq = pytest.importorskip("pyarrow.parquet")
+    resp = client.get("/api/export/habit_logs", params={"user_id": USER_ID, "format": "parquet"})
+    assert resp.status_code == 200
+    table = pq.read_table(io.BytesIO(resp.content))
+    assert table.column("screen_time_hours").to_pylist() == [1.5, 2.5]
+
+
+def test_rejects_unknown_table_and_format():
+    assert client.get("/api/export/secrets", params={"user_id": USER_ID}).status_code == 400
+    assert client.get("/api/export/habit_logs", params={"user_id": USER_ID, "format": "xml"}).status_code == 400
+    assert client.get("/api/export/", params={"user_id": USER_ID, "format": "csv"}).status_code == 400
+
+
+@pytest.mark.parametrize("user_id", ['evil"; filename="x.exe', "line\r\nSet-Cookie: a=b", "用户"])
+def test_hostile_user_id_cannot_break_content_disposition(user_id):
+    for path in ("/api/export/", "/api/export/habit_logs"):
+        resp = client.get(path, params={"user_id": user_id})
+        assert resp.status_code == 200
+        header = resp.headers["content-disposition"]
+        assert "set-cookie" not in resp.headers
+        filename = header.split('filename="')[1].split('"')[0]
+        assert all(c.isalnum() and c.isascii() or c in "._-" for c in filename)
+        assert "filename*=UTF-8''" in header
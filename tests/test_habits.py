@@ -0,0 +1,94 @@
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+
+from app.db.session import create_db_and_tables
+from app.main import app
+from app.services.habit_service import HabitService
+
+
+create_db_and_tables()
+client = TestClient(app)
+
+
+def _rows(values, start):
+    return [(start + timedelta(days=i, hours=12), screen, 5) for i, screen in enumerate(values)]
+
+
+def test_compute_trends_moving_average_and_delta():
+    start = datetime(2025, 1, 1)
+    # 7 days of history before the range, then 14 days in range
+    rows = _rows([4.0] * 14 + [6.0] * 7, start - timedelta(days=7))
+    trends = HabitService.compute_trends(rows, start, start + timedelta(days=13), 14, 7, 2.5)
+
+    assert len(trends.points) == 14
+    assert trends.points[0].screen_time_avg == 4.0
+    assert trends.points[-1].screen_time_avg == 6.0
+    assert trends.points[-1].screen_time_wow_delta == 2.0
+    assert trends.points[0].log_count == 1
+
+
+def test_compute_trends_flags_spike_as_anomaly():
+    start = datetime(2025, 1, 1)
+    values = [4.0, 4.5, 3.5, 4.0, 4.5, 3.5, 4.0] * 2 + [14.0]
+    rows = _rows(values, start - timedelta(days=7))
+    trends = HabitService.compute_trends(rows, start, start + timedelta(days=7), 8, 7, 2.5)
+
+    assert trends.points[-1].is_anomaly
+    assert trends.anomalies == [trends.points[-1].date]
+    assert not any(p.is_anomaly for p in trends.points[:-1])
+
+
+def test_compute_trends_handles_gaps():
+    start = datetime(2025, 1, 1)
+    trends = HabitService.compute_trends([], start, start + timedelta(days=6), 7, 7, 2.5)
+
+    assert all(p.screen_time is None and p.log_count == 0 for p in trends.points)
+    assert trends.anomalies == []
+
+
+def test_trends_endpoint():
+    user_id = "trends_user"
+    for hours in (3, 4, 5):
+        resp = client.post(f"/api/habits/log?user_id={user_id}", json={"screen_time_hours": hours})
+        assert resp.status_code == 200
+
+    resp = client.get("/api/habits/trends", params={"user_id": user_id, "days": 14})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert len(data["points"]) == 14
+    assert data["points"][-1]["log_count"] == 3
+    assert data["points"][-1]["screen_time"] == 4.0
+
+
+def test_trends_endpoint_rejects_bad_range():
+    resp = client.get("/api/habits/trends", params={"user_id": "u", "days": 1})
+    assert resp.status_code == 400
+
+
+def test_weekly_summary_cached_until_new_log():
+    user_id = "summary_cache_user"
+    client.post(f"/api/habits/log?user_id={user_id}", json={"screen_time_hours": 2})
+    first = client.get("/api/habits/weekly-summary", params={"user_id": user_id}).json()
+    hits_before = client.get("/metrics/caches").json()["weekly_summary"]["hits"]
+
+    again = client.get("/api/habits/weekly-summary", params={"user_id": user_id}).json()
+    assert again == first
+    assert client.get("/metrics/caches").json()["weekly_summary"]["hits"] == hits_before + 1
+
+    client.post(f"/api/habits/log?user_id={user_id}", json={"screen_time_hours": 4})
+    updated = client.get("/api/habits/weekly-summary", params={"user_id": user_id}).json()
+    assert updated["avg_screen_time"] == 3.0
+
+
+def test_habit_logs_sparse_fields():
+    user = "sparse-fields-user"
+    client.post("/api/habits/log", params={"user_id": user}, json={"screen_time_hours": 3, "notes": "ok"})
+
+    full = client.get("/api/habits/logs", params={"user_id": user}).json()
+    resp = client.get("/api/habits/logs", params={"user_id": user, "fields": "id, eye_strain_level"})
+    assert resp.status_code == 200
+    assert resp.json() == [{"id": full[0]["id"], "eye_strain_level": 5}]
+
+    resp = client.get("/api/habits/logs", params={"user_id": user, "fields": "id,password"})
+    assert resp.status_code == 400
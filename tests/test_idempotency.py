@@ -0,0 +1,103 @@
+import asyncio
+
+import httpx
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.idempotency import IdempotencyMiddleware, IdempotencyStore
+from app.db.session import create_db_and_tables
+from app.main import app
+
+
+create_db_and_tables()
+client = TestClient(app)
+
+USER_ID = "idempotency-user"
+
+
+def _habit_logs():
+    return client.get("/api/habits/logs", params={"user_id": USER_ID}).json()
+
+
+def test_retry_replays_stored_response():
+    before = len(_habit_logs())
+    headers = {"Idempotency-Key": "log-1"}
+    first = client.post("/api/habits/log", params={"user_id": USER_ID}, json={"screen_time_hours": 3}, headers=headers)
+    retry = client.post("/api/habits/log", params={"user_id": USER_ID}, json={"screen_time_hours": 3}, headers=headers)
+
+    assert first.status_code == retry.status_code == 200
+    assert retry.json() == first.json()
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert "idempotent-replayed" not in first.headers
+    assert len(_habit_logs()) == before + 1
+
+
+def test_key_reused_with_different_body_is_rejected():
+    headers = {"Idempotency-Key": "log-2"}
+    client.post("/api/habits/log", params={"user_id": USER_ID}, json={"screen_time_hours": 1}, headers=headers)
+    resp = client.post("/api/habits/log", params={"user_id": USER_ID}, json={"screen_time_hours": 5}, headers=headers)
+    assert resp.status_code == 422
+
+
+def test_keys_are_scoped_per_user():
+    headers = {"Idempotency-Key": "shared"}
+    a = client.post("/api/habits/log", params={"user_id": "idem-a"}, json={"screen_time_hours": 2}, headers=headers)
+    b = client.post("/api/habits/log", params={"user_id": "idem-b"}, json={"screen_time_hours": 2}, headers=headers)
+    assert a.json()["id"] != b.json()["id"]
+    assert "idempotent-replayed" not in b.headers
+
+
+def test_requests_without_key_are_not_deduplicated():
+    before = len(_habit_logs())
+    for _ in range(2):
+        client.post("/api/habits/log", params={"user_id": USER_ID}, json={"screen_time_hours": 4})
+    assert len(_habit_logs()) == before + 2
+
+
+def _counting_app():
+    calls = {"n": 0, "fail": False}
+    inner = FastAPI()
+
+    @inner.post("/work")
+    async def work():
+        calls["n"] += 1
+        await asyncio.sleep(0.05)
+        if calls["fail"]:
+            calls["fail"] = False
+            raise RuntimeError("upstream failed")
+        return {"call": calls["n"]}
+
+    store = IdempotencyStore(maxsize=10, ttl_seconds=60)
+    return IdempotencyMiddleware(inner, store=store), calls
+
+
+def test_concurrent_retry_attaches_to_in_flight_request():
+    wrapped, calls = _counting_app()
+
+    async def run():
+        transport = httpx.ASGITransport(app=wrapped)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+            headers = {"Idempotency-Key": "k"}
+            return await asyncio.gather(*[ac.post("/work", headers=headers) for _ in range(3)])
+
+    responses = asyncio.run(run())
+    assert calls["n"] == 1
+    assert [r.json() for r in responses] == [{"call": 1}] * 3
+    assert sum(r.headers.get("idempotent-replayed") == "true" for r in responses) == 2
+
+
+def test_failed_request_is_executed_again_on_retry():
+    wrapped, calls = _counting_app()
+    calls["fail"] = True
+
+    async def run():
+        transport = httpx.ASGITransport(app=wrapped, raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+            first = await ac.post("/work", headers={"Idempotency-Key": "k"})
+            retry = await ac.post("/work", headers={"Idempotency-Key": "k"})
+            return first, retry
+
+    first, retry = asyncio.run(run())
+    assert first.status_code == 500
+    assert retry.status_code == 200
+    assert calls["n"] == 2
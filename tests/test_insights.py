@@ -0,0 +1,103 @@
+import asyncio
+from datetime import date
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from app.db.session import create_db_and_tables, engine
+from app.main import app
+from app.models import WeeklyInsight
+from app.schemas import AIResponse
+from app.services import ai_service
+from app.services.insight_service import InsightJob, week_start_of
+
+
+create_db_and_tables()
+client = TestClient(app)
+
+
+class _StubAIService:
+    def __init__(self, fail_on=None):
+        self.calls = 0
+        self.fail_on = fail_on
+
+    async def chat(self, user_message, context=None, use_cache=True, user_id="", priority="interactive"):
+        assert use_cache is False
+        self.calls += 1
+        if self.fail_on and self.fail_on in context["recent_habits"]:
+            return ai_service.fallback_response()
+        return AIResponse(summary=f"Insight {self.calls}", tips=["Blink"], reminder="Rest")
+
+
+def _log(user_id, hours=5):
+    client.post("/api/habits/log", params={"user_id": user_id}, json={"screen_time_hours": hours, "breaks_taken": 2})
+
+
+def _insight_users(week_start):
+    with Session(engine) as session:
+        statement = select(WeeklyInsight.user_id).where(WeeklyInsight.week_start == week_start)
+        return session.exec(statement).all()
+
+
+def test_batch_resumes_after_interruption_without_repeating_users(monkeypatch):
+    for i in range(5):
+        _log(f"insight-batch-{i}")
+    today = date(2021, 3, 3)
+    job = InsightJob(chunk_size=2, concurrency=2, requests_per_minute=0)
+
+    stub = _StubAIService()
+    monkeypatch.setattr(ai_service, "_ai_service", stub)
+    original_save = job._save_chunk
+    saves = []
+
+    def crash_on_second_save(*args):
+        saves.append(args)
+        if len(saves) == 2:
+            raise RuntimeError("worker restarted")
+        original_save(*args)
+
+    monkeypatch.setattr(job, "_save_chunk", crash_on_second_save)
+    try:
+        asyncio.run(job.run_once(today))
+    except RuntimeError:
+        pass
+    first_run_calls = stub.calls
+    saved = len(_insight_users(week_start_of(today)))
+    assert saved == 2
+
+    monkeypatch.setattr(job, "_save_chunk", original_save)
+    stub.calls = 0
+    report = asyncio.run(job.run_once(today))
+
+    users = _insight_users(week_start_of(today))
+    assert len(users) == len(set(users))
+    assert {f"insight-batch-{i}" for i in range(5)} <= set(users)
+    assert report.status == "completed"
+    assert report.generated == len(users)
+    # The interrupted chunk is redone; the committed one is not
+    assert stub.calls == len(users) - saved
+    assert first_run_calls == 4
+
+    # A completed night is not run again
+    stub.calls = 0
+    asyncio.run(job.run_once(today))
+    assert stub.calls == 0
+
+
+def test_summary_serves_stored_insight_and_failures_are_reported(monkeypatch):
+    user = "insight-summary-user"
+    _log(user)
+    _log("insight-failing-user", hours=13)
+    assert client.get("/api/habits/weekly-summary", params={"user_id": user}).json()["insight"] is None
+
+    monkeypatch.setattr(ai_service, "_ai_service", _StubAIService(fail_on="13.0h"))
+    report = asyncio.run(InsightJob(chunk_size=50, concurrency=4, requests_per_minute=0).run_once())
+
+    assert report.failed == 1
+    assert report.processed == report.generated + report.failed + report.skipped
+    assert client.get("/metrics/insight-job").json()["failed"] == 1
+
+    insight = client.get("/api/habits/weekly-summary", params={"user_id": user}).json()["insight"]
+    assert insight["tips"] == ["Blink"]
+    assert insight["week_start"] == str(week_start_of(date.today()))
+    assert client.get("/api/habits/weekly-summary", params={"user_id": "insight-failing-user"}).json()["insight"] is None
@@ -0,0 +1,303 @@
+import os
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlmodel import Session, select
+
+from app.db.session import create_db_and_tables, engine
+from app.main import app
+from app.services import content_store
+from app.services.content_store import ContentStore, get_content_store
+from app.services.learning_service import LearningService
+from app.services.quiz_analytics_service import get_quiz_analytics
+
+
+create_db_and_tables()
+client = TestClient(app)
+
+
+def test_modules_etag_and_conditional_get():
+    resp = client.get("/api/learning/modules")
+    assert resp.status_code == 200
+    etag = resp.headers["etag"]
+    assert "max-age" in resp.headers["cache-control"]
+    assert {m["id"] for m in resp.json()} == {entry.id for entry in get_content_store().list_entries()}
+    # Full modules unless a summary is asked for
+    assert all("content" in m and "quiz_questions" in m for m in resp.json())
+
+    resp = client.get("/api/learning/modules", headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.content == b""
+
+    resp = client.get("/api/learning/modules", headers={"If-None-Match": '"stale"'})
+    assert resp.status_code == 200
+
+
+def test_module_etag_and_not_found():
+    resp = client.get("/api/learning/modules/eyes_101")
+    assert resp.json()["id"] == "eyes_101"
+    resp = client.get("/api/learning/modules/eyes_101", headers={"If-None-Match": resp.headers["etag"]})
+    assert resp.status_code == 304
+
+    assert client.get("/api/learning/modules/unknown").status_code == 404
+
+
+def _write_module(directory, module_id, title, order, content):
+    (directory / f"{module_id}.md").write_text(
+        f"---\ntitle: {title}\ndescription: About {title}\norder: {order}\n---\n{content}"
+    )
+
+
+def test_content_store_lazy_load_and_hot_reload(tmp_path):
+    _write_module(tmp_path, "b", "Second", 2, "Body B")
+    _write_module(tmp_path, "a", "First", 1, "Body A")
+    (tmp_path / "a.quiz.json").write_text('[{"question": "Q", "options": ["x", "y"], "correct": 1}]')
+    store = ContentStore(tmp_path, "test_learning_modules", cache_size=1, reload_seconds=0)
+
+    assert [entry.id for entry in store.list_entries()] == ["a", "b"]
+    assert store._bodies.stats()["size"] == 0
+    module = store.get_module("a")
+    assert module.content == "Body A"
+    assert module.quiz_questions[0]["correct"] == 1
+    assert store.get_module("b").quiz_questions is None
+    assert store._bodies.stats()["size"] == 1
+
+    version = store.version
+    _, etag = store.get_module_json("a")
+    path = tmp_path / "a.md"
+    _write_module(tmp_path, "a", "First", 1, "Body A, fixed")
+    stat = path.stat()
+    os.utime(path, (stat.st_atime, stat.st_mtime + 5))
+    assert store.get_module("a").content == "Body A, fixed"
+    assert store.get_module_json("a")[1] != etag
+    assert store.version == version + 1
+
+    (tmp_path / "b.md").unlink()
+    assert [entry.id for entry in store.list_entries()] == ["a"]
+    with pytest.raises(ValueError):
+        store.get_module("b")
+
+
+def test_full_view_streams_bodies_without_a_compiled_copy(tmp_path, monkeypatch):
+    for i in range(3):
+        _write_module(tmp_path, f"m{i}", f"Module {i}", i, f"Body {i}")
+    store = ContentStore(tmp_path, "test_learning_stream", cache_size=1, reload_seconds=0)
+    monkeypatch.setattr(content_store, "_content_store", store)
+
+    resp = client.get("/api/learning/modules", params={"view": "full"})
+    assert resp.status_code == 200
+    assert [m["content"] for m in resp.json()] == ["Body 0", "Body 1", "Body 2"]
+    # Bodies were loaded one at a time through the bounded LRU
+    assert store._bodies.stats()["size"] == 1
+    assert not hasattr(LearningService, "_catalog")
+
+    etag = resp.headers["etag"]
+    assert client.get("/api/learning/modules", params={"view": "full"}, headers={"If-None-Match": etag}).status_code == 304
+    path = tmp_path / "m1.md"
+    _write_module(tmp_path, "m1", "Module 1", 1, "Body 1, fixed")
+    stat = path.stat()
+    os.utime(path, (stat.st_atime, stat.st_mtime + 5))
+    resp = client.get("/api/learning/modules", params={"view": "full"}, headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.json()[1]["content"] == "Body 1, fixed"
+
+
+def test_module_summary_view_and_progress_fields():
+    resp = client.get("/api/learning/modules", params={"view": "summary"})
+    assert resp.status_code == 200
+    assert set(resp.json()[0]) == {"id", "title", "description"}
+    full = client.get("/api/learning/modules")
+    assert len(resp.content) * 5 < len(full.content)
+    assert resp.headers["etag"] != full.headers["etag"]
+    assert client.get("/api/learning/modules", params={"view": "tiny"}).status_code == 400
+
+    resp = client.get("/api/learning/progress", params={"user_id": "nobody", "fields": "module_id"})
+    assert resp.json() == []
+
+
+def _submit(user_id, answers, module_id="eyes_101"):
+    return client.post(
+        f"/api/learning/modules/{module_id}/quiz",
+        params={"user_id": user_id},
+        json={"module_id": module_id, "answers": answers}
+    )
+
+
+def test_quiz_attempts_upsert_best_score():
+    user = "progress-upsert-user"
+    assert _submit(user, [0, 1]).json()["score"] == 100
+    assert _submit(user, [1, 0]).json()["score"] == 0
+
+    progress = client.get("/api/learning/progress", params={"user_id": user}).json()
+    assert len(progress) == 1
+    assert progress[0]["quiz_score"] == 100
+    assert progress[0]["attempts"] == 2
+    assert progress[0]["completed"] is True
+
+    resp = client.get("/api/learning/progress/eyes_101", params={"user_id": user})
+    assert resp.json()["completed_at"] is not None
+
+    attempts = client.get("/api/learning/progress/eyes_101/attempts", params={"user_id": user}).json()
+    assert [a["score"] for a in attempts] == [0, 100]
+
+
+def test_leaderboard_and_completion_stats():
+    _submit("board-a", [0, 0])
+    _submit("board-b", [0, 1])
+
+    board = client.get("/api/learning/modules/eyes_101/leaderboard").json()
+    scores = [entry["best_score"] for entry in board["entries"]]
+    assert scores == sorted(scores, reverse=True)
+    assert board["entries"][0]["rank"] == 1
+    assert client.get("/api/learning/modules/unknown/leaderboard").status_code == 404
+
+    stats = client.get("/api/learning/stats", params={"module_id": "eyes_101"}).json()
+    assert stats[0]["learners"] >= 2
+    assert 0 < stats[0]["completion_rate"] < 1
+
+
+def test_legacy_progress_rows_are_merged():
+    with engine.begin() as connection:
+        connection.execute(text("DROP INDEX uq_learning_progress_user_module"))
+        for score, completed, created_at in ((40, False, datetime(2025, 1, 1)), (90, True, datetime(2025, 1, 2))):
+            connection.execute(
+                text(
+                    "INSERT INTO learning_progress (user_id, module_id, module_title, completed, quiz_score, "
+                    "attempts, created_at, completed_at) VALUES ('legacy', 'eyes_101', 'Eyes', :completed, "
+                    ":score, 1, :created_at, :completed_at)"
+                ),
+                {"score": score, "completed": completed, "created_at": created_at,
+                 "completed_at": created_at if completed else None}
+            )
+    create_db_and_tables()
+
+    progress = client.get("/api/learning/progress", params={"user_id": "legacy"}).json()
+    assert len(progress) == 1
+    assert progress[0]["quiz_score"] == 90
+    assert progress[0]["attempts"] == 2
+    assert progress[0]["completed"] is True
+
+
+def test_quiz_item_analytics_from_buffered_counters():
+    module_id = "digital_eye_strain"
+    questions = get_content_store().get_module(module_id).quiz_questions
+    key = [q["correct"] for q in questions]
+    wrong = [(c + 1) % len(q["options"]) for c, q in zip(key, questions)]
+    # Strong learners get everything right; weak learners miss everything
+    for i in range(12):
+        answers = key if i % 2 else wrong
+        assert _submit(f"analytics-{i}", answers, module_id).status_code == 200
+    assert len(get_quiz_analytics()) > 0
+
+    report = client.get(f"/api/learning/modules/{module_id}/analytics").json()
+    assert len(get_quiz_analytics()) == 0
+    first = report["items"][0]
+    assert first["responses"] == 12
+    assert first["difficulty"] == 0.5
+    assert first["discrimination"] == 1.0
+    assert sum(first["option_counts"]) == 12
+    assert first["option_counts"][key[0]] == 6
+
+
+def test_out_of_range_answers_are_rejected():
+    module_id = "digital_eye_strain"
+    questions = get_content_store().get_module(module_id).quiz_questions
+    answers = [q["correct"] for q in questions]
+    for bad in (len(questions[0]["options"]), -1, 10 ** 9):
+        resp = _submit("analytics-hostile", [bad] + answers[1:], module_id)
+        assert resp.status_code == 400
+    assert len(get_quiz_analytics()) == 0
+
+
+def _version_counts(module_id):
+    from app.models import QuizItemStats, QuizOptionCount
+
+    with Session(engine) as session:
+        items = session.exec(select(QuizItemStats).where(QuizItemStats.module_id == module_id)).all()
+        options = session.exec(select(QuizOptionCount).where(QuizOptionCount.module_id == module_id)).all()
+    return (
+        {row.quiz_version: (row.responses, row.correct) for row in items},
+        {(row.quiz_version, row.option_index): row.count for row in options},
+    )
+
+
+def test_edited_quiz_starts_new_counts():
+    from app.services.quiz_analytics_service import QuizAnalyticsBuffer
+
+    buffer = QuizAnalyticsBuffer()
+    with Session(engine) as session:
+        buffer.record("edited_quiz", "v1", [1], [True])
+        buffer.record("edited_quiz", "v1", [1], [True])
+        buffer.flush(session)
+        # One buffer can hold both versions after a hot reload
+        buffer.record("edited_quiz", "v1", [1], [True])
+        buffer.record("edited_quiz", "v2", [0], [False])
+        buffer.flush(session)
+
+    items, options = _version_counts("edited_quiz")
+    assert items == {"v1": (3, 3), "v2": (1, 0)}
+    assert options == {("v1", 1): 3, ("v2", 0): 1}
+
+
+def test_stale_version_flush_keeps_current_counts():
+    from app.services.quiz_analytics_service import QuizAnalyticsBuffer
+
+    current, stale = QuizAnalyticsBuffer(), QuizAnalyticsBuffer()
+    with Session(engine) as session:
+        current.record("stale_quiz", "v2", [0], [True])
+        current.flush(session)
+        # A worker that has not reloaded the module yet
+        stale.record("stale_quiz", "v1", [2], [False])
+        stale.flush(session)
+        current.record("stale_quiz", "v2", [0], [True])
+        current.flush(session)
+
+    items, options = _version_counts("stale_quiz")
+    assert items == {"v1": (1, 0), "v2": (2, 2)}
+    assert options == {("v1", 2): 1, ("v2", 0): 2}
+
+
+def test_quiz_tables_with_old_unique_keys_are_rebuilt():
+    from sqlalchemy import inspect, text
+
+    from app.db.session import create_db_and_tables
+
+    with engine.begin() as connection:
+        connection.execute(text("DROP TABLE quiz_item_stats"))
+        connection.execute(text(
+            "CREATE TABLE quiz_item_stats (id INTEGER PRIMARY KEY, module_id VARCHAR NOT NULL, "
+            "question_index INTEGER NOT NULL, responses INTEGER NOT NULL, correct INTEGER NOT NULL, "
+            "sum_total INTEGER NOT NULL, sum_total_sq INTEGER NOT NULL, sum_correct_total INTEGER NOT NULL, "
+            "CONSTRAINT uq_quiz_item_stats UNIQUE (module_id, question_index))"
+        ))
+        connection.execute(text("INSERT INTO quiz_item_stats VALUES (1, 'legacy_quiz', 0, 4, 3, 0, 0, 0)"))
+    create_db_and_tables()
+
+    with engine.connect() as connection:
+        names = {c["name"] for c in inspect(connection).get_unique_constraints("quiz_item_stats")}
+    assert names == {"uq_quiz_item_stats_version"}
+    assert _version_counts("legacy_quiz")[0] == {"": (4, 3)}
+
+
+def test_item_rest_correlation_matches_numpy():
+    import numpy as np
+    from app.models import QuizItemStats
+    from app.services.quiz_analytics_service import _item_rest_correlation
+
+    rng = np.random.default_rng(7)
+    responses = rng.integers(0, 2, size=(40, 4))
+    totals = responses.sum(axis=1)
+    x = responses[:, 0]
+    row = QuizItemStats(
+        module_id="m",
+        question_index=0,
+        responses=len(x),
+        correct=int(x.sum()),
+        sum_total=int(totals.sum()),
+        sum_total_sq=int((totals ** 2).sum()),
+        sum_correct_total=int((x * totals).sum())
+    )
+    expected = np.corrcoef(x, totals - x)[0, 1]
+    assert _item_rest_correlation(row) == pytest.approx(expected, abs=1e-4)
@@ -0,0 +1,123 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.llm_scheduler import BACKGROUND, INTERACTIVE, LLMScheduler
+
+
+client = TestClient(app)
+
+
+async def _run_in_order(scheduler, calls, hold):
+    """Queue calls behind a held slot, release it, and return the admission order."""
+    order = []
+    gate = asyncio.Event()
+
+    async def holder():
+        async with scheduler.slot("holder", INTERACTIVE):
+            await gate.wait()
+
+    async def call(name, user_id, priority, cost):
+        async with scheduler.slot(user_id, priority, cost):
+            order.append(name)
+            await asyncio.sleep(0)
+
+    held = [asyncio.create_task(holder()) for _ in range(hold)]
+    await asyncio.sleep(0)
+    tasks = []
+    for name, user_id, priority, cost in calls:
+        tasks.append(asyncio.create_task(call(name, user_id, priority, cost)))
+        await asyncio.sleep(0)
+    gate.set()
+    await asyncio.gather(*held, *tasks)
+    return order
+
+
+def test_interactive_calls_are_admitted_before_queued_background_work():
+    scheduler = LLMScheduler(concurrency=1, background_limit=1)
+    order = asyncio.run(_run_in_order(scheduler, [
+        ("batch-1", "batch", BACKGROUND, 1),
+        ("batch-2", "batch", BACKGROUND, 1),
+        ("chat", "alice", INTERACTIVE, 1),
+    ], hold=1))
+    assert order == ["chat", "batch-1", "batch-2"]
+
+
+def test_heavy_user_does_not_starve_others():
+    scheduler = LLMScheduler(concurrency=1, quantum=100)
+    calls = [(f"heavy-{i}", "heavy", INTERACTIVE, 100) for i in range(5)]
+    calls.append(("light", "light", INTERACTIVE, 100))
+    order = asyncio.run(_run_in_order(scheduler, calls, hold=1))
+    assert order.index("light") <= 2
+
+
+def test_fair_share_is_weighted_by_prompt_size():
+    scheduler = LLMScheduler(concurrency=1, quantum=100)
+    calls = [(f"big-{i}", "big", INTERACTIVE, 400) for i in range(3)]
+    calls += [(f"small-{i}", "small", INTERACTIVE, 100) for i in range(8)]
+    order = asyncio.run(_run_in_order(scheduler, calls, hold=1))
+    # Four small calls cost as much as one big one
+    assert order.index("big-1") >= 4
+    assert sum(name.startswith("small") for name in order[:order.index("big-1")]) >= 4
+
+
+def test_background_work_leaves_slots_for_interactive_calls():
+    async def scenario():
+        scheduler = LLMScheduler(concurrency=2, background_limit=1)
+        gate = asyncio.Event()
+
+        async def batch():
+            async with scheduler.slot("batch", BACKGROUND):
+                await gate.wait()
+
+        batches = [asyncio.create_task(batch()) for _ in range(3)]
+        await asyncio.sleep(0)
+        stats = scheduler.stats()
+        assert stats[BACKGROUND]["running"] == 1
+        assert stats[BACKGROUND]["queued"] == 2
+
+        async with scheduler.slot("alice", INTERACTIVE):
+            assert scheduler.stats()[INTERACTIVE]["running"] == 1
+        gate.set()
+        await asyncio.gather(*batches)
+        return scheduler.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats[BACKGROUND]["served"] == 3
+    assert stats[INTERACTIVE]["wait_max_ms"] < stats[BACKGROUND]["wait_max_ms"]
+
+
+def test_cancelled_waiter_gives_up_its_place():
+    async def scenario():
+        scheduler = LLMScheduler(concurrency=1)
+        gate = asyncio.Event()
+
+        async def holder():
+            async with scheduler.slot("holder"):
+                await gate.wait()
+
+        async def waiter():
+            async with scheduler.slot("alice"):
+                pass
+
+        held = asyncio.create_task(holder())
+        await asyncio.sleep(0)
+        waiting = asyncio.create_task(waiter())
+        await asyncio.sleep(0)
+        waiting.cancel()
+        await asyncio.gather(waiting, return_exceptions=True)
+        assert scheduler.stats()[INTERACTIVE]["queued"] == 0
+        gate.set()
+        await held
+        return scheduler.stats()[INTERACTIVE]
+
+    stats = asyncio.run(scenario())
+    assert stats["running"] == 0
+    assert stats["served"] == 1
+
+
+def test_scheduler_metrics_endpoint():
+    body = client.get("/metrics/llm-scheduler").json()
+    assert set(body) == {INTERACTIVE, BACKGROUND}
+    assert {"queued", "running", "wait_p95_ms"} <= set(body[INTERACTIVE])
@@ -0,0 +1,45 @@
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.db.session import create_db_and_tables, engine
+from app.main import app
+from app.services.preference_service import PreferenceService, _preferences_cache
+
+
+create_db_and_tables()
+client = TestClient(app)
+
+
+def test_preferences_cached_until_update():
+    user = "prefs-cache-user"
+    assert client.get("/api/reading-comfort/preferences", params={"user_id": user}).json()["dark_mode"] is False
+    hits = _preferences_cache.hits
+    resp = client.post(
+        "/api/reading-comfort/recommendations",
+        params={"user_id": user},
+        json={"screen_type": "phone", "ambient_light": "dim", "session_duration_minutes": 30}
+    )
+    assert resp.status_code == 200
+    assert _preferences_cache.hits == hits + 1
+
+    client.patch("/api/reading-comfort/preferences", params={"user_id": user}, json={"dark_mode": True})
+    assert client.get("/api/reading-comfort/preferences", params={"user_id": user}).json()["dark_mode"] is True
+
+
+def test_concurrent_first_request_does_not_conflict(monkeypatch):
+    user = "prefs-race-user"
+    with Session(engine) as session:
+        first = PreferenceService._load_or_create(session, user)
+
+    # Simulate a request that checked for the row before the other one inserted it
+    select = PreferenceService._select
+    calls = []
+
+    def stale_select(session, user_id):
+        calls.append(user_id)
+        return None if len(calls) == 1 else select(session, user_id)
+
+    monkeypatch.setattr(PreferenceService, "_select", staticmethod(stale_select))
+    with Session(engine) as session:
+        second = PreferenceService._load_or_create(session, user)
+    assert second.id == first.id
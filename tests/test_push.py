@@ -0,0 +1,57 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from app.db.session import create_db_and_tables
+from app.main import app
+from app.services.push_hub import PushConnection, PushHub
+
+
+create_db_and_tables()
+client = TestClient(app)
+
+
+def test_bounded_queue_drops_oldest():
+    connection = PushConnection("u1", max_queue=2)
+    for i in range(3):
+        connection.offer({"n": i})
+
+    assert len(connection) == 2
+    assert connection.dropped == 1
+    assert asyncio.run(connection.get(timeout=0.01)) == {"n": 1}
+
+
+def test_coalesced_messages_replace_pending():
+    hub = PushHub(max_queue=10)
+    connection = hub.connect("u1")
+    hub.publish("u1", "summary_updated", {"v": 1}, coalesce=True)
+    hub.publish("u1", "summary_updated", {"v": 2}, coalesce=True)
+
+    assert len(connection) == 1
+    assert asyncio.run(connection.get(timeout=0.01))["data"] == {"v": 2}
+
+
+def test_get_times_out_for_heartbeat():
+    connection = PushConnection("u1", max_queue=2)
+    assert asyncio.run(connection.get(timeout=0.01)) is None
+
+
+def test_fan_out_and_disconnect():
+    hub = PushHub()
+    first, second = hub.connect("u1"), hub.connect("u1")
+    assert hub.publish("u1", "reminder") == 2
+    assert hub.publish("someone_else", "reminder") == 0
+
+    hub.disconnect(first)
+    hub.disconnect(second)
+    assert hub.stats()["connections"] == 0
+    # Only the reminder scheduler's worker pushes reminders
+    assert hub.stats()["delivers_reminders"] is False
+
+
+def test_websocket_receives_published_events():
+    user_id = "push_ws_user"
+    with client.websocket_connect(f"/api/push/ws?user_id={user_id}") as websocket:
+        client.post(f"/api/habits/log?user_id={user_id}", json={"screen_time_hours": 1})
+        message = websocket.receive_json()
+        assert message["type"] == "summary_updated"
@@ -0,0 +1,71 @@
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+from app.db.session import create_db_and_tables
+from app.main import app
+from app.services.comfort_service import ComfortService
+
+
+create_db_and_tables()
+client = TestClient(app)
+
+
+def _prefs(**overrides):
+    values = dict(
+        preferred_font_size="medium",
+        preferred_contrast="normal",
+        preferred_line_spacing="normal",
+        preferred_text_width="normal",
+        dark_mode=False,
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def test_table_matches_rules_at_bucket_edges():
+    for screen in ("phone", "tablet", "desktop", "book"):
+        for light in ("dim", "normal", "bright"):
+            for minutes in (1, 30, 31, 60, 61, 120, 121, 600):
+                for prefs in (_prefs(), _prefs(preferred_font_size="xlarge", dark_mode=True)):
+                    expected = ComfortService.evaluate(
+                        screen, light, minutes,
+                        prefs.preferred_font_size, prefs.preferred_contrast,
+                        prefs.preferred_line_spacing, prefs.preferred_text_width, prefs.dark_mode
+                    )
+                    assert ComfortService.recommend(screen, light, minutes, prefs).recommendation == expected
+
+
+def test_unknown_preference_values_fall_back_to_rules():
+    compiled = ComfortService.recommend("desktop", "normal", 10, _prefs(preferred_text_width="extra"))
+    assert compiled.recommendation.text_width == "extra"
+
+
+def test_batch_recommendations_in_request_order():
+    contexts = [
+        {"screen_type": "phone", "ambient_light": "dim", "session_duration_minutes": 10},
+        {"screen_type": "desktop", "ambient_light": "bright", "session_duration_minutes": 180},
+    ]
+    resp = client.post(
+        "/api/reading-comfort/recommendations/batch",
+        params={"user_id": "comfort-batch-user"},
+        json={"contexts": contexts}
+    )
+    assert resp.status_code == 200
+    first, second = resp.json()
+    assert first["font_size"] == "large" and first["contrast_level"] == "high"
+    assert second["recommended_break_interval"] == 15
+
+    single = client.post(
+        "/api/reading-comfort/recommendations",
+        params={"user_id": "comfort-batch-user"},
+        json=contexts[1]
+    )
+    assert single.json() == second
+
+    resp = client.post(
+        "/api/reading-comfort/recommendations/batch",
+        params={"user_id": "comfort-batch-user"},
+        json={"contexts": []}
+    )
+    assert resp.status_code == 422
@@ -0,0 +1,67 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from app.models import EyeHealthReminder
+from app.services.reminder_scheduler import ReminderScheduler
+
+
+NOW = datetime(2025, 1, 1, 9, 0)
+
+
+def _reminder(reminder_id, interval, enabled=True):
+    return EyeHealthReminder(
+        id=reminder_id,
+        user_id="u1",
+        reminder_type="20-20-20",
+        interval_minutes=interval,
+        is_enabled=enabled,
+        created_at=NOW,
+        updated_at=NOW,
+    )
+
+
+def test_pop_due_in_fire_order_and_advances():
+    scheduler = ReminderScheduler()
+    scheduler.sync(_reminder(1, 20), now=NOW)
+    scheduler.sync(_reminder(2, 15), now=NOW)
+
+    assert scheduler.pop_due(NOW + timedelta(minutes=10)) == []
+    events = scheduler.pop_due(NOW + timedelta(minutes=20))
+    assert [e.reminder_id for e in events] == [2, 1]
+    assert scheduler.next_fire_at() == NOW + timedelta(minutes=30)
+
+
+def test_missed_intervals_fire_once():
+    scheduler = ReminderScheduler()
+    scheduler.sync(_reminder(1, 20), now=NOW)
+
+    events = scheduler.pop_due(NOW + timedelta(minutes=65))
+    assert len(events) == 1
+    assert scheduler.next_fire_at() == NOW + timedelta(minutes=80)
+
+
+def test_reschedule_and_disable_replace_entries():
+    scheduler = ReminderScheduler()
+    scheduler.sync(_reminder(1, 20), now=NOW)
+    scheduler.sync(_reminder(1, 60), now=NOW)
+    assert len(scheduler) == 1
+    assert scheduler.pop_due(NOW + timedelta(minutes=30)) == []
+
+    scheduler.sync(_reminder(1, 60, enabled=False), now=NOW)
+    assert len(scheduler) == 0
+    assert scheduler.next_fire_at() is None
+
+
+def test_dispatch_calls_sync_and_async_listeners():
+    scheduler = ReminderScheduler()
+    received = []
+
+    async def async_listener(event):
+        received.append(("async", event.reminder_id))
+
+    scheduler.add_listener(lambda event: received.append(("sync", event.reminder_id)))
+    scheduler.add_listener(async_listener)
+    scheduler.sync(_reminder(7, 5), now=NOW)
+
+    asyncio.run(scheduler.dispatch(scheduler.pop_due(NOW + timedelta(minutes=5))))
+    assert received == [("sync", 7), ("async", 7)]
@@ -0,0 +1,140 @@
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlmodel import Session
+
+from app.db.session import create_db_and_tables, engine
+from app.main import app
+from app.models import EyeHealthReminder
+from app.services.reminder_service import ReminderService, next_fire_time
+
+
+create_db_and_tables()
+client = TestClient(app)
+
+
+def _add_due(user_id, due_at, interval=20):
+    with Session(engine) as session:
+        reminder = EyeHealthReminder(
+            user_id=user_id,
+            reminder_type="20-20-20",
+            interval_minutes=interval,
+            next_fire_at=due_at,
+        )
+        session.add(reminder)
+        session.commit()
+        session.refresh(reminder)
+        return reminder.id
+
+
+def test_next_fire_time_skips_missed_intervals():
+    anchor = datetime(2025, 1, 1, 9, 0)
+    assert next_fire_time(anchor, 20, anchor) == anchor + timedelta(minutes=20)
+    assert next_fire_time(anchor, 20, anchor + timedelta(minutes=65)) == anchor + timedelta(minutes=80)
+
+
+def test_create_and_disable_maintain_next_fire_at():
+    resp = client.post("/api/reminders/?user_id=sched_user", json={"reminder_type": "blink", "interval_minutes": 15})
+    data = resp.json()
+    assert data["next_fire_at"] is not None
+
+    resp = client.patch(f"/api/reminders/{data['id']}?user_id=sched_user", json={"is_enabled": False})
+    assert resp.json()["next_fire_at"] is None
+
+
+def test_claim_due_advances_and_never_double_fires():
+    now = datetime(2030, 1, 1, 12, 0)
+    reminder_id = _add_due("claim_user", now - timedelta(minutes=1))
+
+    with Session(engine) as first, Session(engine) as second:
+        # The second worker reads the row as due before the first claims it
+        stale = second.get(EyeHealthReminder, reminder_id)
+        events = ReminderService.claim_due(first, now)
+        raced = ReminderService._claim(second, [stale], now)
+        again = ReminderService.claim_ids(second, [reminder_id], now)
+
+    assert [e.reminder_id for e in events if e.user_id == "claim_user"] == [reminder_id]
+    assert raced == [] and again == []
+    with Session(engine) as session:
+        reminder = session.get(EyeHealthReminder, reminder_id)
+        assert reminder.last_fired_at == now
+        assert reminder.next_fire_at == now + timedelta(minutes=19)
+
+
+def test_due_query_uses_partial_index():
+    with engine.connect() as connection:
+        plan = connection.execute(text(
+            "EXPLAIN QUERY PLAN SELECT id FROM eye_health_reminders "
+            "WHERE is_enabled = 1 AND next_fire_at <= '2030-01-01' ORDER BY next_fire_at"
+        )).all()
+    assert "ix_eye_health_reminders_due" in " ".join(str(row) for row in plan)
+
+
+def test_calendar_clips_to_working_and_quiet_hours():
+    from app.models import UserPreferences
+
+    start = datetime(2025, 1, 6, 7, 0)  # 08:00 in Europe/Paris
+    reminders = [
+        EyeHealthReminder(id=1, user_id="u", reminder_type="20-20-20", interval_minutes=60, next_fire_at=start),
+        EyeHealthReminder(id=2, user_id="u", reminder_type="hydration", interval_minutes=90, next_fire_at=start),
+    ]
+    preferences = UserPreferences(
+        user_id="u",
+        timezone="Europe/Paris",
+        working_hours_start="09:00",
+        working_hours_end="17:00",
+        quiet_hours_start="12:00",
+        quiet_hours_end="13:00",
+    )
+
+    occurrences = list(ReminderService.iter_calendar(reminders, preferences, start, horizon_days=1))
+    local_times = [o.local_time.strftime("%H:%M") for o in occurrences]
+
+    assert occurrences == sorted(occurrences, key=lambda o: o.fire_at)
+    assert all("09:00" <= t < "17:00" and not "12:00" <= t < "13:00" for t in local_times)
+    assert local_times[:3] == ["09:00", "09:30", "10:00"]
+
+
+def test_calendar_endpoint_and_timezone_validation():
+    user_id = "calendar_user"
+    client.patch(f"/api/reading-comfort/preferences?user_id={user_id}", json={
+        "working_hours_start": "00:00", "working_hours_end": "23:59"
+    })
+    client.post(f"/api/reminders/?user_id={user_id}", json={"reminder_type": "blink", "interval_minutes": 30})
+
+    resp = client.get("/api/reminders/calendar", params={"user_id": user_id, "limit": 5})
+    assert resp.status_code == 200
+    assert len(resp.json()) == 5
+
+    resp = client.patch(f"/api/reading-comfort/preferences?user_id={user_id}", json={"timezone": "Mars/Olympus"})
+    assert resp.status_code == 400
+
+
+def test_templates_bulk_update_and_delete():
+    user_id = "bulk_user"
+    resp = client.post(f"/api/reminders/bulk/templates?user_id={user_id}", json={})
+    assert resp.status_code == 200
+    created = resp.json()
+    assert {r["reminder_type"] for r in created} == {"20-20-20", "Hydration", "Posture Check", "Blink Exercise"}
+
+    # Re-applying skips reminder types the user already has
+    resp = client.post(f"/api/reminders/bulk/templates?user_id={user_id}", json={"templates": ["blink"]})
+    assert resp.json() == []
+
+    resp = client.patch(f"/api/reminders/bulk?user_id={user_id}", json={"update": {"is_enabled": False}})
+    assert all(not r["is_enabled"] and r["next_fire_at"] is None for r in resp.json())
+    assert len(resp.json()) == 4
+
+    resp = client.post(
+        f"/api/reminders/bulk/delete?user_id={user_id}",
+        json={"reminder_types": ["Hydration", "Posture Check"]},
+    )
+    assert resp.json()["deleted"] == 2
+    remaining = client.get("/api/reminders/", params={"user_id": user_id}).json()
+    assert {r["reminder_type"] for r in remaining} == {"20-20-20", "Blink Exercise"}
+
+
+def test_unknown_template_rejected():
+    resp = client.post("/api/reminders/bulk/templates?user_id=u", json={"templates": ["yoga"]})
+    assert resp.status_code == 400
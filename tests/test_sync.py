@@ -0,0 +1,88 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+from sqlmodel import Session
+
+from app.db.session import create_db_and_tables, engine
+from app.main import app
+from app.models import ChangeLogEntry
+from app.services.sync_service import SyncService
+
+
+create_db_and_tables()
+client = TestClient(app)
+
+USER_ID = "sync-user"
+
+
+def _changes(since=None, **params):
+    if since is not None:
+        params["since"] = since
+    resp = client.get("/api/sync/changes", params={"user_id": USER_ID, **params})
+    assert resp.status_code == 200
+    return resp.json()
+
+
+def test_change_feed_collapses_to_latest_state():
+    version = _changes()["version"]
+    assert _changes(version)["changes"] == []
+
+    log_id = client.post("/api/habits/log", params={"user_id": USER_ID}, json={"screen_time_hours": 2}).json()["id"]
+    reminder = client.post("/api/reminders/", params={"user_id": USER_ID}, json={"reminder_type": "Blink", "interval_minutes": 15}).json()
+    client.patch(f"/api/reminders/{reminder['id']}", params={"user_id": USER_ID}, json={"interval_minutes": 25})
+    client.patch("/api/reading-comfort/preferences", params={"user_id": USER_ID}, json={"dark_mode": True})
+
+    feed = _changes(version)
+    by_entity = {(c["entity"], c["key"]): c for c in feed["changes"]}
+    assert by_entity[("habit_logs", str(log_id))]["data"]["screen_time_hours"] == 2
+    assert by_entity[("eye_health_reminders", str(reminder["id"]))]["data"]["interval_minutes"] == 25
+    assert by_entity[("user_preferences", USER_ID)]["data"]["dark_mode"] is True
+    assert len(feed["changes"]) == 3
+    assert feed["version"] > version
+
+    client.delete(f"/api/reminders/{reminder['id']}", params={"user_id": USER_ID})
+    later = _changes(feed["version"])
+    assert later["changes"] == [
+        {"entity": "eye_health_reminders", "key": str(reminder["id"]), "operation": "delete", "data": None}
+    ]
+    # Replaying from the start reports the reminder as deleted, not stale
+    replay = {(c["entity"], c["key"]): c for c in _changes(version)["changes"]}
+    assert replay[("eye_health_reminders", str(reminder["id"]))]["operation"] == "delete"
+
+
+def test_change_feed_pages_with_has_more():
+    version = _changes()["version"]
+    for hours in (1, 2, 3):
+        client.post("/api/habits/log", params={"user_id": USER_ID}, json={"screen_time_hours": hours})
+    page = _changes(version, limit=2)
+    assert page["has_more"] is True and len(page["changes"]) == 2
+    rest = _changes(page["version"], limit=2)
+    assert rest["has_more"] is False and len(rest["changes"]) == 1
+
+
+def test_change_committed_after_a_higher_id_is_not_skipped():
+    user = "sync-out-of-order"
+    version = _changes(user_id=user)["version"]
+    with Session(engine) as session:
+        # T1 is handed an id, then stalls before committing
+        reserved = ChangeLogEntry(user_id="sync-placeholder", entity="habit_logs", entity_key="0", operation="upsert")
+        session.add(reserved)
+        session.commit()
+        reserved_id = reserved.id
+        # T2 is handed a higher id and commits first
+        SyncService.record(session, user, "habit_logs", [2])
+        session.commit()
+    seen = _changes(version, user_id=user)
+    assert [c["key"] for c in seen["changes"]] == ["2"]
+
+    with Session(engine) as session:
+        # T1 commits under the lower id it was handed
+        last = SyncService._reserve_versions(session, user, 1)
+        session.execute(
+            update(ChangeLogEntry)
+            .where(ChangeLogEntry.id == reserved_id)
+            .values(user_id=user, version=last, entity_key="1")
+        )
+        session.commit()
+    later = _changes(seen["version"], user_id=user)
+    assert [c["key"] for c in later["changes"]] == ["1"]
+    assert later["version"] == _changes(user_id=user)["version"]
@@ -0,0 +1,139 @@
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from app.db.session import create_db_and_tables, engine
+from app.main import app
+from app.models import UserPreferences
+from app.services import translation_service
+from app.services.translation_service import TranslationCache, Translator
+
+
+create_db_and_tables()
+client = TestClient(app)
+
+
+class _UpperTranslator(Translator):
+    def __init__(self):
+        self.batches = []
+        self.fail = False
+
+    def translate(self, texts, language):
+        if self.fail:
+            raise RuntimeError("provider unavailable")
+        self.batches.append(list(texts))
+        return [f"[{language}] {text.upper()}" for text in texts]
+
+
+def _cache(tmp_path, translator=None, **kwargs):
+    return TranslationCache(tmp_path, ["es", "fr"], translator=translator or _UpperTranslator(), **kwargs)
+
+
+def test_misses_are_queued_then_served_and_persisted(tmp_path):
+    cache = _cache(tmp_path, batch_size=2)
+    assert cache.localize(["Blink often", "Rest"], "es") is None
+    assert cache.localize(["Blink often", "Rest"], "es") is None  # queued once
+    assert cache.stats()["pending"] == 2
+
+    assert cache.translate_pending() == 2
+    assert cache.localize(["Blink often", "Rest"], "es") == ["[es] BLINK OFTEN", "[es] REST"]
+    assert len(cache.translator.batches) == 1
+
+    reloaded = _cache(tmp_path)
+    assert reloaded.localize(["Rest"], "es") == ["[es] REST"]
+    assert reloaded.localize(["Rest"], "fr") is None
+
+
+def test_miss_picks_up_a_translation_written_by_another_worker(tmp_path):
+    cache = _cache(tmp_path)
+    other_worker = _cache(tmp_path)
+    other_worker.localize(["Rest"], "es")
+    other_worker.translate_pending()
+
+    assert cache.localize(["Rest"], "es") == ["[es] REST"]
+    assert cache.request(["Rest"], "es") == 0
+    assert cache.translator.batches == []
+
+
+def test_queued_misses_do_not_touch_disk(tmp_path, monkeypatch):
+    cache = _cache(tmp_path)
+    assert cache.localize(["Blink often", "Rest"], "es") is None
+
+    opened = []
+    read_text = translation_service.Path.read_text
+
+    def counting_read_text(path, *args, **kwargs):
+        opened.append(path)
+        return read_text(path, *args, **kwargs)
+
+    monkeypatch.setattr(translation_service.Path, "read_text", counting_read_text)
+    for _ in range(3):
+        assert cache.localize(["Blink often", "Rest"], "es") is None
+    assert opened == []
+
+
+def test_source_and_unsupported_languages(tmp_path):
+    cache = _cache(tmp_path)
+    assert cache.localize(["Rest"], "en") == ["Rest"]
+    assert cache.localize(["Rest"], "xx") is None
+    assert cache.stats()["pending"] == 0
+
+
+def test_failed_batches_are_not_retried_immediately(tmp_path):
+    translator = _UpperTranslator()
+    translator.fail = True
+    cache = _cache(tmp_path, translator, retry_seconds=60)
+    cache.localize(["Rest"], "es")
+    assert cache.translate_pending() == 0
+    assert cache.stats()["failures"] == 1
+
+    assert cache.localize(["Rest"], "es") is None
+    assert cache.stats()["pending"] == 0
+
+
+def test_endpoints_fall_back_to_english_until_translated(tmp_path, monkeypatch):
+    cache = _cache(tmp_path)
+    monkeypatch.setattr(translation_service, "_translations", cache)
+    user = "translation-user"
+    client.patch("/api/reading-comfort/preferences", params={"user_id": user}, json={"language": "es"})
+
+    english = client.get("/api/learning/modules/eyes_101")
+    resp = client.get("/api/learning/modules/eyes_101", params={"user_id": user})
+    assert resp.json() == english.json()
+    assert resp.headers["content-language"] == "en"
+    assert "max-age=0" in resp.headers["cache-control"]
+
+    context = {"screen_type": "phone", "ambient_light": "dim", "session_duration_minutes": 45}
+    tips = client.post("/api/reading-comfort/recommendations", params={"user_id": user}, json=context).json()["tips"]
+    assert not tips[0].startswith("[es]")
+    summaries = client.get("/api/learning/modules", params={"user_id": user, "view": "summary"}).json()
+    assert not any(s["title"].startswith("[es]") for s in summaries)
+    full = client.get("/api/learning/modules", params={"user_id": user, "view": "full"})
+    assert full.headers["content-language"] == "en"
+
+    cache.translate_pending()
+
+    resp = client.get("/api/learning/modules/eyes_101", params={"user_id": user})
+    assert resp.headers["content-language"] == "es"
+    module = resp.json()
+    assert module["title"] == "[es] " + english.json()["title"].upper()
+    assert all(option.startswith("[es]") for q in module["quiz_questions"] for option in q["options"])
+    assert [q["correct"] for q in module["quiz_questions"]] == [q["correct"] for q in english.json()["quiz_questions"]]
+
+    summaries = client.get("/api/learning/modules", params={"user_id": user, "view": "summary"}).json()
+    assert all(s["title"].startswith("[es]") for s in summaries)
+    full = client.get("/api/learning/modules", params={"user_id": user, "view": "full"})
+    assert full.headers["content-language"] == "es"
+    assert all(m["content"].startswith("[es]") for m in full.json())
+
+    tips = client.post("/api/reading-comfort/recommendations", params={"user_id": user}, json=context).json()["tips"]
+    assert all(tip.startswith("[es]") for tip in tips)
+
+
+def test_content_language_lookup_creates_no_preferences():
+    user = "translation-unknown-user"
+    resp = client.get("/api/learning/modules/eyes_101", params={"user_id": user})
+    assert resp.headers["content-language"] == "en"
+    client.get("/api/learning/modules", params={"user_id": user})
+
+    with Session(engine) as session:
+        assert session.exec(select(UserPreferences).where(UserPreferences.user_id == user)).first() is None